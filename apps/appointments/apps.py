@@ -6,3 +6,9 @@ class AppointmentsConfig(AppConfig):
     name = "apps.appointments"
     label = "appointments"
     verbose_name = "Citas"
+
+    def ready(self):
+        from apps.common import counts
+        from apps.appointments.models import Cita, DetalleCita
+
+        counts.track(Cita, DetalleCita)
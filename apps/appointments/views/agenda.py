@@ -16,6 +16,7 @@ from bootstrap_modal_forms.generic import BSModalUpdateView, BSModalReadView
 
 from apps.appointments.models import DetalleCita, Cita
 from apps.appointments.views.handler import HandlerAgendaList
+from apps.common import counts
 from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.custom_time_fields import (
     CustomDateField,
@@ -28,12 +29,14 @@ from apps.common.form_classes import (
     FORM_SELECT2_CLASS,
 )
 from apps.common.utils.dates import format_full_date
+from apps.common.utils.urls import row_url
 from apps.common.utils.currency import format_currency
 from apps.common.utils.utils import get_errors_to_response
 from apps.common.views.base_views import ProtectedView
 from apps.payments.choices import MetodoPago, EstadoPago
 from apps.payments.models import Pago, DetallePago
 from apps.services.models import Servicio, Categoria
+from dashboard.services import rollups
 
 """========================================================================="""
 # region ........ Form
@@ -307,6 +310,11 @@ class AgendaListView(BaseListViewAjax):
         "cantidad_servicios",
     ]
 
+    search_fields = [
+        "cliente__nombre",
+        "cliente__apellido",
+    ]
+
     ordering_fields = {
         "0": "hora_agenda",
         "1": "cliente_full_name",
@@ -332,9 +340,7 @@ class AgendaListView(BaseListViewAjax):
         values = super().get_values(queryset)
         for value in values:
             value["formatted_time"] = HandlerAgendaList.get_formatted_time(**value)
-            value["agenda_see_modal_url"] = reverse_lazy(
-                "agenda_see_modal", args=[value["pk"]]
-            )
+            value["agenda_see_modal_url"] = row_url("agenda_see_modal", value["pk"])
             value.update(HandlerAgendaList.get_options(value["pk"], value["estado"]))
         return values
 
@@ -471,6 +477,11 @@ class AgendaUpdateModalView(ProtectedView, BSModalUpdateView):
         if not new_services:
             return
         DetalleCita.objects.bulk_create(new_services)
+        # bulk_create no dispara post_save: se avisa al rollup y a los conteos.
+        rollups.mark_dirty(
+            rollups.SERVICIOS, rollups.month_of(self.object.fecha_agenda)
+        )
+        counts.invalidate(DetalleCita)
 
     def form_valid(self, form):
         if self.object.estado != Cita.EstadoChoices.PENDIENTE:
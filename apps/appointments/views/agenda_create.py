@@ -252,6 +252,11 @@ class AvailableHoursAjax(BaseListViewAjax):
         "cliente__nombre",
         "cliente__apellido",
     ]
+
+    search_fields = [
+        "cliente__nombre",
+        "cliente__apellido",
+    ]
     ordering_fields = {
         "0": "hora_agenda",
     }
@@ -8,6 +8,7 @@ from apps.appointments.models.agenda import Cita
 from apps.clients.models import Cliente
 from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.custom_time_fields import CustomMonthField, MONTH_NUMBER_TO_NAME
+from apps.common.utils.urls import row_url
 from apps.common.views.base_views import ProtectedView
 from apps.services.models import Servicio
 
@@ -192,9 +193,10 @@ class CalendarListView(BaseListViewAjax):
                     "in_month": day["in_month"],
                     "is_today": _date == _today,
                     "is_past_date": _date < _today,
-                    "calendar_appointments_url": reverse_lazy(
+                    "calendar_appointments_url": row_url(
                         "calendar_appointments",
-                        kwargs={"date": _date.strftime("%Y-%m-%d")},
+                        _date.strftime("%Y-%m-%d"),
+                        param="date",
                     ),
                     **appointments_by_date.get(_date, {}),
                 }
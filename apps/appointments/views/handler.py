@@ -1,11 +1,11 @@
 from datetime import date, time
 from decimal import Decimal
-from django.urls import reverse_lazy
 from result import Ok, Err, Result
 
 from apps.appointments.models.agenda import Cita
 from apps.appointments.models.detalle_cita import DetalleCita
 from apps.clients.models import Cliente
+from apps.common.utils.urls import row_url
 from apps.services.models import Servicio
 
 
@@ -128,17 +128,11 @@ class HandlerAgendaList:
         options = {}
         if agenda_status == Cita.EstadoChoices.PENDIENTE:
             options["options"] = {
-                "agenda_update_modal_url": reverse_lazy(
-                    "agenda_update_modal", args=[agenda_id]
-                ),
-                "agenda_cancel_modal_url": reverse_lazy(
-                    "agenda_cancel_modal", args=[agenda_id]
-                ),
-                "agenda_delete_modal_url": reverse_lazy(
-                    "agenda_delete_modal", args=[agenda_id]
-                ),
-                "agenda_confirmation_modal_url": reverse_lazy(
-                    "agenda_confirmation_modal", args=[agenda_id]
+                "agenda_update_modal_url": row_url("agenda_update_modal", agenda_id),
+                "agenda_cancel_modal_url": row_url("agenda_cancel_modal", agenda_id),
+                "agenda_delete_modal_url": row_url("agenda_delete_modal", agenda_id),
+                "agenda_confirmation_modal_url": row_url(
+                    "agenda_confirmation_modal", agenda_id
                 ),
             }
             return options
@@ -149,12 +143,8 @@ class HandlerAgendaList:
             return options
         if agenda_status == Cita.EstadoChoices.CANCELADA:
             options["options"] = {
-                "agenda_restore_modal_url": reverse_lazy(
-                    "agenda_restore_modal", args=[agenda_id]
-                ),
-                "agenda_delete_modal_url": reverse_lazy(
-                    "agenda_delete_modal", args=[agenda_id]
-                ),
+                "agenda_restore_modal_url": row_url("agenda_restore_modal", agenda_id),
+                "agenda_delete_modal_url": row_url("agenda_delete_modal", agenda_id),
             }
             return options
         return options
@@ -6,3 +6,9 @@ class ClientsConfig(AppConfig):
     name = "apps.clients"
     label = "clients"
     verbose_name = "Clientes"
+
+    def ready(self):
+        from apps.common import counts
+        from apps.clients.models.cliente import Cliente
+
+        counts.track(Cliente)
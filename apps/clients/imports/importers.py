@@ -10,3 +10,9 @@ class ClientAsyncImporter(BaseAsyncImporter):
     validator_class = ClientAsyncImportValidator
     model = Cliente
     success_message = "{count} clientes importados correctamente."
+    # Un cliente se reconoce por su teléfono y, si no lo trae, por su email.
+    natural_keys = (("telefono",), ("email",))
+    upsert_message = (
+        "Clientes: {created} nuevos, {updated} actualizados y "
+        "{unchanged} sin cambios."
+    )
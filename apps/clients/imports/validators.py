@@ -1,13 +1,27 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from result import Err, Ok
+from result import Err, Ok, Result
 
 from apps.clients.models.cliente import Cliente
+from apps.common.imports.lookups import Lookup
 from apps.common.imports.validators import BaseAsyncImportValidator
 from apps.common.utils.phones import CountryPhonePrefix
 from apps.common.utils.utils import CommonCleaner
 
 
+def clean_phone(telefono: str) -> Result[str, str]:
+    """Valida el teléfono con su prefijo de país y lo deja como se guarda."""
+    allowed_prefixes = [prefix.value for prefix in CountryPhonePrefix]
+    for prefix in allowed_prefixes:
+        if telefono.startswith(prefix):
+            _phone = telefono[len(prefix) :]
+            return CommonCleaner.clean_phone_field(prefix, _phone)
+    str_prefixes = ", ".join(allowed_prefixes)
+    return Err(
+        f"El teléfono debe comenzar con uno de los siguientes prefijos: {str_prefixes}."
+    )
+
+
 class ClientAsyncImportValidator(BaseAsyncImportValidator):
     fields = {
         "nombre": "Nombre",
@@ -17,6 +31,24 @@ class ClientAsyncImportValidator(BaseAsyncImportValidator):
         "estado": "Estado",
         "notas": "Notas",
     }
+    # Teléfonos y emails ya registrados: una fila que los repite es un
+    # cliente duplicado, salvo en modo upsert, donde es el que se actualiza.
+    lookups = {
+        "telefonos": Lookup(
+            Cliente,
+            column="telefono",
+            field="telefono",
+            normalize=lambda telefono: clean_phone(telefono).unwrap_or(None),
+            exists_only=True,
+        ),
+        "emails": Lookup(
+            Cliente,
+            column="email",
+            field="email",
+            exists_only=True,
+            case_insensitive=True,
+        ),
+    }
 
     def clean_nombre(self, nombre, **kwargs):
         if not nombre:
@@ -31,15 +63,10 @@ class ClientAsyncImportValidator(BaseAsyncImportValidator):
     def clean_telefono(self, telefono, **kwargs):
         if not telefono:
             return Ok("")  # teléfono opcional: vacío es válido
-        allowed_prefixes = [prefix.value for prefix in CountryPhonePrefix]
-        for prefix in allowed_prefixes:
-            if telefono.startswith(prefix):
-                _phone = telefono[len(prefix) :]
-                return CommonCleaner.clean_phone_field(prefix, _phone)
-        str_prefixes = ", ".join(allowed_prefixes)
-        return Err(
-            f"El teléfono debe comenzar con uno de los siguientes prefijos: {str_prefixes}."
-        )
+        result = clean_phone(telefono)
+        if self.__is_duplicate(result.unwrap_or(None), "telefonos"):
+            return Err(f"Ya existe un cliente con el teléfono {result.value}.")
+        return result
 
     def clean_estado(self, estado, **kwargs):
         allowed_states = [choice.value for choice in Cliente.EstadoChoices]
@@ -60,9 +87,14 @@ class ClientAsyncImportValidator(BaseAsyncImportValidator):
             validate_email(email)
         except ValidationError:
             return Err(f"Email inválido: {email}")
+        if self.__is_duplicate(email.lower(), "emails"):
+            return Err(f"Ya existe un cliente con el email {email}.")
         return Ok(email)
 
     def clean_notas(self, notas, **kwargs):
         if not notas:
             return Ok("")
         return CommonCleaner.clean_250_characters_field("notas", notas)
+
+    def __is_duplicate(self, key, lookup: str) -> bool:
+        return not self.upsert and key in self.preloaded[lookup]
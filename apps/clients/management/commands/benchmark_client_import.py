@@ -0,0 +1,79 @@
+"""
+Comando para medir el throughput de la persistencia de una importación de
+clientes: lotes con bulk_create_with_history (camino por defecto) contra la
+carga por COPY (apps.common.imports.copy_loader). Solo PostgreSQL.
+
+Cada medición corre dentro de una transacción que se deshace al final: la
+base queda como estaba.
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.clients.imports import ClientAsyncImporter
+from apps.common.imports import copy_loader
+from apps.tareas.models import TareaEnProceso
+
+# Caminos a comparar: (etiqueta, método de BaseAsyncImporter).
+PATHS = (
+    ("lotes", "save"),
+    ("copy", "save_with_copy"),
+)
+
+
+def _rows(count):
+    """Filas limpias sintéticas, como las entrega el validator."""
+    for index in range(count):
+        yield {
+            "nombre": "Cliente",
+            "apellido": f"Benchmark {index}",
+            "telefono": f"+569{index:08d}",
+            "email": f"cliente{index}@benchmark.test",
+            "estado": "activo",
+            "notas": "",
+        }
+
+
+class Command(BaseCommand):
+    help = "Compara lotes (bulk_create_with_history) contra COPY al importar clientes"
+
+    def add_arguments(self, parser):
+        """Agregar argumentos del comando."""
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50000,
+            help="Clientes a insertar por medición (por defecto 50000).",
+        )
+
+    def _measure(self, method, rows, user):
+        with transaction.atomic():
+            task = TareaEnProceso.objects.create(
+                nombre_proceso="Benchmark de importación",
+                origen="benchmark",
+                user_id=user.pk if user else None,
+            )
+            importer = ClientAsyncImporter(user=user, task=task)
+            start = time.perf_counter()
+            saved = getattr(importer, method)(_rows(rows))
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return saved, elapsed
+
+    def handle(self, *args, **options):
+        """Ejecutar la comparación."""
+        if not copy_loader.is_available():
+            raise CommandError("La carga por COPY requiere PostgreSQL.")
+        rows = options["rows"]
+        user = get_user_model().objects.order_by("pk").first()
+        self.stdout.write(f"Importación de {rows} clientes (con historial):\n")
+        for label, method in PATHS:
+            saved, elapsed = self._measure(method, rows, user)
+            self.stdout.write(
+                f"  {label:<6} {saved} filas en {elapsed:7.2f} s  "
+                f"({saved / elapsed:,.0f} filas/s)"
+            )
+        self.stdout.write(self.style.SUCCESS("✓ Benchmark terminado"))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-16 22:23
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0002_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cliente",
+            index=models.Index(
+                django.db.models.functions.text.Upper("telefono"),
+                name="clientes_telefono_key",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cliente",
+            index=models.Index(
+                django.db.models.functions.text.Upper("email"),
+                name="clientes_email_key",
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from model_utils.models import TimeStampedModel, SoftDeletableModel
 from simple_history.models import HistoricalRecords
 
@@ -64,6 +66,30 @@ class Cliente(TimeStampedModel, SoftDeletableModel):
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
         ordering = ["-created"]  # Ordenar por fecha de creación (TimeStampedModel)
+        # Trigramas sobre UPPER(col): sirven a los __icontains del buscador
+        # de las listas (ver apps.common.search).
+        indexes = [
+            GinIndex(
+                OpClass(Upper("nombre"), name="gin_trgm_ops"),
+                name="clientes_nombre_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("apellido"), name="gin_trgm_ops"),
+                name="clientes_apellido_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("telefono"), name="gin_trgm_ops"),
+                name="clientes_telefono_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="clientes_email_trgm",
+            ),
+            # Igualdad sobre UPPER(col): la búsqueda por clave natural del
+            # upsert de importaciones (ver BaseAsyncImporter.natural_keys).
+            models.Index(Upper("telefono"), name="clientes_telefono_key"),
+            models.Index(Upper("email"), name="clientes_email_key"),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido}"
@@ -1,8 +1,16 @@
+from django.conf import settings
+
 from apps.clients.imports import ClientAsyncImporter
+from apps.tareas import queues
 from apps.tareas.decorators import background_task
 
 
-@background_task
+@background_task(
+    queue=queues.IMPORTACIONES,
+    limite_por_origen=settings.IMPORT_CONCURRENCY_PER_ORIGIN,
+    reject_on_worker_lost=True,
+    reanudable=True,
+)
 def import_clients(tarea, user):
     """Importa clientes desde el CSV que la vista dejó en la tarea.
 
@@ -7,12 +7,14 @@ from django.db.models.functions import Concat
 from rest_framework.status import HTTP_400_BAD_REQUEST
 from bootstrap_modal_forms.forms import BSModalForm
 from bootstrap_modal_forms.generic import BSModalFormView, BSModalDeleteView
+from apps.common import counts
 from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.excel_export_mixin import ExcelExportMixin
 from apps.common.form_classes import FORM_CONTROL_CLASS, FORM_SELECT_CLASS
 from apps.common.utils.phones import CountryPhonePrefix
 from apps.common.utils.utils import CommonCleaner, get_errors_to_response
+from apps.common.utils.urls import row_url
 from apps.common.views.base_views import ProtectedView
 from ..models.cliente import Cliente
 
@@ -212,6 +214,7 @@ class ClientsView(ProtectedView, TemplateView):
 class ClientListView(BaseListViewAjax):
     model = Cliente
     filter_form_class = ClientsFilterForm
+    keyset_pagination = True
 
     field_list = [
         "pk",
@@ -223,6 +226,13 @@ class ClientListView(BaseListViewAjax):
         "full_name",
     ]
 
+    search_fields = [
+        "nombre",
+        "apellido",
+        "telefono",
+        "email",
+    ]
+
     ordering_fields = {
         "0": "full_name",
         "1": "estado",
@@ -249,18 +259,14 @@ class ClientListView(BaseListViewAjax):
             item["options"] = [
                 {
                     "label": "Ver detalles",
-                    "link": reverse_lazy(
-                        "client_detail_modal", kwargs={"pk": item["pk"]}
-                    ),
+                    "link": row_url("client_detail_modal", item["pk"]),
                     "bsModal": True,
                     "icon": "edit_document",
                     "className": "bs-modal",
                 },
                 {
                     "label": "Eliminar",
-                    "link": reverse_lazy(
-                        "client_delete_modal", kwargs={"pk": item["pk"]}
-                    ),
+                    "link": row_url("client_delete_modal", item["pk"]),
                     "bsModal": True,
                     "icon": "delete",
                     "className": "bs-modal text-color-destructive",
@@ -270,15 +276,19 @@ class ClientListView(BaseListViewAjax):
 
     @staticmethod
     def additional_data(queryset) -> dict:
-        _additional_data = Cliente.objects.aggregate(
-            active_clients_total=Count(
-                "pk", filter=Q(estado=Cliente.EstadoChoices.ACTIVO)
-            ),
-            inactive_clients_total=Count(
-                "pk", filter=Q(estado=Cliente.EstadoChoices.INACTIVO)
+        # Totales de toda la tabla: se cachean hasta la próxima escritura.
+        return counts.remember(
+            [Cliente],
+            "estado_totals",
+            lambda: Cliente.objects.aggregate(
+                active_clients_total=Count(
+                    "pk", filter=Q(estado=Cliente.EstadoChoices.ACTIVO)
+                ),
+                inactive_clients_total=Count(
+                    "pk", filter=Q(estado=Cliente.EstadoChoices.INACTIVO)
+                ),
             ),
         )
-        return _additional_data
 
 
 class ClientExportView(ExcelExportMixin, ClientListView):
@@ -286,6 +296,8 @@ class ClientExportView(ExcelExportMixin, ClientListView):
     include_options_column = False
     excel_filename = "clientes"
     excel_sheet_title = "Clientes"
+    export_origin = "clientes"
+    export_process_name = "Exportación de clientes"
 
     excel_columns = [
         ExcelColumn("Nombre completo", "full_name", width=30),
@@ -1,20 +1,81 @@
-import operator
-from functools import reduce
+import hashlib
+from datetime import date, datetime, time
+from decimal import Decimal
 
+from django.core import signing
 from django.db.models import Q
 from django.http import JsonResponse
 from django.views.generic import ListView
+from apps.common import counts
+from apps.common.search import ContainsSearch
 from apps.common.views.base_views import ProtectedAjaxView
 
+CURSOR_SALT = "base_list_view_ajax.cursor"
+
+
+def _encode_cursor_value(value):
+    """Valor de la columna de orden en un tipo que sobreviva al JSON del cursor.
+
+    Las fechas van en ISO completo (con microsegundos y zona horaria): la
+    igualdad del desempate por pk depende de que el valor vuelva idéntico.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _keyset_after(field, descending, value, pk):
+    """Q de las filas que van DESPUÉS de (value, pk) al ordenar por (field, pk).
+
+    Replica el orden de PostgreSQL: los NULL van al final en ASC y al
+    principio en DESC.
+    """
+    if field is None:
+        return Q(pk__lt=pk) if descending else Q(pk__gt=pk)
+
+    if descending:
+        if value is None:
+            return Q(**{f"{field}__isnull": True, "pk__lt": pk}) | Q(
+                **{f"{field}__isnull": False}
+            )
+        return Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk})
+
+    if value is None:
+        return Q(**{f"{field}__isnull": True, "pk__gt": pk})
+    return (
+        Q(**{f"{field}__gt": value})
+        | Q(**{field: value, "pk__gt": pk})
+        | Q(**{f"{field}__isnull": True})
+    )
+
 
 class BaseListViewAjax(ProtectedAjaxView, ListView):
     http_method_names = ["get"]
     model = None
     filter_form_class = None
     field_list = []
+    # Columnas de TEXTO sobre las que busca el buscador de DataTables. Sin
+    # declarar, se usa field_list (comportamiento histórico, sin índices).
+    search_fields = None
+    # Columnas que no son texto, con el SearchTerm que las compara por
+    # igualdad: {"metodo_pago": ChoiceTerm(...), "fecha_pago": DateTerm()}.
+    search_exact_fields = {}
+    search_backend = ContainsSearch
     ordering_fields = {}
     _filters = {}
     include_options_column = True
+    # Opt-in: paginar por cursor (columna de orden + pk) en vez de OFFSET. El
+    # JSON suma next_cursor/prev_cursor y custom.main.js los reenvía solo.
+    keyset_pagination = False
+    # Conteos (ver apps.common.counts). recordsTotal se cachea hasta la próxima
+    # escritura en count_models (por defecto solo `model`); con
+    # count_estimate_threshold, sobre ese tamaño se usa la estimación del
+    # planner en vez de COUNT(*).
+    cache_total_count = True
+    count_models = ()
+    count_estimate_threshold = None
 
     def get_pagination_length(self):
         pagination_start = int(self.request.GET.get("start", 0))
@@ -31,13 +92,17 @@ class BaseListViewAjax(ProtectedAjaxView, ListView):
         direction = query_params.get("order[0][dir]", "asc")
         return (field,) if direction == "asc" else (f"-{field}",)
 
+    def get_search_fields(self):
+        if self.search_fields is None:
+            return self.field_list
+        return self.search_fields
+
     def get_filter_by_search(self):
         search_value = self.request.GET.get("search[value]", "")
         if not search_value:
             return Q()
-        return reduce(
-            operator.or_,
-            (Q(**{f"{field}__icontains": search_value}) for field in self.field_list),
+        return self.search_backend().filter(
+            search_value, self.get_search_fields(), self.search_exact_fields
         )
 
     def get_filters(self):
@@ -73,11 +138,128 @@ class BaseListViewAjax(ProtectedAjaxView, ListView):
         page_start, page_end = self.get_pagination_length()
         return queryset[page_start:page_end]
 
+    def get_count_models(self):
+        return self.count_models or (self.model,)
+
+    def get_total_count(self, queryset) -> int:
+        """recordsTotal: filas con los filtros de la vista, sin búsqueda."""
+        if not self.cache_total_count:
+            return counts.count(queryset, self.count_estimate_threshold)
+        return counts.remember(
+            self.get_count_models(),
+            f"total:{counts.query_fingerprint(queryset)}",
+            lambda: counts.count(queryset, self.count_estimate_threshold),
+        )
+
+    def get_filtered_count(self, queryset, total_records: int) -> int:
+        """recordsFiltered: sin término de búsqueda es igual a recordsTotal."""
+        if not self.request.GET.get("search[value]", ""):
+            return total_records
+        return counts.count(queryset, self.count_estimate_threshold)
+
+    def get_keyset_ordering(self):
+        """(campo, descendente) de la columna de orden activa; campo None = pk.
+
+        Sin columna de orden en el request se usa el primer campo de
+        Meta.ordering del modelo, el mismo orden que tendría la página por
+        OFFSET.
+        """
+        ordering = self.get_order_by() or self.model._meta.ordering
+        if not ordering or not isinstance(ordering[0], str):
+            return None, False
+        field = ordering[0]
+        return field.lstrip("-"), field.startswith("-")
+
+    def get_cursor_scope(self) -> str:
+        """Huella de la búsqueda y los filtros: un cursor solo vale para ellos."""
+        filters = sorted(
+            (key, str(value)) for key, value in self.get_filters().items()
+        )
+        scope = repr([self.request.GET.get("search[value]", ""), filters])
+        return hashlib.sha1(scope.encode()).hexdigest()[:16]
+
+    def _load_cursor(self, field, descending):
+        """Cursor recibido, o None si falta, es inválido o es de otro orden."""
+        token = self.request.GET.get("cursor")
+        if not token:
+            return None
+        try:
+            cursor = signing.loads(token, salt=CURSOR_SALT)
+        except signing.BadSignature:
+            return None
+        if [cursor.get("field"), cursor.get("desc"), cursor.get("scope")] != [
+            field,
+            descending,
+            self.get_cursor_scope(),
+        ]:
+            return None
+        return cursor
+
+    def _dump_cursor(self, field, descending, key, backwards):
+        value, pk = key
+        return signing.dumps(
+            {
+                "field": field,
+                "desc": descending,
+                "scope": self.get_cursor_scope(),
+                "value": _encode_cursor_value(value),
+                "pk": pk,
+                "back": backwards,
+            },
+            salt=CURSOR_SALT,
+        )
+
+    def apply_keyset_pagination(self, queryset):
+        """Página por cursor: (queryset de la página, next_cursor, prev_cursor).
+
+        Sin cursor válido (primera carga, salto directo a una página, cambio
+        de orden o de búsqueda) cae a OFFSET para esa página; los cursores que
+        devuelve permiten que la siguiente/anterior ya vaya por keyset.
+        """
+        page_start, page_end = self.get_pagination_length()
+        length = page_end - page_start
+        field, descending = self.get_keyset_ordering()
+        key_fields = (field or "pk", "pk")
+        order = [
+            f"-{name}" if descending else name for name in dict.fromkeys(key_fields)
+        ]
+        ordered = queryset.order_by(*order)
+
+        cursor = self._load_cursor(field, descending)
+        if cursor is None:
+            keys = list(ordered.values_list(*key_fields)[page_start:page_end])
+        elif cursor["back"]:
+            # La página anterior es la "siguiente" en el orden invertido.
+            reverse_order = [
+                name[1:] if name.startswith("-") else f"-{name}" for name in order
+            ]
+            after = _keyset_after(field, not descending, cursor["value"], cursor["pk"])
+            keys = list(
+                queryset.filter(after)
+                .order_by(*reverse_order)
+                .values_list(*key_fields)[:length]
+            )
+            keys.reverse()
+        else:
+            after = _keyset_after(field, descending, cursor["value"], cursor["pk"])
+            keys = list(ordered.filter(after).values_list(*key_fields)[:length])
+
+        page = ordered.filter(pk__in=[pk for _, pk in keys])
+        next_cursor = prev_cursor = None
+        if keys and len(keys) == length:
+            next_cursor = self._dump_cursor(field, descending, keys[-1], False)
+        if keys and page_start > 0:
+            prev_cursor = self._dump_cursor(field, descending, keys[0], True)
+        return page, next_cursor, prev_cursor
+
     def is_export(self) -> bool:
         """Default; el ExcelExportMixin lo sobreescribe."""
         return False
 
     def get_values(self, queryset):
+        if isinstance(queryset, list):
+            # Lote de filas ya leídas (export por lotes): solo se formatean.
+            return queryset
         return [*queryset.values(*self.field_list)]
 
     @staticmethod
@@ -91,12 +273,17 @@ class BaseListViewAjax(ProtectedAjaxView, ListView):
     def get_context_data(self, **kwargs):
         queryset = self.get_processed_queryset()
 
-        total_records = queryset.count()
+        total_records = self.get_total_count(queryset)
 
         queryset = queryset.filter(self.get_filter_by_search())
-        filtered_records = queryset.count()
+        filtered_records = self.get_filtered_count(queryset, total_records)
 
-        page = self.apply_pagination(queryset)
+        cursors = {}
+        if self.keyset_pagination and self.should_paginate():
+            page, next_cursor, prev_cursor = self.apply_keyset_pagination(queryset)
+            cursors = {"next_cursor": next_cursor, "prev_cursor": prev_cursor}
+        else:
+            page = self.apply_pagination(queryset)
         data = self.get_values(page)
         if self.include_options_column:
             data = self.add_options_column(data)
@@ -104,6 +291,7 @@ class BaseListViewAjax(ProtectedAjaxView, ListView):
             "data": data,
             "recordsTotal": total_records,
             "recordsFiltered": filtered_records,
+            **cursors,
             **self.additional_data(queryset),
         }
 
@@ -0,0 +1,149 @@
+"""Conteos baratos para las listas DataTables (BaseListViewAjax).
+
+Cada request de una lista pedía un COUNT(*) para recordsTotal, otro para
+recordsFiltered y, en varias vistas, un aggregate de toda la tabla para las
+tarjetas de totales. Aquí viven las tres estrategias que los abaratan:
+
+- remember(): guarda en caché un conteo/aggregate hasta la próxima escritura
+  sobre los modelos de los que depende. Cada modelo tiene una versión que se
+  sube al confirmar un save/delete (señales conectadas con track() en el
+  AppConfig.ready() de la app dueña del modelo, solo para los modelos que se
+  cuentan); las escrituras sin señales (bulk_create, update de queryset)
+  llaman a invalidate() a mano.
+- estimate(): filas estimadas por el planner de PostgreSQL (EXPLAIN), para
+  tablas donde un conteo aproximado alcanza.
+- count(): conteo exacto, o la estimación si supera un umbral.
+
+La caché es un acelerador: si no responde, se cuenta directo en la BD.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+
+PREFIX = "counts"
+
+
+def _version_key(model):
+    return f"{PREFIX}:version:{model._meta.label_lower}"
+
+
+def _versions(models):
+    """Versión actual de cada modelo; una ausente arranca en el reloj (ns)."""
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return ".".join(str(found[key]) for key in keys)
+
+
+def _bump(model):
+    key = _version_key(model)
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception:
+        # Sin caché disponible no hay nada que invalidar.
+        pass
+
+
+def invalidate(model):
+    """Descarta los conteos cacheados de `model` al confirmar la transacción.
+
+    Las señales ya lo hacen para save()/delete(); llamarlo a mano tras
+    bulk_create, bulk_create_with_history o update() de queryset.
+    """
+    transaction.on_commit(lambda: _bump(model))
+
+
+def remember(models, name, compute):
+    """Resultado de compute() cacheado hasta la próxima escritura en `models`.
+
+    Args:
+        models (Iterable[type[Model]]): Modelos cuyas escrituras lo invalidan.
+        name (str): Identificador del valor dentro de esos modelos.
+        compute (Callable[[], Any]): Calcula el valor en un fallo de caché.
+    """
+    models = list(models)
+    try:
+        label = models[0]._meta.label_lower
+        key = f"{PREFIX}:{label}:{name}:v{_versions(models)}"
+        value = cache.get(key)
+    except Exception:
+        return compute()
+
+    if value is None:
+        value = compute()
+        try:
+            cache.set(key, value, timeout=settings.LIST_COUNT_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    return value
+
+
+def query_fingerprint(queryset) -> str:
+    """Huella del SQL de un conteo, para usarla como `name` en remember()."""
+    query = str(queryset.order_by().query)
+    return hashlib.sha1(query.encode()).hexdigest()[:16]
+
+
+def estimate(queryset):
+    """Filas estimadas por el planner de PostgreSQL, o None en otro motor."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count(queryset, estimate_threshold=None) -> int:
+    """Conteo exacto, salvo que el planner estime `estimate_threshold` filas o
+    más: ahí devuelve la estimación y se ahorra el recorrido completo."""
+    if estimate_threshold is not None:
+        estimated = estimate(queryset)
+        if estimated is not None and estimated >= estimate_threshold:
+            return estimated
+    return queryset.count()
+
+
+def _written_handler(fields):
+    def model_written(sender, update_fields=None, **kwargs):
+        if fields and update_fields and fields.isdisjoint(update_fields):
+            return
+        invalidate(sender)
+
+    return model_written
+
+
+def track(*models, fields=None):
+    """Invalida los conteos de `models` en cada save()/delete().
+
+    Se llama desde el AppConfig.ready() de la app dueña de cada modelo que
+    alguna lista cuenta con remember(), así la señal queda conectada en todos
+    los procesos (web y workers). Un modelo sin registrar no paga la
+    invalidación en cada escritura ni pierde el fast delete de Django.
+
+    Args:
+        models (type[Model]): Modelos a registrar.
+        fields (Iterable[str], optional): Si se indica, un
+            save(update_fields=...) que no toca ninguno de estos campos no
+            invalida: para modelos que se reescriben seguido sin cambiar lo
+            que se cuenta.
+    """
+    handler = _written_handler(frozenset(fields) if fields else None)
+    for model in models:
+        uid = f"{PREFIX}:{model._meta.label_lower}"
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,136 @@
+"""Exports a Excel en segundo plano (Celery), con seguimiento en /procesos/.
+
+La vista de export (ExcelExportMixin) no arma el archivo: registra una
+TareaEnProceso con la ruta de la vista y los parámetros del request, y encola
+apps.tareas.tasks.export_excel. En el worker, AsyncExcelExporter reconstruye
+la MISMA vista con esos parámetros y reutiliza sus excel_columns, filtros,
+búsqueda y get_values tal cual; el archivo queda en el storage por defecto y
+se descarga desde el monitor de procesos hasta que vence
+(EXPORT_RETENTION_HOURS); purge_expired_exports lo borra en la retención
+periódica de tareas (apps.tareas.retention).
+"""
+
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.tareas.models import TareaEnProceso
+
+# Carpeta (dentro del storage) donde quedan los archivos generados.
+EXPORT_DIR = "exports"
+
+# Los exports se reconocen por el prefijo de su origen.
+EXPORT_ORIGIN_PREFIX = "exportacion_"
+
+
+def view_path(view_class) -> str:
+    """Ruta importable de la vista, la que viaja en datos_entrada."""
+    return f"{view_class.__module__}.{view_class.__qualname__}"
+
+
+class AsyncExcelExporter:
+    """Genera en el worker el .xlsx de una TareaEnProceso de export.
+
+    Attributes:
+        user: Usuario que pidió el export; queda como request.user de la
+            vista reconstruida.
+        task (TareaEnProceso): Tarea con datos_entrada = {"vista",
+            "parametros", "url_kwargs"}.
+    """
+
+    def __init__(self, user, task: TareaEnProceso):
+        self.user = user
+        self.task = task
+
+    def _build_view(self):
+        """Instancia la vista de export como si atendiera el request original."""
+        datos = self.task.datos_entrada
+        request = HttpRequest()
+        request.method = "GET"
+        request.GET = QueryDict(datos.get("parametros", ""))
+        request.user = self.user
+
+        view = import_string(datos["vista"])()
+        view.setup(request, **datos.get("url_kwargs", {}))
+        return view
+
+    def _with_progress(self, rows, every):
+        """Deja pasar las filas y reporta el avance cada `every` filas.
+
+        En cada reporte atiende también un pedido de cancelación: la
+        excepción corta la escritura del workbook y no se guarda nada.
+        """
+        procesados = 0
+        for procesados, row in enumerate(rows, start=1):
+            if procesados % every == 0:
+                self.task.avanzar(procesados)
+                self.task.comprobar_cancelacion()
+            yield row
+        self.task.progreso_actual = procesados
+
+    def run(self):
+        """Escribe el workbook por lotes y lo guarda en el storage."""
+        view = self._build_view()
+        queryset = view.get_export_queryset()
+        self.task.iniciar(total=queryset.count())
+
+        filename = view.get_excel_filename()
+        rows = self._with_progress(
+            view.iter_export_rows(queryset), every=view.export_chunk_size
+        )
+        with tempfile.TemporaryFile() as output:
+            view.write_workbook(rows, output)
+            output.seek(0)
+            path = default_storage.save(
+                f"{EXPORT_DIR}/{self.task.pk}/{filename}", File(output)
+            )
+
+        self.task.completar(
+            archivo=path,
+            nombre_archivo=filename,
+            filas=self.task.progreso_actual,
+            expira_en=(timezone.now() + retention()).isoformat(),
+        )
+
+
+def retention() -> timedelta:
+    return timedelta(hours=settings.EXPORT_RETENTION_HOURS)
+
+
+def purge_expired_exports(now=None) -> int:
+    """Borra del storage los archivos de export vencidos.
+
+    La tarea se conserva en /procesos/ (sin el enlace de descarga): solo se
+    quita "archivo" de su resultado_metadata.
+
+    Args:
+        now (datetime, optional): Instante de referencia; por defecto ahora.
+
+    Returns:
+        int: Cantidad de archivos eliminados.
+    """
+    cutoff = (now or timezone.now()) - retention()
+    expired = TareaEnProceso.objects.filter(
+        origen__startswith=EXPORT_ORIGIN_PREFIX,
+        finalizado_en__lt=cutoff,
+        resultado_metadata__has_key="archivo",
+    )
+    purged = 0
+    for tarea in expired.iterator():
+        metadata = dict(tarea.resultado_metadata)
+        path = metadata.pop("archivo")
+        if path and default_storage.exists(path):
+            default_storage.delete(path)
+            purged += 1
+        tarea.resultado_metadata = {
+            **metadata,
+            "archivo_eliminado": timezone.now().isoformat(),
+        }
+        tarea.save(update_fields=["resultado_metadata", "modified"])
+    return purged
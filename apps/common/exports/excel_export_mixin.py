@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import tempfile
 from datetime import datetime
+from itertools import islice
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.contrib import messages
+from django.http import FileResponse
+from django.shortcuts import redirect
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment
 
+from apps.common.exports.async_export import EXPORT_ORIGIN_PREFIX, view_path
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.styles import (
     CONTENT_TYPE_XLSX,
     FREEZE_HEADER,
-    write_header_row,
+    add_named_style,
+    write_only_header_row,
 )
+from apps.tareas.models import TareaEnProceso
+from apps.tareas.tasks import export_excel
 
 
 class ExcelExportMixin:
@@ -27,6 +37,17 @@ class ExcelExportMixin:
 
     Los estilos del encabezado viven en apps.common.exports.styles (compartidos
     con las plantillas de ejemplo de importación).
+
+    El export es de memoria constante: las filas se leen de la BD por lotes
+    (.iterator), se formatean con el mismo get_values de la list view lote a
+    lote, se escriben en un workbook write-only (que vuelca a disco) y el
+    archivo se devuelve en streaming. No pasa por get_context_data, así que
+    tampoco paga los conteos ni additional_data de la lista.
+
+    Con export_origin definido, un export de EXPORT_ASYNC_THRESHOLD filas o
+    más (o pedido con ?async=1) no se arma en el request: se registra una
+    TareaEnProceso, se encola y el archivo se descarga desde /procesos/ (ver
+    apps.common.exports.async_export).
     """
 
     excel_columns: list[ExcelColumn] = []
@@ -36,6 +57,12 @@ class ExcelExportMixin:
     export_param = "export"  # trigger por querystring: ?export=excel
     export_value = "excel"
     freeze_header = FREEZE_HEADER
+    export_chunk_size = 2000  # filas por lote leído de la BD
+
+    # Export en segundo plano (vacío = siempre dentro del request)
+    export_origin = ""  # slug sin prefijo, p. ej. "clientes"
+    export_process_name = ""  # nombre visible en /procesos/
+    async_param = "async"
 
     # --- Decisión (los hooks que BaseListViewAjax respeta) ---
     def is_export(self) -> bool:
@@ -48,43 +75,116 @@ class ExcelExportMixin:
     def should_paginate(self) -> bool:
         return False if self.is_export() else super().should_paginate()
 
-    def render_to_response(self, context, **response_kwargs):
+    def get(self, request, *args, **kwargs):
         if self.is_export():
-            return self.build_excel_response(context["data"])
-        return super().render_to_response(context, **response_kwargs)
+            queryset = self.get_export_queryset()
+            if self.should_export_async(queryset):
+                return self.enqueue_export()
+            return self.build_excel_response(queryset)
+        return super().get(request, *args, **kwargs)
+
+    # --- Export en segundo plano ---
+    def should_export_async(self, queryset) -> bool:
+        if not self.export_origin:
+            return False
+        if self.request.GET.get(self.async_param) == "1":
+            return True
+        threshold = settings.EXPORT_ASYNC_THRESHOLD
+        # ¿Existe la fila número `threshold`? Sin contar la tabla entera.
+        return queryset.order_by().values("pk")[threshold - 1 : threshold].exists()
+
+    def enqueue_export(self):
+        """Registra la tarea, la encola y redirige al monitor de procesos."""
+        tarea = TareaEnProceso.objects.create(
+            nombre_proceso=self.export_process_name,
+            origen=f"{EXPORT_ORIGIN_PREFIX}{self.export_origin}",
+            user_id=self.request.user.id,
+            datos_entrada={
+                "vista": view_path(type(self)),
+                "parametros": self.request.GET.urlencode(),
+                "url_kwargs": self.kwargs,
+            },
+        )
+
+        resultado = export_excel.delay(tarea.id)
+        tarea.celery_task_id = resultado.id
+        tarea.save(update_fields=["celery_task_id", "modified"])
+
+        messages.success(
+            self.request,
+            f"{self.export_process_name} iniciada. "
+            "El archivo se descarga desde aquí al terminar.",
+        )
+        return redirect("tasks")
+
+    # --- Lectura por lotes ---
+    def get_export_queryset(self):
+        """Mismo queryset que la lista (filtros, búsqueda y orden), sin paginar."""
+        return self.get_processed_queryset().filter(self.get_filter_by_search())
+
+    def iter_export_rows(self, queryset):
+        """Filas ya formateadas por get_values, leídas de a export_chunk_size."""
+        rows = queryset.values(*self.field_list).iterator(
+            chunk_size=self.export_chunk_size
+        )
+        while chunk := list(islice(rows, self.export_chunk_size)):
+            yield from self.get_values(chunk)
 
     # --- Construcción del archivo ---
     def get_excel_filename(self) -> str:
         stamp = datetime.now().strftime("%Y%m%d_%H%M")
         return f"{self.excel_filename}_{stamp}.xlsx"
 
-    def build_excel_response(self, rows: list[dict]) -> HttpResponse:
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = self.excel_sheet_title
+    def _column_styles(self, workbook) -> list[str]:
+        """Un NamedStyle por combinación (alineación, formato), no uno por celda."""
+        styles = []
+        for column in self.excel_columns:
+            number_format = column.number_format or "General"
+            styles.append(
+                add_named_style(
+                    workbook,
+                    f"export_{column.align}_{number_format}",
+                    alignment=Alignment(horizontal=column.align, vertical="center"),
+                    number_format=number_format,
+                )
+            )
+        return styles
+
+    def write_workbook(self, rows, fileobj) -> None:
+        """Escribe `rows` (iterable de dicts) como .xlsx en `fileobj`."""
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=self.excel_sheet_title)
+        if self.freeze_header:
+            sheet.freeze_panes = "A2"
 
         # Encabezado con estilos de marca compartidos
-        write_header_row(
+        write_only_header_row(
+            workbook,
             sheet,
             [column.header for column in self.excel_columns],
             [column.width for column in self.excel_columns],
         )
 
-        for row_index, row in enumerate(rows, start=2):
-            for col_index, column in enumerate(self.excel_columns, start=1):
-                cell = sheet.cell(
-                    row=row_index, column=col_index, value=column.get_value(row)
-                )
-                cell.alignment = Alignment(horizontal=column.align, vertical="center")
-                if column.number_format:
-                    cell.number_format = column.number_format
-
-        if self.freeze_header:
-            sheet.freeze_panes = "A2"
-
-        response = HttpResponse(content_type=CONTENT_TYPE_XLSX)
-        response["Content-Disposition"] = (
-            f'attachment; filename="{self.get_excel_filename()}"'
+        styles = self._column_styles(workbook)
+        for row in rows:
+            cells = []
+            for column, style in zip(self.excel_columns, styles):
+                cell = WriteOnlyCell(sheet, value=column.get_value(row))
+                cell.style = style
+                cells.append(cell)
+            sheet.append(cells)
+
+        workbook.save(fileobj)
+
+    def build_excel_response(self, queryset) -> FileResponse:
+        # Archivo temporal en disco (no en memoria); FileResponse lo devuelve
+        # en bloques y lo cierra (y borra) al terminar.
+        output = tempfile.TemporaryFile()
+        self.write_workbook(self.iter_export_rows(queryset), output)
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=self.get_excel_filename(),
+            content_type=CONTENT_TYPE_XLSX,
         )
-        workbook.save(response)
-        return response
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
 from openpyxl.utils import get_column_letter
 
 CONTENT_TYPE_XLSX = (
@@ -20,6 +21,7 @@ HEADER_FILL = PatternFill("solid", fgColor="D7B28A")
 HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
 HEADER_HEIGHT = 22
 FREEZE_HEADER = True
+HEADER_STYLE_NAME = "export_header"
 
 
 def style_header_cell(cell):
@@ -45,3 +47,45 @@ def write_header_row(sheet, headers, widths=None):
                 sheet.column_dimensions[get_column_letter(col_index)].width = width
     sheet.row_dimensions[1].height = HEADER_HEIGHT
     return sheet
+
+
+# ---------------------------------------------------------------------------
+# Modo write-only (exports en streaming): las celdas no se pueden estilizar
+# una a una después de escritas, y crear un Alignment por celda es justo lo
+# que se quiere evitar. Los estilos se registran UNA vez por workbook como
+# NamedStyle y cada celda solo referencia el nombre.
+# ---------------------------------------------------------------------------
+
+
+def add_named_style(workbook, name, **attributes):
+    """Registra un NamedStyle en el workbook (si no existe) y devuelve su nombre."""
+    if name not in workbook.named_styles:
+        workbook.add_named_style(NamedStyle(name=name, **attributes))
+    return name
+
+
+def write_only_header_row(workbook, sheet, headers, widths=None):
+    """Equivalente a write_header_row para una hoja write-only.
+
+    Anchos, alto y estilos se fijan antes de agregar la fila: en write-only
+    las filas ya escritas no se pueden tocar.
+    """
+    style = add_named_style(
+        workbook,
+        HEADER_STYLE_NAME,
+        font=HEADER_FONT,
+        fill=HEADER_FILL,
+        alignment=HEADER_ALIGNMENT,
+    )
+    for col_index, width in enumerate(widths or [], start=1):
+        if width:
+            sheet.column_dimensions[get_column_letter(col_index)].width = width
+    sheet.row_dimensions[1].height = HEADER_HEIGHT
+
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=header)
+        cell.style = style
+        cells.append(cell)
+    sheet.append(cells)
+    return sheet
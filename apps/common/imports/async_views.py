@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.views.generic import FormView
 
+from apps.common.imports.sources import store_upload
 from apps.common.views.base_views import ProtectedView
+from apps.tareas import queues
 from apps.tareas.models import TareaEnProceso
 
 from .forms import BaseImportForm
@@ -11,11 +14,18 @@ from .forms import BaseImportForm
 class BaseAsyncImportView(ProtectedView, FormView):
     """Vista base de importación asíncrona (Celery). Página normal, no modal.
 
-    La validación superficial (extensión .csv, no vacío, peso máximo y
-    codificación UTF-8) la hace BaseImportForm, que además deja el texto en
-    cleaned_data["contenido"]. Aquí NO se valida el contenido de las filas ni
-    se persiste nada: eso ocurre dentro del worker. Esta vista solo registra
-    la TareaEnProceso y encola.
+    La validación superficial (extensión .xlsx o .csv, no vacío, peso máximo
+    y codificación UTF-8 del CSV) la hace BaseImportForm. Aquí NO se valida el
+    contenido de las filas ni se persiste nada: eso ocurre dentro del worker.
+    Esta vista solo guarda el archivo en el storage, registra la TareaEnProceso
+    con la referencia y encola, con prioridad alta si el archivo no supera
+    IMPORT_PRIORITY_MAX_SIZE.
+
+    El botón «Validar sin importar» (solo_validar en el POST) pide una
+    validación de prueba: la misma tarea con datos_entrada["dry_run"], que no
+    escribe nada (ver BaseAsyncImporter.dry_run). Si el archivo no supera
+    IMPORT_DRY_RUN_SYNC_MAX_SIZE corre en la misma petición y el resultado se
+    pinta en el formulario; si no, se encola como cualquier importación.
 
     Attributes:
         title (str): Título de la página.
@@ -54,6 +64,7 @@ class BaseAsyncImportView(ProtectedView, FormView):
         context["view_url"] = self.view_url
         context["example_export_url"] = self.example_export_url
         context["back_url"] = self.back_url
+        context["max_upload_size"] = self.form_class.MAX_UPLOAD_SIZE
         if self.validator_class:
             context["import_fields"] = self.validator_class.get_headers()
         return context
@@ -62,22 +73,63 @@ class BaseAsyncImportView(ProtectedView, FormView):
         """Registra la tarea, la encola y redirige al monitor de procesos.
 
         Args:
-            form (BaseImportForm): Formulario ya validado, con el texto del
-                CSV en cleaned_data["contenido"].
+            form (BaseImportForm): Formulario ya validado, con el archivo en
+                cleaned_data["archivo"].
 
         Returns:
-            HttpResponseRedirect: Redirección a /procesos/ con un mensaje.
+            HttpResponse: Redirección a /procesos/ con un mensaje o, en una
+                validación de prueba chica, el formulario con el resultado.
         """
+        archivo = form.cleaned_data["archivo"]
+        dry_run = "solo_validar" in self.request.POST
+        nombre_proceso = self.process_name
+        if dry_run:
+            nombre_proceso = f"{self.process_name} (solo validación)"
         tarea = TareaEnProceso.objects.create(
-            nombre_proceso=self.process_name,
+            nombre_proceso=nombre_proceso,
             origen=self.origin,
             user_id=self.request.user.id,
-            datos_entrada={"contenido": form.cleaned_data["contenido"]},
+            datos_entrada={
+                "archivo": store_upload(archivo),
+                "nombre_archivo": archivo.name,
+                "actualizar": form.cleaned_data["actualizar"],
+                "dry_run": dry_run,
+            },
         )
 
-        resultado = self.import_task.delay(tarea.id)
+        if dry_run and archivo.size <= settings.IMPORT_DRY_RUN_SYNC_MAX_SIZE:
+            return self.__dry_run_now(form, tarea)
+
+        resultado = self.import_task.apply_async(
+            args=(tarea.id,), priority=self.__get_priority(archivo, dry_run)
+        )
         tarea.celery_task_id = resultado.id
         tarea.save(update_fields=["celery_task_id", "modified"])
 
-        messages.success(self.request, f"{self.process_name} iniciada.")
+        messages.success(self.request, f"{nombre_proceso} iniciada.")
         return redirect("tasks")
+
+    @staticmethod
+    def __get_priority(archivo, dry_run: bool) -> int:
+        """Las validaciones de prueba y los archivos chicos se adelantan."""
+        if dry_run or archivo.size <= settings.IMPORT_PRIORITY_MAX_SIZE:
+            return queues.PRIORIDAD_ALTA
+        return queues.PRIORIDAD_NORMAL
+
+    def __dry_run_now(self, form, tarea: TareaEnProceso):
+        """Corre la validación de prueba en esta petición y pinta el resultado."""
+        resultado = self.import_task.apply(args=(tarea.id,))
+        tarea.refresh_from_db()
+        tarea.celery_task_id = resultado.id
+        tarea.save(update_fields=["celery_task_id", "modified"])
+        if tarea.estado != TareaEnProceso.Estado.COMPLETADO:
+            messages.error(
+                self.request,
+                tarea.resultado_metadata.get(
+                    "error_detalle", "No se pudo validar el archivo."
+                ),
+            )
+            return self.render_to_response(self.get_context_data(form=form))
+        return self.render_to_response(
+            self.get_context_data(form=form, dry_run=tarea.resultado_metadata)
+        )
@@ -0,0 +1,63 @@
+"""Tamaño de lote adaptativo para persistir importaciones.
+
+Un lote fijo chico multiplica las idas a la BD; uno fijo grande puede pesar
+demasiado con filas anchas o una BD lenta. AdaptiveBatchSize arranca en un
+valor inicial, acota el máximo según el ancho de las filas y después de cada
+lote ajusta el tamaño para que cada inserción tarde cerca de target_seconds.
+"""
+
+# Un lote no crece ni se achica más que este factor de una vez: evita que un
+# lote anómalo (p. ej. un bloqueo puntual) haga oscilar el tamaño.
+MAX_STEP = 2.0
+
+# Bytes que se suman por fila y por campo al estimar el ancho (objeto del
+# modelo, fila histórica, parámetros del INSERT).
+ROW_OVERHEAD = 512
+FIELD_OVERHEAD = 64
+
+
+class AdaptiveBatchSize:
+    """Elige cuántas filas va a tener el próximo lote.
+
+    Attributes:
+        size (int): Tamaño del próximo lote.
+        minimum (int): Piso del tamaño.
+        maximum (int): Techo del tamaño; fit_row_width() puede bajarlo.
+        target_seconds (float): Duración buscada para persistir un lote.
+        max_batch_bytes (int): Memoria aproximada que puede ocupar un lote.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_seconds: float,
+        max_batch_bytes: int,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.max_batch_bytes = max_batch_bytes
+        self.size = self.__clamp(initial)
+
+    def fit_row_width(self, row: dict):
+        """Acota el máximo para que un lote de filas como esta quepa en memoria."""
+        width = ROW_OVERHEAD + sum(
+            FIELD_OVERHEAD + len(str(value)) for value in row.values()
+        )
+        self.maximum = max(
+            self.minimum, min(self.maximum, self.max_batch_bytes // width)
+        )
+        self.size = self.__clamp(self.size)
+
+    def observe(self, rows: int, seconds: float):
+        """Ajusta el tamaño a partir de lo que tardó el último lote."""
+        if rows <= 0 or seconds <= 0:
+            return
+        ideal = rows * self.target_seconds / seconds
+        ideal = min(max(ideal, self.size / MAX_STEP), self.size * MAX_STEP)
+        self.size = self.__clamp(int(ideal))
+
+    def __clamp(self, size: int) -> int:
+        return max(self.minimum, min(self.maximum, size))
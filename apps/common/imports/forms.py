@@ -1,4 +1,8 @@
+import codecs
+import zipfile
+
 from django import forms
+from django.conf import settings
 from django.template.defaultfilters import filesizeformat
 
 from apps.common.form_classes import FORM_CONTROL_CLASS
@@ -7,23 +11,33 @@ from apps.common.form_classes import FORM_CONTROL_CLASS
 class BaseImportForm(forms.Form):
     """Formulario común de importación. Valida SOLO el archivo.
 
-    Comprueba extensión, que no esté vacío, el peso máximo y que sea UTF-8, y
-    deja el texto decodificado en cleaned_data["contenido"] listo para
-    guardarse en la TareaEnProceso. La validación del contenido de cada fila
+    Comprueba extensión, que no esté vacío, el peso máximo y, según el tipo,
+    que un .csv sea UTF-8 o que un .xlsx sea un libro de Excel (un zip). La
+    decodificación se prueba por bloques y el texto no se guarda: la vista
+    deja el archivo en el storage y el worker lo lee en streaming (ver
+    apps.common.imports.sources). "actualizar" pide el modo upsert: las filas
+    que ya existen se actualizan en lugar de duplicarse (ver
+    BaseAsyncImporter.natural_keys). La validación del contenido de cada fila
     vive en el Validator de cada sección; este formulario es agnóstico al
     dominio.
     """
 
-    ALLOWED_EXTENSIONS = (".csv",)
-    MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB (ajustable)
+    ALLOWED_EXTENSIONS = (".csv", ".xlsx")
+    MAX_UPLOAD_SIZE = settings.IMPORT_MAX_UPLOAD_SIZE
 
     archivo = forms.FileField(
         label="Archivo",
-        help_text="Solo archivos .csv en UTF-8",
+        help_text="Archivos .xlsx, o .csv en UTF-8",
         widget=forms.ClearableFileInput(
-            attrs={"class": FORM_CONTROL_CLASS, "accept": ".csv"}
+            attrs={"class": FORM_CONTROL_CLASS, "accept": ".csv,.xlsx"}
         ),
     )
+    actualizar = forms.BooleanField(
+        label="Actualizar los registros que ya existen",
+        help_text="Si no se marca, cada fila se crea como un registro nuevo.",
+        required=False,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
 
     def clean(self):
         cleaned_data = super().clean()
@@ -31,22 +45,39 @@ class BaseImportForm(forms.Form):
         if not archivo:
             return cleaned_data
 
+        if archivo.name.lower().endswith(".xlsx"):
+            archivo.seek(0)
+            if not zipfile.is_zipfile(archivo):
+                self.add_error(
+                    "archivo",
+                    "El archivo no es un Excel válido. Ábrelo en Excel, "
+                    "guárdalo como .xlsx y reintenta.",
+                )
+            archivo.seek(0)
+            return cleaned_data
+
         archivo.seek(0)
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
         try:
-            cleaned_data["contenido"] = archivo.read().decode("utf-8-sig")
+            for chunk in archivo.chunks():
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
         except UnicodeDecodeError:
             self.add_error(
                 "archivo",
                 "El archivo debe estar codificado en UTF-8. "
                 "Guárdalo como 'CSV UTF-8' y reintenta.",
             )
+        archivo.seek(0)
         return cleaned_data
 
     def clean_archivo(self):
         archivo = self.cleaned_data["archivo"]
         nombre = archivo.name.lower()
         if not nombre.endswith(self.ALLOWED_EXTENSIONS):
-            raise forms.ValidationError("Formato no permitido. Sube un archivo .csv")
+            raise forms.ValidationError(
+                "Formato no permitido. Sube un archivo .xlsx o .csv"
+            )
         if archivo.size == 0:
             raise forms.ValidationError("El archivo está vacío.")
         if archivo.size > self.MAX_UPLOAD_SIZE:
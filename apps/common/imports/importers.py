@@ -1,6 +1,25 @@
-from simple_history.utils import bulk_create_with_history
+import time
+from itertools import chain, islice
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model, Q
+from django.db.models.functions import Upper
+from django.utils import timezone
+from result import Err, Ok, Result
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from apps.common import counts
+from apps.common.imports import copy_loader
+from apps.common.imports.batching import AdaptiveBatchSize
+from apps.common.imports.sources import content_hash, delete_source, has_source
+from apps.common.utils.dates import format_duration
+from apps.tareas.cancellation import TareaCancelada
 from apps.tareas.models import TareaEnProceso
+from apps.tareas.progress import ThrottledProgress
+
+# Campos cuya clave natural se compara sin distinguir mayúsculas (UPPER).
+TEXT_FIELD_TYPES = ("CharField", "TextField", "EmailField")
 
 
 class BaseAsyncImporter:
@@ -12,6 +31,28 @@ class BaseAsyncImporter:
     importa nada y la tarea queda FALLIDO con el detalle en
     resultado_metadata["errors"].
 
+    Si el usuario marcó "actualizar existentes" (datos_entrada["actualizar"])
+    la importación es un upsert: cada fila se busca por la clave natural de la
+    entidad (natural_keys) y, si ya existe, se actualiza en lugar de crear un
+    duplicado. El resumen queda en resultado_metadata como created, updated y
+    unchanged.
+
+    Es reanudable: cada lote se confirma en la misma transacción que el
+    checkpoint de la tarea (TareaEnProceso.checkpoint_filas, junto con el hash
+    del archivo). Si el worker muere y Celery reentrega la tarea
+    (CELERY_TASK_ACKS_LATE), run() saltea las filas ya confirmadas en lugar de
+    validarlas e insertarlas de nuevo; si el archivo ya no es el mismo, la
+    tarea falla antes de duplicar nada.
+
+    Es cancelable: entre bloque y bloque de validación y entre lote y lote al
+    persistir se consulta si el usuario pidió cancelar (ver
+    apps.tareas.cancellation). Los lotes ya confirmados quedan y la tarea
+    termina CANCELADO informando cuántas filas alcanzaron a importarse.
+
+    Con datos_entrada["dry_run"] la tarea solo valida (ver dry_run()): no
+    escribe registros y deja en resultado_metadata el diagnóstico y la
+    estimación de tiempo.
+
     Cada entidad declara su subclase con lo mínimo:
 
         class ClientAsyncImporter(BaseAsyncImporter):
@@ -23,13 +64,31 @@ class BaseAsyncImporter:
         validator_class: Subclase de BaseAsyncImportValidator de la entidad.
             Obligatoria.
         model: Modelo destino de la importación. Obligatorio.
-        batch_size (int): Filas por lote al persistir. Marca también cada
-            cuánto se actualiza la barra de progreso.
+        batch_size (int): Filas del PRIMER lote al persistir. Los siguientes
+            se ajustan solos (AdaptiveBatchSize) entre min_batch_size y
+            max_batch_size, según el ancho de las filas y lo que tarda cada
+            inserción, buscando target_batch_seconds por lote.
+        min_batch_size (int): Piso del lote adaptativo.
+        max_batch_size (int): Techo del lote adaptativo.
+        target_batch_seconds (float): Duración buscada por lote.
+        max_batch_bytes (int): Memoria aproximada que puede ocupar un lote.
+        copy_threshold (int): Desde cuántas filas una importación (no upsert)
+            se carga con COPY en PostgreSQL (save_with_copy). 0 lo desactiva.
         max_stored_errors (int): Tope de errores que se persisten en la
             metadata de la tarea; el total real queda en total_errors.
+        dry_run_max_errors (int): Errores tras los que la validación de
+            prueba deja de validar.
         success_message (str): Plantilla del mensaje final; recibe {count}.
             Cada entidad la redefine para respetar el género del sustantivo
             ("clientes importados" / "categorías importadas").
+        natural_keys (tuple[tuple[str, ...], ...]): Claves naturales para el
+            upsert, en orden de prioridad; cada una es una tupla de campos.
+            Los textos se comparan sin distinguir mayúsculas y una clave con
+            algún texto vacío no se usa. Ej.: (("telefono",), ("email",))
+            busca primero por teléfono y, si no hay, por email.
+        upsert_message (str): Plantilla del mensaje final del upsert; recibe
+            {created}, {updated} y {unchanged}.
+        upsert (bool): True si la tarea pidió actualizar los existentes.
         user: Usuario que disparó la importación; queda como autor en el
             historial de simple_history.
         task (TareaEnProceso): Fila de seguimiento que se va actualizando.
@@ -38,13 +97,26 @@ class BaseAsyncImporter:
             rows_error y errors.
         validation_result (Result): Resultado de validate(); None hasta que
             run() lo ejecuta.
+        resume_from (int): Filas que una entrega anterior ya confirmó; 0 en
+            la primera. Lo llena run() a partir del checkpoint.
     """
 
     validator_class = None
     model = None
-    batch_size = 10
+    batch_size = settings.IMPORT_BATCH_SIZE
+    min_batch_size = 50
+    max_batch_size = settings.IMPORT_MAX_BATCH_SIZE
+    target_batch_seconds = 1.0
+    max_batch_bytes = 16 * 1024 * 1024
+    copy_threshold = settings.IMPORT_COPY_THRESHOLD
     max_stored_errors = 200
+    dry_run_max_errors = settings.IMPORT_DRY_RUN_MAX_ERRORS
     success_message = "{count} registros importados correctamente."
+    natural_keys: tuple = ()
+    upsert_message = (
+        "Importación terminada: {created} nuevos, {updated} actualizados y "
+        "{unchanged} sin cambios."
+    )
 
     def __init__(self, user, task: TareaEnProceso):
         if self.validator_class is None or self.model is None:
@@ -53,8 +125,15 @@ class BaseAsyncImporter:
             )
         self.user = user
         self.task = task
+        self.upsert = bool(task.datos_entrada.get("actualizar"))
+        if self.upsert and not self.natural_keys:
+            raise NotImplementedError(
+                f"{type(self).__name__} debe definir 'natural_keys' para "
+                "actualizar registros existentes."
+            )
         self.validator = None
         self.validation_result = None
+        self.resume_from = 0
 
     def _must_stop(self):
         """Corta la importación si la validación dejó errores.
@@ -72,9 +151,16 @@ class BaseAsyncImporter:
 
         errors = self.validation_result.value
         total_errors = len(errors)
+        if self.resume_from:
+            outcome = (
+                f"quedaron importadas solo las primeras {self.resume_from} "
+                "filas, de una ejecución anterior."
+            )
+        else:
+            outcome = "no se importó nada."
         error_detail = (
             f"{self.validator.rows_error} fila(s) con error "
-            f"({total_errors} error(es) en total): no se importó nada."
+            f"({total_errors} error(es) en total): {outcome}"
         )
         if total_errors > self.max_stored_errors:
             error_detail += f" Mostrando los primeros {self.max_stored_errors}."
@@ -88,7 +174,7 @@ class BaseAsyncImporter:
         )
         return True
 
-    def save(self, data: list) -> int:
+    def save(self, data) -> int:
         """Persiste por lotes, reportando el avance después de cada uno.
 
         Las entidades importables son auditadas (simple_history) y
@@ -98,46 +184,478 @@ class BaseAsyncImporter:
         Cada lote es su propia transacción, a propósito: envolver todo en un
         único atomic dejaría las escrituras de progreso sin commitear hasta el
         final, y la barra no se movería. La contrapartida es que un fallo a
-        mitad deja insertados los lotes anteriores.
+        mitad deja insertados los lotes anteriores; por eso cada lote
+        confirma también el checkpoint, y una reentrega sigue desde ahí. El
+        avance no se escribe por lote sino como mucho una vez por
+        TASK_PROGRESS_INTERVAL. Después de cada lote se atiende un pedido de
+        cancelación.
 
         Args:
-            data (list[dict]): Filas limpias a persistir.
+            data (Iterable[dict]): Filas limpias a persistir. Se consumen de
+                a un lote: no hace falta tenerlas todas en memoria.
 
         Returns:
-            int: Cantidad de registros creados.
+            int: Cantidad de registros creados, contando los que confirmó una
+                entrega anterior.
         """
-        saved = 0
-        for start in range(0, len(data), self.batch_size):
-            objects = [
-                self.model(**item) for item in data[start : start + self.batch_size]
-            ]
-            bulk_create_with_history(
-                objects,
-                self.model,
-                batch_size=self.batch_size,
-                default_user=self.user,
-            )
-            saved += len(objects)
-            self.task.avanzar(saved)
+        saved = self.resume_from
+        progress = ThrottledProgress(self.task)
+        for batch in self._iter_batches(data):
+            objects = [self.model(**item) for item in batch]
+            with transaction.atomic():
+                bulk_create_with_history(
+                    objects,
+                    self.model,
+                    batch_size=len(objects),
+                    default_user=self.user,
+                )
+                saved += len(objects)
+                self.task.registrar_checkpoint(saved)
+            self._invalidate()
+            progress.update(saved)
+            self.task.comprobar_cancelacion()
+        progress.flush()
         return saved
 
+    def save_with_copy(self, data) -> int:
+        """Persiste todo con COPY y SQL por conjuntos (ver CopyLoader).
+
+        A diferencia de save(), es una sola transacción: si algo falla no
+        queda ningún registro. El historial se escribe igual, con el usuario
+        que disparó la importación, y el checkpoint se confirma junto con los
+        datos. La cancelación se atiende mientras se arma el archivo de COPY,
+        antes de insertar nada.
+
+        Args:
+            data (Iterable[dict]): Filas limpias a persistir.
+
+        Returns:
+            int: Cantidad de registros creados, contando los que confirmó una
+                entrega anterior.
+        """
+        progress = ThrottledProgress(self.task)
+        saved = copy_loader.CopyLoader(self.model, self.user).load(
+            self._cancellable(data),
+            progress,
+            checkpoint=lambda inserted: self.task.registrar_checkpoint(
+                self.resume_from + inserted
+            ),
+        )
+        progress.flush()
+        self._invalidate()
+        return self.resume_from + saved
+
+    def _invalidate(self):
+        """Descarta lo cacheado sobre el modelo tras un lote escrito.
+
+        bulk_create y bulk_update no disparan señales: las cachés que se
+        invalidan con ellas se invalidan aquí. Las subclases agregan las
+        propias de su modelo.
+        """
+        counts.invalidate(self.model)
+
+    def _cancellable(self, data):
+        """Deja pasar las filas y cada batch_size atiende la cancelación."""
+        for index, item in enumerate(data, start=1):
+            if index % self.batch_size == 0:
+                self.task.comprobar_cancelacion()
+            yield item
+
+    def _use_copy(self, total: int) -> bool:
+        if not self.copy_threshold or total < self.copy_threshold:
+            return False
+        return copy_loader.is_available()
+
+    def _iter_batches(self, data):
+        """Parte las filas en lotes de tamaño adaptativo.
+
+        El tiempo entre que se entrega un lote y se pide el siguiente es lo
+        que tardó en persistirse: con eso se ajusta el tamaño del próximo.
+
+        Yields:
+            list[dict]: Lote de filas limpias.
+        """
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+        sizer = AdaptiveBatchSize(
+            initial=self.batch_size,
+            minimum=self.min_batch_size,
+            maximum=self.max_batch_size,
+            target_seconds=self.target_batch_seconds,
+            max_batch_bytes=self.max_batch_bytes,
+        )
+        sizer.fit_row_width(first_row)
+        rows = chain((first_row,), rows)
+        while batch := list(islice(rows, sizer.size)):
+            started = time.monotonic()
+            yield batch
+            sizer.observe(len(batch), time.monotonic() - started)
+
+    def save_or_update(self, data) -> dict:
+        """Upsert por lotes: crea lo nuevo y actualiza lo que cambió.
+
+        Por cada lote se traen los registros existentes con una consulta por
+        clave natural (todas las claves del lote en un IN), se comparan en
+        memoria y se persiste con bulk_create_with_history y
+        bulk_update_with_history, así ambos caminos dejan historial. Una fila
+        que repite la clave de otra anterior del mismo archivo se aplica
+        sobre ese mismo registro.
+
+        Como en save(), cada lote confirma el checkpoint; el resumen parcial
+        viaja con él en resultado_metadata para que una reentrega lo retome.
+
+        Args:
+            data (Iterable[dict]): Filas limpias, consumidas de a un lote.
+
+        Returns:
+            dict: {"created", "updated", "unchanged"}; suman las filas.
+        """
+        summary = {
+            key: self.task.resultado_metadata.get(key, 0) if self.resume_from else 0
+            for key in ("created", "updated", "unchanged")
+        }
+        processed = self.resume_from
+        progress = ThrottledProgress(self.task)
+        for batch in self._iter_batches(data):
+            existing = self.__get_existing(batch)
+            to_create: list = []
+            to_update: dict = {}
+            updated_fields: set = set()
+            for item in batch:
+                keys = self.__get_keys(item)
+                instance = next(
+                    (existing[key] for key in keys if key in existing), None
+                )
+                if instance is None:
+                    instance = self.model(**item)
+                    to_create.append(instance)
+                    summary["created"] += 1
+                else:
+                    changed = self.__apply_changes(instance, item)
+                    if not changed:
+                        summary["unchanged"] += 1
+                        continue
+                    summary["updated"] += 1
+                    if instance.pk is not None:
+                        to_update[instance.pk] = instance
+                        updated_fields |= changed
+                for key in keys:
+                    existing.setdefault(key, instance)
+
+            with transaction.atomic():
+                if to_create:
+                    bulk_create_with_history(
+                        to_create,
+                        self.model,
+                        batch_size=len(to_create),
+                        default_user=self.user,
+                    )
+                if to_update:
+                    self.__bulk_update(list(to_update.values()), updated_fields)
+                processed += len(batch)
+                self.task.registrar_checkpoint(processed, **summary)
+            if to_create or to_update:
+                self._invalidate()
+            progress.update(processed)
+            self.task.comprobar_cancelacion()
+        progress.flush()
+        return summary
+
+    def __bulk_update(self, instances: list, fields: set):
+        # bulk_update no dispara auto_now: el "modified" de TimeStampedModel
+        # se pone a mano para que el registro refleje la actualización.
+        fields = sorted(fields)
+        if any(field.name == "modified" for field in self.model._meta.fields):
+            now = timezone.now()
+            for instance in instances:
+                instance.modified = now
+            fields.append("modified")
+        bulk_update_with_history(
+            instances,
+            self.model,
+            fields=fields,
+            batch_size=len(instances),
+            default_user=self.user,
+        )
+
+    @staticmethod
+    def __key_value(value):
+        if isinstance(value, Model):
+            return value.pk
+        if isinstance(value, str):
+            return value.strip().upper()
+        return value
+
+    def __get_keys(self, item: dict) -> list:
+        """Claves naturales de una fila limpia, en orden de prioridad."""
+        keys: list = []
+        for index, fields in enumerate(self.natural_keys):
+            values = tuple(self.__key_value(item.get(field)) for field in fields)
+            if "" not in values:
+                keys.append((index, values))
+        return keys
+
+    def __get_existing(self, batch: list) -> dict:
+        """Registros que ya existen para las claves del lote: {clave: instancia}.
+
+        Una consulta por clave natural. Si dos claves apuntan al mismo
+        registro se comparte la instancia, para no pisar cambios.
+        """
+        existing: dict = {}
+        by_pk: dict = {}
+        meta = self.model._meta
+        for index, fields in enumerate(self.natural_keys):
+            keys = {
+                key
+                for item in batch
+                for key in self.__get_keys(item)
+                if key[0] == index
+            }
+            if not keys:
+                continue
+            queryset = self.model._default_manager.order_by("pk")
+            for position, name in enumerate(fields):
+                field = meta.get_field(name)
+                values = {values[position] for _, values in keys}
+                if field.is_relation:
+                    condition = Q(**{f"{field.attname}__in": values - {None}})
+                    if None in values:
+                        condition |= Q(**{f"{field.attname}__isnull": True})
+                    queryset = queryset.filter(condition)
+                elif field.get_internal_type() in TEXT_FIELD_TYPES:
+                    alias = f"_natural_{name}"
+                    queryset = queryset.annotate(**{alias: Upper(name)}).filter(
+                        **{f"{alias}__in": values}
+                    )
+                else:
+                    queryset = queryset.filter(**{f"{name}__in": values})
+            for instance in queryset:
+                instance = by_pk.setdefault(instance.pk, instance)
+                values = tuple(
+                    self.__key_value(getattr(instance, meta.get_field(name).attname))
+                    for name in fields
+                )
+                existing.setdefault((index, values), instance)
+        return existing
+
+    def __apply_changes(self, instance, item: dict) -> set:
+        """Copia en la instancia los valores de la fila que difieren.
+
+        Returns:
+            set[str]: Campos que cambiaron (vacío si la fila no trae nada
+                nuevo). None y "" se consideran el mismo valor.
+        """
+        changed: set = set()
+        meta = self.model._meta
+        for name, value in item.items():
+            field = meta.get_field(name)
+            current = getattr(instance, field.attname)
+            new = value.pk if isinstance(value, Model) else value
+            if current in (None, "") and new in (None, ""):
+                continue
+            if current != new:
+                setattr(instance, name, value)
+                changed.add(name)
+        return changed
+
+    def dry_run(self) -> dict:
+        """Valida el archivo sin escribir nada y estima cuánto tardaría.
+
+        Corta al juntar dry_run_max_errors errores (el resto del archivo solo
+        se cuenta) y no guarda las filas limpias, así que responde rápido
+        aun con archivos grandes o llenos de errores. La estimación usa el
+        ritmo de las últimas importaciones completas del mismo origen; si no
+        hay ninguna, el de esta validación, salvo que haya cortado antes de
+        terminar.
+
+        Returns:
+            dict: Diagnóstico con la forma de resultado_metadata: rows_total,
+                rows_ok, rows_error, total_errors, errors (acotados a
+                max_stored_errors), aborted, rows_per_second,
+                projected_seconds, projected_display y mensaje.
+        """
+        self.validator = self.validator_class(task=self.task)
+        started = time.monotonic()
+        try:
+            self.validation_result = self.validator.validate(
+                max_errors=self.dry_run_max_errors, keep_rows=False
+            )
+        finally:
+            self.validator.close()
+        seconds = time.monotonic() - started
+
+        errors = [] if self.validation_result.is_ok() else self.validation_result.value
+        rows_total = self.validator.rows_read
+        rows_per_second = rows_total / seconds if seconds else 0
+        rate = self._import_rate()
+        if rate is None and not self.validator.aborted:
+            rate = rows_per_second
+        projected = rows_total / rate if rate else None
+
+        if errors:
+            mensaje = f"{self.validator.rows_error} fila(s) con error"
+            if self.validator.aborted:
+                mensaje += (
+                    f": la validación se detuvo en los primeros {len(errors)} "
+                    "errores"
+                )
+            mensaje += ". No se importó nada."
+        else:
+            mensaje = f"El archivo está listo: {rows_total} filas válidas."
+            if projected is not None:
+                mensaje += (
+                    f" Tiempo estimado de importación: {format_duration(projected)}."
+                )
+
+        return {
+            "dry_run": True,
+            "mensaje": mensaje,
+            "rows_total": rows_total,
+            "rows_ok": self.validator.rows_ok,
+            "rows_error": self.validator.rows_error,
+            "total_errors": len(errors),
+            "errors": errors[: self.max_stored_errors],
+            "aborted": self.validator.aborted,
+            "rows_per_second": round(rows_per_second),
+            "projected_seconds": round(projected) if projected is not None else None,
+            "projected_display": format_duration(projected),
+        }
+
+    def _import_rate(self) -> float | None:
+        """Filas por segundo de las últimas importaciones del mismo origen.
+
+        Cuenta desde que se encolaron hasta que terminaron: incluye la espera
+        en la cola y la validación, que es lo que de verdad espera el usuario.
+        """
+        recent = (
+            TareaEnProceso.objects.filter(
+                origen=self.task.origen,
+                estado=TareaEnProceso.Estado.COMPLETADO,
+                total_registros__gt=0,
+                finalizado_en__isnull=False,
+                resultado_metadata__has_key="created",
+            )
+            .order_by("-created")
+            .values_list("total_registros", "created", "finalizado_en")[:10]
+        )
+        rows = seconds = 0
+        for total, created, finished in recent:
+            rows += total
+            seconds += (finished - created).total_seconds()
+        if not rows or seconds <= 0:
+            return None
+        return rows / seconds
+
+    def _get_checkpoint(self) -> Result:
+        """Filas que una entrega anterior de esta misma tarea ya confirmó.
+
+        Returns:
+            Result: Ok(int) con las filas a saltear (0 si la tarea no tiene
+                checkpoint), o Err(str) si el archivo ya no es aquel al que se
+                refiere el checkpoint y reanudar duplicaría registros.
+        """
+        if not self.task.checkpoint_filas:
+            return Ok(0)
+        if not has_source(self.task.datos_entrada):
+            return Err(
+                f"Se interrumpió tras importar {self.task.checkpoint_filas} "
+                "filas y el archivo ya no está disponible para reanudar."
+            )
+        if content_hash(self.task.datos_entrada) != self.task.checkpoint_hash:
+            return Err(
+                f"Se interrumpió tras importar {self.task.checkpoint_filas} "
+                "filas y el archivo cambió: reanudar duplicaría registros."
+            )
+        return Ok(self.task.checkpoint_filas)
+
+    def _cancel(self):
+        """Cierra la tarea como CANCELADO con lo que alcanzó a confirmarse."""
+        imported = self.task.checkpoint_filas
+        if imported:
+            # En el upsert esas filas pueden ser actualizaciones.
+            verbo = "procesadas" if self.upsert else "importadas"
+            mensaje = (
+                f"Importación cancelada: quedaron {verbo} las primeras "
+                f"{imported} filas."
+            )
+        else:
+            mensaje = "Importación cancelada: no se importó nada."
+        self.task.progreso_actual = imported
+        metadata = {} if self.upsert else {"created": imported}
+        self.task.cancelar(mensaje=mensaje, **metadata)
+
     def run(self):
         """Ejecuta la importación completa y deja la tarea en su estado final.
 
         Valida todas las filas antes de guardar nada. Si alguna falla, la
         tarea queda FALLIDO con los errores en resultado_metadata["errors"]
         y no se inserta ningún registro. Si todas pasan, guarda por lotes
-        moviendo la barra de progreso y cierra la tarea como COMPLETADO.
+        (save, save_with_copy si es muy grande o, en modo upsert,
+        save_or_update) moviendo la barra de progreso y cierra la tarea como
+        COMPLETADO.
+
+        Si la tarea pidió solo validar (datos_entrada["dry_run"]), corre
+        dry_run() y la cierra como COMPLETADO con el diagnóstico.
+
+        Si la tarea es una reentrega, retoma desde el checkpoint: las filas
+        ya confirmadas no se validan ni se insertan otra vez. Si la tarea ya
+        había terminado no hace nada. Si el usuario la cancela, se detiene
+        en el próximo bloque o lote y queda CANCELADO.
+
+        Termine como termine, el archivo subido se borra del storage.
         """
-        self.validator = self.validator_class(task=self.task)
-        self.validation_result = self.validator.validate()
-        if self._must_stop():
+        if not self.task.activa:
+            # El worker murió después de cerrar la tarea y antes del ack.
+            return
+        if self.task.datos_entrada.get("dry_run"):
+            self.task.iniciar()
+            try:
+                report = self.dry_run()
+            finally:
+                delete_source(self.task.datos_entrada)
+            self.task.iniciar(total=report["rows_total"])
+            self.task.completar(**report)
             return
+        checkpoint = self._get_checkpoint()
+        if checkpoint.is_err():
+            self.task.fallar(checkpoint.value)
+            delete_source(self.task.datos_entrada)
+            return
+        self.resume_from = checkpoint.value
+
+        self.validator = self.validator_class(
+            task=self.task, skip_rows=self.resume_from
+        )
+        try:
+            self.validation_result = self.validator.validate()
+            if self._must_stop():
+                return
 
-        cleaned_data = self.validation_result.value
-        total = len(cleaned_data)
-        self.task.iniciar(total=total)
-        self.task.avanzar(max(1, total // 100))
+            pending = self.validation_result.value
+            total = self.resume_from + pending
+            self.task.iniciar(total=total)
+            self.task.avanzar(max(self.resume_from, total // 100, 1))
+            if not self.task.checkpoint_hash:
+                self.task.registrar_checkpoint(
+                    0, hash_contenido=content_hash(self.task.datos_entrada)
+                )
 
-        saved = self.save(cleaned_data)
-        self.task.completar(mensaje=self.success_message.format(count=saved))
+            if self.upsert:
+                summary = self.save_or_update(self.validator.iter_cleaned_data())
+                self.task.completar(
+                    mensaje=self.upsert_message.format(**summary), **summary
+                )
+                return
+
+            save = self.save_with_copy if self._use_copy(pending) else self.save
+            saved = save(self.validator.iter_cleaned_data())
+            self.task.completar(
+                mensaje=self.success_message.format(count=saved), created=saved
+            )
+        except TareaCancelada:
+            self._cancel()
+        finally:
+            self.validator.close()
+            delete_source(self.task.datos_entrada)
@@ -0,0 +1,88 @@
+"""Tablas de referencia que un validator de importación precarga en bloque.
+
+Un clean_<campo> que consulta la BD por cada fila convierte una importación de
+50k filas en 50k consultas. En su lugar el validator declara sus `lookups`;
+antes de validar, la base recorre el archivo una vez juntando los valores
+distintos de cada columna, los trae con una consulta por lote y los deja en
+`validator.preloaded[nombre]`, donde los clean_<campo> los resuelven en
+memoria.
+
+    lookups = {
+        "categorias": Lookup(Categoria, column="categoria", normalize=int),
+        "emails": Lookup(
+            Cliente, column="email", field="email", exists_only=True,
+            case_insensitive=True,
+        ),
+    }
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Optional
+
+from django.db.models.functions import Lower
+
+# Valores por consulta: mantiene el IN (...) acotado en cualquier motor.
+LOOKUP_BATCH_SIZE = 1000
+
+
+@dataclass
+class Lookup:
+    """Describe una referencia precargada a partir de una columna del CSV."""
+
+    model: Any  # modelo consultado (se usa su manager por defecto)
+    column: str  # campo del validator (clave de 'fields') que trae el valor
+    field: str = "pk"  # campo del modelo con el que se cruza el valor
+    normalize: Optional[Callable[[str], Any]] = None  # valor crudo -> clave
+    exists_only: bool = False  # True: solo el set de claves existentes (unicidad)
+    case_insensitive: bool = False  # compara en minúsculas (p. ej. emails)
+
+    def get_key(self, raw_value: str) -> Any:
+        """Clave con la que se busca el valor crudo, o None si no aplica.
+
+        Un valor vacío o que normalize no acepta no se consulta: el
+        clean_<campo> se encarga de reportarlo.
+        """
+        if not raw_value:
+            return None
+        try:
+            key = self.normalize(raw_value) if self.normalize else raw_value
+        except (TypeError, ValueError):
+            return None
+        if self.case_insensitive and isinstance(key, str):
+            key = key.lower()
+        return key if key not in ("", None) else None
+
+    def fetch(self, keys) -> dict | set:
+        """Trae de la BD las claves dadas, de a LOOKUP_BATCH_SIZE por consulta.
+
+        Returns:
+            dict | set: {clave: instancia} (vía in_bulk), o el set de claves
+                que ya existen si exists_only.
+        """
+        found = set() if self.exists_only else {}
+        keys = iter(keys)
+        while batch := list(islice(keys, LOOKUP_BATCH_SIZE)):
+            if self.exists_only:
+                found.update(self.__existing(batch))
+            elif self.field == "pk":
+                found.update(self.model._default_manager.in_bulk(batch))
+            else:
+                found.update(
+                    self.model._default_manager.in_bulk(batch, field_name=self.field)
+                )
+        return found
+
+    def __existing(self, batch: list):
+        queryset = self.model._default_manager.all()
+        if self.case_insensitive:
+            return (
+                queryset.annotate(_lookup_key=Lower(self.field))
+                .filter(_lookup_key__in=batch)
+                .values_list("_lookup_key", flat=True)
+            )
+        return queryset.filter(**{f"{self.field}__in": batch}).values_list(
+            self.field, flat=True
+        )
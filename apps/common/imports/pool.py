@@ -0,0 +1,32 @@
+"""Procesos del pool de validación de las importaciones.
+
+Los procesos nacen con spawn: un intérprete limpio, sin el hilo de latido ni
+los sockets de la BD y de Redis del worker. Para arrancarlos, el hijo importa
+este módulo antes que nada, así que aquí no se importa Django a nivel de
+módulo: init_worker() lo configura primero y recién después deserializa el
+estado (clase del validator y lo precargado, que puede traer instancias de
+modelos).
+"""
+
+import pickle
+
+# Validator de cada proceso del pool; lo arma init_worker una sola vez.
+_validator = None
+
+
+def init_worker(state: bytes):
+    """Inicializa un proceso del pool con las referencias ya precargadas."""
+    import django
+
+    django.setup()
+    global _validator
+    validator_class, preloaded, upsert, max_errors = pickle.loads(state)
+    _validator = validator_class()
+    _validator.preloaded = preloaded
+    _validator.upsert = upsert
+    _validator.max_errors = max_errors
+
+
+def validate_chunk(chunk: list) -> tuple:
+    """Punto de entrada de los procesos del pool: valida un bloque de filas."""
+    return _validator.validate_chunk(chunk)
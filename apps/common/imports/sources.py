@@ -0,0 +1,94 @@
+"""Archivo de origen de una importación asíncrona.
+
+La vista guarda el archivo subido (.csv o .xlsx) en el storage por defecto y
+la TareaEnProceso solo lleva la referencia (datos_entrada["archivo"]); el
+worker lo lee en streaming y lo borra al terminar. Así ni la tabla
+tareas_en_proceso ni la memoria del worker crecen con el tamaño del archivo.
+"""
+
+import hashlib
+import io
+import uuid
+
+from django.core.files.storage import default_storage
+from openpyxl import load_workbook
+
+# Carpeta (dentro del storage) donde esperan los archivos subidos.
+IMPORT_DIR = "imports"
+
+
+def store_upload(archivo) -> str:
+    """Guarda el archivo subido y devuelve su ruta en el storage.
+
+    El storage copia por bloques (chunks del UploadedFile), así que un
+    archivo grande no pasa entero por memoria.
+    """
+    path = f"{IMPORT_DIR}/{uuid.uuid4().hex}/{archivo.name}"
+    return default_storage.save(path, archivo)
+
+
+def has_source(datos_entrada: dict) -> bool:
+    if datos_entrada.get("archivo"):
+        return default_storage.exists(datos_entrada["archivo"])
+    # Tareas encoladas antes del cambio: el texto viajaba en la tarea.
+    return bool(datos_entrada.get("contenido", "").strip())
+
+
+def is_xlsx(datos_entrada: dict) -> bool:
+    return datos_entrada.get("archivo", "").lower().endswith(".xlsx")
+
+
+def iter_xlsx_rows(datos_entrada: dict):
+    """Filas de la primera hoja del .xlsx de la tarea, con celdas tipadas.
+
+    openpyxl en modo read_only recorre el XML de la hoja sin armar el libro
+    en memoria; data_only entrega el valor calculado de las fórmulas.
+
+    Yields:
+        list: Valores de cada fila tal como los tipa Excel (str, int, float,
+            datetime, time, timedelta, bool o None para la celda vacía).
+    """
+    with default_storage.open(datos_entrada["archivo"], "rb") as archivo:
+        workbook = load_workbook(archivo, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+
+
+def open_source(datos_entrada: dict):
+    """Abre el CSV de la tarea como texto (UTF-8, sin BOM), para leer en streaming.
+
+    Returns:
+        io.TextIOBase: Stream de texto; quien lo abre lo cierra.
+    """
+    if datos_entrada.get("archivo"):
+        return io.TextIOWrapper(
+            default_storage.open(datos_entrada["archivo"], "rb"),
+            encoding="utf-8-sig",
+            newline="",
+        )
+    return io.StringIO(datos_entrada.get("contenido", ""))
+
+
+def content_hash(datos_entrada: dict) -> str:
+    """SHA-256 del archivo de la tarea, calculado por bloques.
+
+    Identifica el contenido al que se refiere el checkpoint de una
+    importación: si el archivo cambió, reanudar duplicaría filas.
+    """
+    digest = hashlib.sha256()
+    if datos_entrada.get("archivo"):
+        with default_storage.open(datos_entrada["archivo"], "rb") as archivo:
+            for chunk in archivo.chunks():
+                digest.update(chunk)
+    else:
+        digest.update(datos_entrada.get("contenido", "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def delete_source(datos_entrada: dict) -> None:
+    path = datos_entrada.get("archivo")
+    if path and default_storage.exists(path):
+        default_storage.delete(path)
@@ -1,42 +1,139 @@
 import csv
+import datetime
 import io
-
+import multiprocessing
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from django.conf import settings
 from result import Err, Ok, Result
 
+from apps.common.imports import pool
+from apps.common.imports.sources import (
+    has_source,
+    is_xlsx,
+    iter_xlsx_rows,
+    open_source,
+)
 from apps.common.utils.text import truncate_text
 from apps.tareas.models import TareaEnProceso
 
 
+class _SourceError(Exception):
+    """El archivo no se pudo leer; el mensaje va tal cual al usuario."""
+
+
+def _cell_text(value) -> str:
+    """Texto de una celda, para los campos que se validan como texto.
+
+    Un número entero que Excel guardó como 5.0 vuelve a ser "5".
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
 class BaseAsyncImportValidator:
     """Valida y sanea el CSV de una importación asíncrona, fila por fila.
 
-    Recibe la TareaEnProceso y trabaja sobre el texto que la vista dejó en
-    datos_entrada["contenido"]. La subclase de cada entidad define los
-    campos y los clean_<campo>.
+    Recibe la TareaEnProceso y lee, en streaming, el archivo que la vista dejó
+    en el storage (datos_entrada["archivo"], ver apps.common.imports.sources):
+    un .csv o la primera hoja de un .xlsx. La subclase de cada entidad define
+    los campos y los clean_<campo>.
+
+    Del CSV todas las celdas llegan como texto. Del .xlsx llegan tipadas por
+    Excel; los clean_<campo> de 'typed_fields' reciben ese valor tal cual
+    (int, float, datetime, time, timedelta...) y el resto lo recibe como
+    texto, igual que desde un CSV.
+
+    Ninguna etapa arma la lista completa de filas: el CSV se lee como
+    generador y las filas limpias se van volcando a un archivo temporal, del
+    que iter_cleaned_data() las vuelve a leer de a una.
+
+    Las filas se validan en bloques de chunk_size. Si el archivo trae más de
+    un bloque, los bloques se reparten entre max_workers procesos; los
+    resultados se juntan en el orden del archivo, así que la numeración de
+    filas y el todo-o-nada no cambian respecto de validarlas en serie. El
+    pool solo se usa si el proceso actual puede tener hijos: el worker de
+    importaciones corre con --pool=solo (ver docker-compose.yml); un hijo del
+    pool prefork de Celery es un proceso daemon y valida en serie.
+
+    Los clean_<campo> no consultan la BD fila por fila: las referencias que
+    necesitan se declaran en 'lookups' y se precargan antes de validar (ver
+    apps.common.imports.lookups).
+
+    Con skip_rows > 0 las primeras filas de datos no se validan ni se
+    entregan: son las que una entrega anterior de la misma tarea ya dejó en
+    la BD (ver BaseAsyncImporter y TareaEnProceso.checkpoint_filas). La
+    numeración de filas de los errores sigue siendo la del archivo.
+
+    validate(max_errors=N) corta apenas junta N errores, sin validar el
+    resto: es lo que usa la validación de prueba (BaseAsyncImporter.dry_run)
+    para responder rápido sobre un archivo con muchos errores.
+
+    Entre bloque y bloque se atiende un pedido de cancelación de la tarea
+    (TareaEnProceso.comprobar_cancelacion): validate() lanza TareaCancelada
+    y los bloques que estaban en vuelo en el pool se descartan.
 
     Attributes:
         fields (dict): Mapa {campo_del_modelo: "Encabezado"}. El ORDEN define
             el orden de las columnas del CSV.
+        lookups (dict): Mapa {nombre: Lookup} de referencias a precargar.
+        typed_fields (set[str]): Campos cuyo clean_<campo> acepta la celda
+            tipada de un .xlsx además del texto.
+        chunk_size (int): Filas por bloque de validación.
+        max_workers (int): Procesos del pool de validación. 0 usa un proceso
+            por núcleo; 1 valida en serie, en el propio worker.
         errors (list[dict]): Errores acumulados, con la forma
             {"row", "message", "value"}. Los fallos globales usan row="--".
-        cleaned_data (list[dict]): Filas limpias, listas para Model(**fila).
         first_data_row (int): Número de la primera fila de datos en el
             archivo original (2 si traía encabezado, 1 si no).
         rows_ok (int): Filas que pasaron completas. Lo llena validate().
         rows_error (int): Filas DISTINTAS con al menos un error (una fila con
             varios errores cuenta una vez). Lo llena validate().
+        preloaded (dict): {nombre: dict | set} con lo precargado de cada
+            lookup. Lo llena validate() antes de la primera fila.
+        upsert (bool): True si la tarea pidió actualizar los registros
+            existentes; los clean_<campo> no deben rechazar una fila por
+            repetir la clave de un registro que ya existe.
+        task (TareaEnProceso | None): Tarea que se valida; a través de ella
+            se consulta la cancelación.
+        skip_rows (int): Filas de datos del principio que se saltean.
+        max_errors (int): Presupuesto de errores de la última validate(); 0
+            es sin límite.
+        aborted (bool): True si la última validate() cortó por agotar
+            max_errors.
+        rows_read (int): Filas de datos leídas del archivo, validadas o no.
     """
 
     fields: dict = {}
+    lookups: dict = {}
+    typed_fields: set = set()
+    chunk_size: int = settings.IMPORT_VALIDATION_CHUNK_SIZE
+    max_workers: int = settings.IMPORT_VALIDATION_WORKERS
 
-    def __init__(self, task: TareaEnProceso):
+    def __init__(self, task: TareaEnProceso | None = None, skip_rows: int = 0):
         """Prepara el validator a partir de la tarea.
 
         No valida todavía: la extracción del contenido queda guardada como
         Result y es validate() quien decide.
 
         Args:
-            task (TareaEnProceso): Tarea con el contenido en datos_entrada.
+            task (TareaEnProceso | None): Tarea con la referencia al archivo
+                en datos_entrada. Sin tarea el validator solo sirve para
+                validate_chunk(): así lo instancian los procesos del pool.
+            skip_rows (int): Filas de datos ya importadas que no se vuelven
+                a validar.
 
         Raises:
             NotImplementedError: Si la subclase no define 'fields' o no
@@ -48,15 +145,23 @@ class BaseAsyncImportValidator:
                 "(mapa {campo_modelo: 'Encabezado'})."
             )
         self.errors: list = []
-        self.cleaned_data: list = []
         self.first_data_row: int = 1
         self.rows_ok: int = 0
         self.rows_error: int = 0
+        self.preloaded: dict = {}
+        self.task: TareaEnProceso | None = task
+        self.upsert: bool = bool(task and task.datos_entrada.get("actualizar"))
+        self.skip_rows: int = skip_rows
+        self.max_errors: int = 0
+        self.aborted: bool = False
+        self.rows_read: int = 0
 
         self.headers: list = self.get_headers()
         self.expected_columns: int = len(self.headers)
         self.input_data: Result = self.__get_input_data(task)
         self.cleaners: dict = self.__get_cleaners()
+        self.__spool = None
+        self.__has_rows: bool = False
 
     @classmethod
     def get_headers(cls) -> list:
@@ -70,55 +175,214 @@ class BaseAsyncImportValidator:
         """
         return list(cls.fields.values())
 
-    def validate(self) -> Result:
+    def validate(self, max_errors: int = 0, keep_rows: bool = True) -> Result:
         """Lee y valida el contenido completo, en una sola pasada.
 
-        Es todo-o-nada: si alguna fila falla, descarta las limpias y devuelve
-        solo los errores. Deja poblados rows_ok y rows_error como resumen.
+        Es todo-o-nada: si alguna fila falla, las limpias no se entregan y
+        solo se devuelven los errores. Deja poblados rows_ok y rows_error como
+        resumen.
+
+        Args:
+            max_errors (int): Deja de validar al juntar esta cantidad de
+                errores (aborted queda en True); el resto del archivo solo se
+                cuenta, para rows_read. 0 valida todo.
+            keep_rows (bool): False no guarda las filas limpias: sirve cuando
+                solo interesa el diagnóstico y no se va a importar.
 
         Returns:
-            Result: Ok(list[dict]) con todas las filas limpias si no hubo
-                ningún error, o Err(list[dict]) con la lista PLANA de errores
+            Result: Ok(int) con la cantidad de filas limpias (se leen con
+                iter_cleaned_data()) si no hubo ningún error, o
+                Err(list[dict]) con la lista PLANA de errores
                 {"row", "message", "value"} — una misma fila puede aparecer
                 varias veces.
+
+        Raises:
+            TareaCancelada: Si el usuario canceló la tarea mientras se
+                validaba.
         """
         if self.input_data.is_err():
-            self.errors.append(
-                {"row": "--", "message": self.input_data.value, "value": ""}
-            )
-            self.rows_error = 1
-            return Err(self.errors)
+            return self.__fail(self.input_data.value)
 
-        rows_result: Result = self.__get_rows()
-        if rows_result.is_err():
-            self.errors.append(
-                {"row": "--", "message": rows_result.value, "value": ""}
-            )
-            self.rows_error = 1
+        self.max_errors = max_errors
+        self.aborted = False
+        self.rows_read = 0
+        self.__spool = tempfile.TemporaryFile() if keep_rows else None
+        self.__has_rows = False
+        try:
+            self.preloaded = self.__preload()
+            chunks = self.__iter_chunks()
+            self.__validate_chunks(chunks)
+            if self.aborted:
+                del self.errors[max_errors:]
+                for _ in chunks:  # solo cuenta las filas restantes
+                    pass
+        except _SourceError as exc:
+            return self.__fail(str(exc))
+
+        if not self.__has_rows:
+            return self.__fail("El archivo no tiene filas con datos.")
+
+        self.rows_error = len({error["row"] for error in self.errors})
+
+        if self.errors:
             return Err(self.errors)
+        return Ok(self.rows_ok)
+
+    def validate_chunk(self, chunk: list) -> tuple:
+        """Valida un bloque de filas ya leídas. No toca la tarea ni el archivo.
 
-        for row_number, row in enumerate(rows_result.value, start=self.first_data_row):
+        Args:
+            chunk (list[tuple[int, list[str]]]): Pares (número de fila,
+                columnas), tal como los entrega la lectura del CSV.
+
+        Returns:
+            tuple[list[dict], list[dict]]: (filas limpias, errores
+                {"row", "message", "value"}), ambos en el orden del bloque.
+        """
+        cleaned: list = []
+        errors: list = []
+        for row_number, row in chunk:
             result: Result = self.__validate_row(row)
             if result.is_err():
-                for error in result.value:
-                    self.errors.append({"row": row_number, **error})
-                continue
-            self.cleaned_data.append(result.value)
+                errors.extend({"row": row_number, **error} for error in result.value)
+                if self.max_errors and len(errors) >= self.max_errors:
+                    break
+            else:
+                cleaned.append(result.value)
+        return cleaned, errors
 
-        self.rows_ok = len(self.cleaned_data)
-        self.rows_error = len({error["row"] for error in self.errors})
+    def iter_cleaned_data(self):
+        """Filas limpias de la última validate() exitosa, de a una.
 
-        if self.errors:
-            return Err(self.errors)
-        return Ok(self.cleaned_data)
+        Yields:
+            dict: Fila lista para Model(**fila), en el orden del archivo.
+        """
+        self.__spool.seek(0)
+        while True:
+            try:
+                yield pickle.load(self.__spool)
+            except EOFError:
+                return
+
+    def close(self):
+        """Libera el archivo temporal de filas limpias."""
+        if self.__spool is not None:
+            self.__spool.close()
+            self.__spool = None
+
+    def __fail(self, message: str) -> Result:
+        self.errors.append({"row": "--", "message": message, "value": ""})
+        self.rows_error = 1
+        return Err(self.errors)
+
+    def __validate_chunks(self, chunks):
+        """Valida los bloques, en paralelo si hay más de uno.
+
+        Como mucho hay 2 bloques en vuelo por proceso, así que la memoria no
+        crece con el tamaño del archivo.
+        """
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return
+        second_chunk = next(chunks, None)
+        if second_chunk is None:
+            self.__merge_chunk(self.validate_chunk(first_chunk))
+            return
+
+        chunks = chain((first_chunk, second_chunk), chunks)
+        workers: int = self.max_workers or os.cpu_count() or 1
+        # Un proceso daemon (los hijos del pool prefork de Celery) no puede
+        # tener hijos: ProcessPoolExecutor fallaría al arrancar.
+        if workers <= 1 or multiprocessing.current_process().daemon:
+            for chunk in chunks:
+                self.__merge_chunk(self.validate_chunk(chunk))
+                if self.__must_stop():
+                    return
+            return
+
+        state: bytes = pickle.dumps(
+            (type(self), self.preloaded, self.upsert, self.max_errors)
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pool.init_worker,
+            initargs=(state,),
+        ) as executor:
+            pending: deque = deque()
+            try:
+                for chunk in chunks:
+                    pending.append(executor.submit(pool.validate_chunk, chunk))
+                    if len(pending) >= workers * 2:
+                        self.__merge_chunk(pending.popleft().result())
+                        if self.__must_stop():
+                            return
+                while pending:
+                    self.__merge_chunk(pending.popleft().result())
+                    if self.__must_stop():
+                        return
+            finally:
+                # Si se cortó antes (errores de sobra o cancelación), los
+                # bloques en vuelo no se esperan.
+                executor.shutdown(cancel_futures=True)
+
+    def __must_stop(self) -> bool:
+        """True si ya se juntaron max_errors errores.
 
-    def __get_input_data(self, task: TareaEnProceso) -> Result:
-        input_data: str = task.datos_entrada.get("contenido", "")
-        if not input_data.strip():
+        Raises:
+            TareaCancelada: Si el usuario canceló la tarea.
+        """
+        if self.task is not None:
+            self.task.comprobar_cancelacion()
+        return self.aborted
+
+    def __merge_chunk(self, chunk_result: tuple):
+        cleaned, errors = chunk_result
+        self.errors.extend(errors)
+        if self.max_errors and len(self.errors) >= self.max_errors:
+            self.aborted = True
+        if not self.errors and self.__spool is not None:
+            # Con un error ya no se importa nada: no vale la pena seguir
+            # guardando filas limpias.
+            for data in cleaned:
+                pickle.dump(data, self.__spool)
+        self.rows_ok += len(cleaned)
+
+    def __preload(self) -> dict:
+        """Junta los valores distintos de cada lookup y los trae en bloque.
+
+        Es una pasada extra, en streaming, sobre el archivo; solo ocurre si
+        el validator declara 'lookups'.
+        """
+        if not self.lookups:
+            return {}
+        keys: dict = {name: set() for name in self.lookups}
+        for _, row in self.__iter_rows():
+            if len(row) != self.expected_columns:
+                continue
+            result: Result = self.__map_row(row)
+            if result.is_err():
+                continue
+            for name, lookup in self.lookups.items():
+                key = lookup.get_key(result.value[lookup.column])
+                if key is not None:
+                    keys[name].add(key)
+        return {name: lookup.fetch(keys[name]) for name, lookup in self.lookups.items()}
+
+    def __iter_chunks(self):
+        rows = self.__iter_rows()
+        while chunk := list(islice(rows, self.chunk_size)):
+            self.rows_read += len(chunk)
+            yield chunk
+
+    def __get_input_data(self, task: TareaEnProceso | None) -> Result:
+        if task is None:
+            return Err("El validator no tiene una tarea asociada.")
+        if not has_source(task.datos_entrada):
             return Err(
                 "La tarea no tiene datos de entrada: no hay contenido que procesar."
             )
-        return Ok(input_data)
+        return Ok(task.datos_entrada)
 
     def __get_cleaners(self) -> dict:
         cleaners: dict = {}
@@ -133,25 +397,68 @@ class BaseAsyncImportValidator:
             )
         return cleaners
 
-    def __get_rows(self) -> Result:
+    def __iter_rows(self):
+        """Filas no vacías del archivo, numeradas, leídas en streaming.
+
+        Solo los fallos de LECTURA se traducen a _SourceError; una excepción
+        en quien consume las filas (un clean_<campo>) no pasa por aquí.
+
+        Yields:
+            tuple[int, list]: (número de fila, columnas).
+
+        Raises:
+            _SourceError: Si el archivo no se puede abrir o leer.
+        """
         try:
-            stream = io.StringIO(self.input_data.value)
-            delimiter: str = self.__detect_delimiter(stream)
-            rows: list = [
+            rows = (
                 row
-                for row in csv.reader(stream, delimiter=delimiter)
-                if any(column.strip() for column in row)
-            ]
+                for row in self.__read_source()
+                if any(_cell_text(column) for column in row)
+            )
+            first_row = next(rows, None)
+            if first_row is None:
+                return
+            self.__has_rows = True
+            if self.__is_header_row(first_row):
+                self.first_data_row = 2
+            else:
+                rows = self.__prepend(first_row, rows)
+            numbered = enumerate(rows, start=self.first_data_row)
+            yield from islice(numbered, self.skip_rows, None)
         except csv.Error as exc:
-            return Err(f"El CSV está mal formado: {exc}")
+            raise _SourceError(f"El CSV está mal formado: {exc}") from exc
         except Exception as exc:  # noqa: BLE001
-            return Err(f"No se pudo leer el contenido: {exc}")
-        if not rows:
-            return Err("El archivo no tiene filas con datos.")
-        return Ok(self.__skip_header_row(rows))
+            raise _SourceError(f"No se pudo leer el contenido: {exc}") from exc
+
+    def __read_source(self):
+        """Filas crudas del archivo: listas de str (CSV) o de celdas (.xlsx)."""
+        input_data: dict = self.input_data.value
+        if is_xlsx(input_data):
+            for row in iter_xlsx_rows(input_data):
+                yield self.__fit_xlsx_row(row)
+            return
+        with open_source(input_data) as stream:
+            delimiter: str = self.__detect_delimiter(stream)
+            yield from csv.reader(stream, delimiter=delimiter)
+
+    def __fit_xlsx_row(self, row: list) -> list:
+        """Ajusta una fila de Excel al ancho esperado.
+
+        En una hoja las celdas vacías al final no se ven: se descartan las
+        sobrantes y se completan las faltantes, en lugar de reportar un
+        número de columnas que el usuario no puede notar.
+        """
+        while len(row) > self.expected_columns and not _cell_text(row[-1]):
+            row.pop()
+        return row + [None] * (self.expected_columns - len(row))
 
     @staticmethod
-    def __detect_delimiter(stream: io.StringIO) -> str:
+    def __prepend(first_row: list, rows):
+        yield first_row
+        yield from rows
+
+    @staticmethod
+    def __detect_delimiter(stream: io.TextIOBase) -> str:
         sample: str = stream.readline()
         stream.seek(0)
         try:
@@ -159,15 +466,10 @@ class BaseAsyncImportValidator:
         except csv.Error:
             return ";" if sample.count(";") > sample.count(",") else ","
 
-    def __skip_header_row(self, rows: list) -> list:
-        if not rows:
-            return rows
-        first_row: list = [column.strip().casefold() for column in rows[0]]
+    def __is_header_row(self, row: list) -> bool:
+        first_row: list = [_cell_text(column).casefold() for column in row]
         headers: list = [header.strip().casefold() for header in self.headers]
-        if first_row == headers:
-            self.first_data_row = 2
-            return rows[1:]
-        return rows
+        return first_row == headers
 
     def __validate_row(self, row: list) -> Result:
         row_length: int = len(row)
@@ -180,7 +482,7 @@ class BaseAsyncImportValidator:
                             f"se esperaban {self.expected_columns}."
                         ),
                         "value": truncate_text(
-                            ", ".join(str(column) for column in row)
+                            ", ".join(_cell_text(column) for column in row)
                         ),
                     }
                 ]
@@ -193,7 +495,7 @@ class BaseAsyncImportValidator:
                     {
                         "message": result.value,
                         "value": truncate_text(
-                            ", ".join(str(column) for column in row)
+                            ", ".join(_cell_text(column) for column in row)
                         ),
                     }
                 ]
@@ -202,11 +504,19 @@ class BaseAsyncImportValidator:
 
     def __map_row(self, row: list) -> Result:
         try:
-            data: dict = dict(zip(self.fields, (column.strip() for column in row)))
+            data: dict = {
+                field: self.__cell_value(field, column)
+                for field, column in zip(self.fields, row)
+            }
             return Ok(data)
         except Exception as exc:  # noqa: BLE001
             return Err(f"No se pudo procesar la fila: {exc}")
 
+    def __cell_value(self, field: str, value):
+        if field in self.typed_fields and value is not None:
+            return value.strip() if isinstance(value, str) else value
+        return _cell_text(value)
+
     def __clean_row(self, data: dict) -> Result:
         cleaned_data: dict = dict(data)
         errors: list = []
@@ -216,7 +526,7 @@ class BaseAsyncImportValidator:
                 errors.append(
                     {
                         "message": result.value,
-                        "value": truncate_text(data.get(field, "")),
+                        "value": truncate_text(_cell_text(data.get(field))),
                     }
                 )
             else:
@@ -0,0 +1,82 @@
+"""
+Comando para medir el costo de armar y serializar las URLs por fila de las
+listas DataTables: reverse_lazy por fila (como antes) contra las plantillas
+de apps.common.utils.urls. No toca la base de datos.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+from django.urls import reverse_lazy
+
+from apps.common.utils.urls import row_url
+
+# Rutas de las columnas de acciones, con la forma de sus filas.
+ROUTES = {
+    "clientes": ["client_detail_modal", "client_delete_modal"],
+    "deudores": ["debt_detail_modal", "add_payment_modal"],
+    "agenda": [
+        "agenda_see_modal",
+        "agenda_update_modal",
+        "agenda_cancel_modal",
+        "agenda_delete_modal",
+        "agenda_confirmation_modal",
+    ],
+}
+
+
+def _page_reverse_lazy(names, rows):
+    data = [
+        {"pk": pk, **{name: reverse_lazy(name, kwargs={"pk": pk}) for name in names}}
+        for pk in range(1, rows + 1)
+    ]
+    return JsonResponse({"data": data}).content
+
+
+def _page_row_url(names, rows):
+    data = [
+        {"pk": pk, **{name: row_url(name, pk) for name in names}}
+        for pk in range(1, rows + 1)
+    ]
+    return JsonResponse({"data": data}).content
+
+
+class Command(BaseCommand):
+    help = "Compara reverse_lazy por fila contra plantillas de URL en páginas de lista"
+
+    def add_arguments(self, parser):
+        """Agregar argumentos del comando."""
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100,
+            help="Filas por página (por defecto 100).",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=200,
+            help="Páginas a serializar por medición (por defecto 200).",
+        )
+
+    def _ms_per_page(self, build, names, rows, pages):
+        build(names, rows)  # calentar (plantillas, resolver de URLs)
+        start = time.perf_counter()
+        for _ in range(pages):
+            build(names, rows)
+        return (time.perf_counter() - start) * 1000 / pages
+
+    def handle(self, *args, **options):
+        """Ejecutar la comparación."""
+        rows, pages = options["rows"], options["pages"]
+        self.stdout.write(f"Páginas de {rows} filas, promedio de {pages} páginas:\n")
+        for label, names in ROUTES.items():
+            before = self._ms_per_page(_page_reverse_lazy, names, rows, pages)
+            after = self._ms_per_page(_page_row_url, names, rows, pages)
+            self.stdout.write(
+                f"  {label:<10} ({len(names)} URL/fila)  "
+                f"reverse_lazy: {before:7.2f} ms  plantilla: {after:7.2f} ms  "
+                f"(x{before / after:.1f})"
+            )
+        self.stdout.write(self.style.SUCCESS("✓ Benchmark terminado"))
@@ -0,0 +1,156 @@
+"""Backends de búsqueda para las listas DataTables (BaseListViewAjax).
+
+Cada vista declara sus `search_fields` (solo columnas de texto) y un
+`search_backend` que traduce el valor del buscador a un Q sobre ellos. Las
+columnas que no son texto (choices, fechas, montos) se declaran aparte, en
+`search_exact_fields`, con un SearchTerm que reconoce la palabra y la compara
+por igualdad: "efectivo", "16/10/2026" o "25,000" siguen encontrando sus
+filas sin castear la columna a texto.
+
+En PostgreSQL las columnas de texto buscables tienen índices GIN de trigramas
+(pg_trgm) sobre UPPER(columna), que es exactamente la expresión que Django
+genera para `__icontains`: el planner los usa sin cambiar la consulta.
+"""
+
+import datetime
+import operator
+from decimal import Decimal, InvalidOperation
+from functools import reduce
+
+from django.db.models import Q
+from django.utils import timezone
+
+# Tope de palabras por búsqueda: cada una suma un grupo de condiciones. Las
+# que sobran se buscan juntas, como frase, en la última.
+MAX_TERMS = 5
+
+# Condición que no encuentra nada: una palabra sin columna donde buscarla.
+NOTHING = Q(pk__in=[])
+
+
+def split_terms(search_value: str) -> list:
+    """Palabras de la búsqueda, como mucho MAX_TERMS."""
+    terms = search_value.split()
+    if len(terms) > MAX_TERMS:
+        terms[MAX_TERMS - 1 :] = [" ".join(terms[MAX_TERMS - 1 :])]
+    return terms
+
+
+class SearchTerm:
+    """Interpreta una palabra del buscador como valor de una columna no textual.
+
+    parse() devuelve None si la palabra no aplica a la columna (una fecha mal
+    escrita, un texto en una columna de montos); q() arma la condición.
+    """
+
+    def parse(self, term: str):
+        raise NotImplementedError
+
+    def q(self, field: str, value) -> Q:
+        return Q(**{field: value})
+
+
+class ChoiceTerm(SearchTerm):
+    """Choices cuyo valor o etiqueta contienen la palabra ("efec" → EFECTIVO)."""
+
+    def __init__(self, choices):
+        self.choices = choices
+
+    def parse(self, term: str):
+        term = term.casefold()
+        values = [
+            value
+            for value, label in self.choices
+            if term in str(value).casefold() or term in str(label).casefold()
+        ]
+        return values or None
+
+    def q(self, field: str, value) -> Q:
+        return Q(**{f"{field}__in": value})
+
+
+class DateTerm(SearchTerm):
+    """Un día (16/10/2026 o 2026-10-16) en una columna DateTimeField.
+
+    Busca por rango sobre el día local, no con __date, para que la columna
+    pueda usar su índice.
+    """
+
+    FORMATS = ("%d/%m/%Y", "%Y-%m-%d")
+
+    def parse(self, term: str):
+        for date_format in self.FORMATS:
+            try:
+                return datetime.datetime.strptime(term, date_format).date()
+            except ValueError:
+                continue
+        return None
+
+    def q(self, field: str, value) -> Q:
+        start = timezone.make_aware(datetime.datetime.combine(value, datetime.time()))
+        end = timezone.make_aware(
+            datetime.datetime.combine(
+                value + datetime.timedelta(days=1), datetime.time()
+            )
+        )
+        return Q(**{f"{field}__gte": start, f"{field}__lt": end})
+
+
+class AmountTerm(SearchTerm):
+    """Un monto exacto, escrito como lo muestra format_currency ("$25,000")."""
+
+    def parse(self, term: str):
+        try:
+            value = Decimal(term.replace("$", "").replace(",", ""))
+        except InvalidOperation:
+            return None
+        return value if value.is_finite() else None
+
+
+def _term_q(term: str, fields, exact_fields: dict) -> Q:
+    """Q de las filas donde `term` aparece en algún campo de texto o coincide
+    con alguna columna de `exact_fields`."""
+    conditions = [Q(**{f"{field}__icontains": term}) for field in fields]
+    for field, search_term in exact_fields.items():
+        value = search_term.parse(term)
+        if value is not None:
+            conditions.append(search_term.q(field, value))
+    if not conditions:
+        return NOTHING
+    return reduce(operator.or_, conditions)
+
+
+class SearchBackend:
+    """Interfaz: devuelve el Q para `search_value` sobre `fields` (texto) y
+    `exact_fields` ({campo: SearchTerm})."""
+
+    def filter(self, search_value: str, fields, exact_fields=None) -> Q:
+        raise NotImplementedError
+
+
+class ContainsSearch(SearchBackend):
+    """Cada palabra debe aparecer en ALGUNO de los campos.
+
+    "ana pérez" encuentra a la clienta con nombre "Ana" y apellido "Pérez" sin
+    buscar sobre un Concat (que no se puede indexar).
+    """
+
+    def filter(self, search_value: str, fields, exact_fields=None) -> Q:
+        exact_fields = exact_fields or {}
+        terms = split_terms(search_value)
+        if not terms or not (fields or exact_fields):
+            return Q()
+        return reduce(
+            operator.and_, (_term_q(term, fields, exact_fields) for term in terms)
+        )
+
+
+class PhraseContainsSearch(SearchBackend):
+    """El valor completo, tal cual, debe aparecer en alguno de los campos."""
+
+    def filter(self, search_value: str, fields, exact_fields=None) -> Q:
+        exact_fields = exact_fields or {}
+        search_value = search_value.strip()
+        if not search_value or not (fields or exact_fields):
+            return Q()
+        return _term_q(search_value, fields, exact_fields)
@@ -0,0 +1,231 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.common.imports import copy_loader
+from apps.common.imports.batching import MAX_STEP, AdaptiveBatchSize
+from apps.common.imports.sources import content_hash
+from apps.services.imports.importers import CategoryAsyncImporter
+from apps.services.models.categoria import Categoria
+from apps.tareas.models import TareaEnProceso
+
+HEADER = "Nombre;Descripción;Estado"
+NAMES = ["Manos", "Pies", "Cejas", "Pestanas", "Maquillaje", "Depilacion"]
+
+
+def _content(names=NAMES, header=True, estado="activo") -> str:
+    rows = [f"{name};Categoria {name};{estado}" for name in names]
+    return "\n".join([HEADER, *rows] if header else rows)
+
+
+class SmallBatchImporter(CategoryAsyncImporter):
+    """Lotes de 2 filas, para que la importación tenga varios lotes."""
+
+    batch_size = min_batch_size = max_batch_size = 2
+    copy_threshold = 0
+
+
+class CancelAfterFirstBatchImporter(SmallBatchImporter):
+    """Pide la cancelación apenas confirma el primer lote."""
+
+    def _invalidate(self):
+        super()._invalidate()
+        TareaEnProceso.objects.filter(pk=self.task.pk).update(
+            cancelacion_solicitada_en=timezone.now()
+        )
+
+
+class ImporterTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer")
+
+    def _task(self, contenido: str, **datos) -> TareaEnProceso:
+        return TareaEnProceso.objects.create(
+            nombre_proceso="Importación de categorías",
+            origen="importacion_categorias",
+            user_id=self.user.pk,
+            datos_entrada={"contenido": contenido, **datos},
+        )
+
+    def _interrupted_task(self, contenido: str, imported: int, **datos):
+        """Tarea cuya entrega anterior confirmó las primeras `imported` filas."""
+        task = self._task(contenido, **datos)
+        for name in NAMES[:imported]:
+            Categoria.objects.create(nombre=name, descripcion=f"Categoria {name}")
+        task.checkpoint_filas = imported
+        task.checkpoint_hash = content_hash(task.datos_entrada)
+        task.save()
+        return task
+
+    def _run(self, task, importer_class=SmallBatchImporter):
+        importer_class(self.user, task).run()
+        task.refresh_from_db()
+        return task
+
+    def _names(self) -> list:
+        return list(Categoria.objects.order_by("pk").values_list("nombre", flat=True))
+
+
+class CheckpointResumeTests(ImporterTestCase):
+    def test_resume_skips_confirmed_rows_with_header(self):
+        task = self._run(self._interrupted_task(_content(), imported=2))
+
+        self.assertEqual(task.estado, TareaEnProceso.Estado.COMPLETADO)
+        self.assertEqual(self._names(), NAMES)
+        self.assertEqual(task.resultado_metadata["created"], len(NAMES))
+        self.assertEqual(task.checkpoint_filas, len(NAMES))
+
+    def test_resume_skips_confirmed_rows_without_header(self):
+        task = self._run(self._interrupted_task(_content(header=False), imported=3))
+
+        self.assertEqual(task.estado, TareaEnProceso.Estado.COMPLETADO)
+        self.assertEqual(self._names(), NAMES)
+        self.assertEqual(task.checkpoint_filas, len(NAMES))
+
+    def test_changed_content_fails_without_importing(self):
+        task = self._interrupted_task(_content(), imported=2)
+        task.datos_entrada = {"contenido": _content(names=NAMES[::-1])}
+        task.save()
+
+        task = self._run(task)
+
+        self.assertEqual(task.estado, TareaEnProceso.Estado.FALLIDO)
+        self.assertIn("el archivo cambió", task.resultado_metadata["error_detalle"])
+        self.assertEqual(self._names(), NAMES[:2])
+
+    def test_resumed_upsert_keeps_the_partial_summary(self):
+        Categoria.objects.create(nombre="Cejas", descripcion="Vieja")
+        task = self._interrupted_task(_content(), imported=2, actualizar=True)
+        task.resultado_metadata = {"created": 1, "updated": 0, "unchanged": 1}
+        task.save()
+
+        task = self._run(task)
+
+        self.assertEqual(task.estado, TareaEnProceso.Estado.COMPLETADO)
+        summary = {
+            key: task.resultado_metadata[key]
+            for key in ("created", "updated", "unchanged")
+        }
+        # Cejas se actualiza; Pestanas, Maquillaje y Depilacion son nuevas.
+        self.assertEqual(summary, {"created": 4, "updated": 1, "unchanged": 1})
+        self.assertEqual(Categoria.objects.count(), len(NAMES))
+        self.assertEqual(
+            Categoria.objects.get(nombre="Cejas").descripcion, "Categoria Cejas"
+        )
+
+
+class CancellationTests(ImporterTestCase):
+    @mock.patch("apps.tareas.cancellation.is_requested", return_value=None)
+    def test_cancel_after_a_batch_keeps_the_confirmed_rows(self, is_requested):
+        task = self._run(self._task(_content()), CancelAfterFirstBatchImporter)
+
+        self.assertEqual(task.estado, TareaEnProceso.Estado.CANCELADO)
+        self.assertEqual(self._names(), NAMES[:2])
+        self.assertEqual(task.checkpoint_filas, 2)
+        self.assertEqual(task.resultado_metadata["created"], 2)
+        self.assertIn("las primeras 2 filas", task.resultado_metadata["mensaje"])
+
+
+class CopyLoaderTests(ImporterTestCase):
+    def test_copy_import_writes_rows_and_history(self):
+        task = self._task(_content())
+
+        class CopyImporter(CategoryAsyncImporter):
+            copy_threshold = 1
+
+        with mock.patch.object(
+            CopyImporter, "save", side_effect=AssertionError("no usó COPY")
+        ):
+            task = self._run(task, CopyImporter)
+
+        self.assertEqual(task.estado, TareaEnProceso.Estado.COMPLETADO)
+        self.assertEqual(self._names(), NAMES)
+        self.assertEqual(task.checkpoint_filas, len(NAMES))
+        history = Categoria.history.filter(nombre__in=NAMES)
+        self.assertEqual(history.count(), len(NAMES))
+        self.assertEqual(set(history.values_list("history_type", flat=True)), {"+"})
+        self.assertEqual(
+            set(history.values_list("history_user_id", flat=True)), {self.user.pk}
+        )
+
+    def test_copy_escapes_special_characters(self):
+        description = "tab\there\nnueva línea \\ barra"
+        loaded = copy_loader.CopyLoader(Categoria, self.user).load(
+            [{"nombre": "Especial", "descripcion": description, "estado": "activo"}]
+        )
+
+        self.assertEqual(loaded, 1)
+        self.assertEqual(Categoria.objects.get().descripcion, description)
+
+
+class AdaptiveBatchSizeTests(SimpleTestCase):
+    def _sizer(self, **kwargs) -> AdaptiveBatchSize:
+        options = {
+            "initial": 100,
+            "minimum": 10,
+            "maximum": 1000,
+            "target_seconds": 1.0,
+            "max_batch_bytes": 10**9,
+            **kwargs,
+        }
+        return AdaptiveBatchSize(**options)
+
+    def test_initial_size_is_clamped(self):
+        self.assertEqual(self._sizer(initial=5).size, 10)
+        self.assertEqual(self._sizer(initial=5000).size, 1000)
+
+    def test_grows_at_most_max_step(self):
+        sizer = self._sizer()
+        sizer.observe(100, 0.01)
+        self.assertEqual(sizer.size, int(100 * MAX_STEP))
+
+    def test_shrinks_towards_the_target(self):
+        sizer = self._sizer()
+        sizer.observe(100, 1.25)
+        self.assertEqual(sizer.size, 80)
+
+    def test_ignores_empty_observations(self):
+        sizer = self._sizer()
+        sizer.observe(0, 1.0)
+        sizer.observe(100, 0)
+        self.assertEqual(sizer.size, 100)
+
+    def test_wide_rows_lower_the_maximum(self):
+        sizer = self._sizer(initial=1000, max_batch_bytes=100_000)
+        sizer.fit_row_width({"descripcion": "x" * 10_000})
+        self.assertLess(sizer.maximum, 1000)
+        self.assertEqual(sizer.size, sizer.maximum)
+
+    def test_maximum_never_goes_below_minimum(self):
+        sizer = self._sizer(max_batch_bytes=1)
+        sizer.fit_row_width({"nombre": "x"})
+        self.assertEqual(sizer.maximum, sizer.minimum)
+
+
+class CopyValueTests(SimpleTestCase):
+    def test_null_and_booleans(self):
+        self.assertEqual(copy_loader._copy_value(None), r"\N")
+        self.assertEqual(copy_loader._copy_value(True), "t")
+        self.assertEqual(copy_loader._copy_value(False), "f")
+
+    def test_dates_and_intervals(self):
+        moment = datetime.datetime(2026, 10, 16, 9, 30, tzinfo=datetime.timezone.utc)
+        self.assertEqual(copy_loader._copy_value(moment), moment.isoformat())
+        self.assertEqual(
+            copy_loader._copy_value(datetime.date(2026, 10, 16)), "2026-10-16"
+        )
+        self.assertEqual(
+            copy_loader._copy_value(datetime.timedelta(days=1, seconds=5)),
+            "1 days 5 seconds 0 microseconds",
+        )
+
+    def test_escapes_text_format_specials(self):
+        self.assertEqual(copy_loader._copy_value("a\\b\tc\nd\re"), "a\\\\b\\tc\\nd\\re")
+
+    def test_other_values_use_str(self):
+        self.assertEqual(copy_loader._copy_value(Decimal("10.50")), "10.50")
+        self.assertEqual(copy_loader._copy_value(7), "7")
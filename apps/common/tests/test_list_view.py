@@ -0,0 +1,113 @@
+import datetime
+
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from apps.common.base_list_view_ajax import BaseListViewAjax
+from apps.tareas.models import TareaEnProceso
+
+PAGE = 3
+
+
+class TaskKeysetView(BaseListViewAjax):
+    model = TareaEnProceso
+    keyset_pagination = True
+    field_list = ["pk"]
+    ordering_fields = {
+        "0": "finalizado_en",  # con NULL
+        "1": "progreso_actual",  # sin NULL, con repetidos
+    }
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        base = timezone.now() - datetime.timedelta(days=1)
+        # Repetidos en las dos columnas, para que desempate el pk.
+        finished = [None, 3, 1, None, 3, 2, None, 1, 5, 3]
+        progress = [4, 2, 2, 7, 1, 4, 2, 9, 1, 4]
+        for number, (hours, done) in enumerate(zip(finished, progress)):
+            task = TareaEnProceso.objects.create(
+                nombre_proceso=f"Tarea {number}",
+                origen="test",
+                progreso_actual=done,
+                finalizado_en=(
+                    None if hours is None else base + datetime.timedelta(hours=hours)
+                ),
+            )
+            # created distinto por tarea, para el orden por defecto.
+            TareaEnProceso.objects.filter(pk=task.pk).update(
+                created=base + datetime.timedelta(minutes=number % 4)
+            )
+
+    def _page(self, start: int, **params):
+        request = RequestFactory().get("/", {"start": start, "length": PAGE, **params})
+        view = TaskKeysetView()
+        view.setup(request)
+        page, next_cursor, prev_cursor = view.apply_keyset_pagination(
+            view.get_processed_queryset()
+        )
+        return [task.pk for task in page], next_cursor, prev_cursor
+
+    def _expected(self, *ordering) -> list:
+        # El orden de referencia lo da la propia BD (NULL al final en ASC y
+        # al principio en DESC, en PostgreSQL).
+        return list(
+            TareaEnProceso.objects.order_by(*ordering).values_list("pk", flat=True)
+        )
+
+    def _walk_forward(self, **params) -> tuple:
+        pages, start, cursor = [], 0, None
+        while True:
+            extra = {"cursor": cursor} if cursor else {}
+            pks, cursor, _ = self._page(start, **params, **extra)
+            pages.append(pks)
+            start += PAGE
+            if not cursor:
+                return pages, start - PAGE
+
+    def _walk_backward(self, last_start: int, **params) -> list:
+        pks, _, cursor = self._page(last_start, **params)
+        pages, start = [pks], last_start
+        while cursor:
+            start -= PAGE
+            pks, _, cursor = self._page(start, cursor=cursor, **params)
+            pages.insert(0, pks)
+        return pages
+
+    def _assert_walks(self, column: str, direction: str, field: str):
+        params = {"order[0][column]": column, "order[0][dir]": direction}
+        prefix = "-" if direction == "desc" else ""
+        expected = self._expected(f"{prefix}{field}", f"{prefix}pk")
+        chunks = [expected[i : i + PAGE] for i in range(0, len(expected), PAGE)]
+
+        forward, last_start = self._walk_forward(**params)
+        self.assertEqual(forward, chunks)
+        self.assertEqual(self._walk_backward(last_start, **params), chunks)
+
+    def test_ascending_with_nulls(self):
+        self._assert_walks("0", "asc", "finalizado_en")
+
+    def test_descending_with_nulls(self):
+        self._assert_walks("0", "desc", "finalizado_en")
+
+    def test_ascending_without_nulls(self):
+        self._assert_walks("1", "asc", "progreso_actual")
+
+    def test_descending_without_nulls(self):
+        self._assert_walks("1", "desc", "progreso_actual")
+
+    def test_without_order_column_uses_meta_ordering(self):
+        # Meta.ordering de TareaEnProceso: ["-created"].
+        expected = self._expected("-created", "-pk")
+        chunks = [expected[i : i + PAGE] for i in range(0, len(expected), PAGE)]
+
+        forward, last_start = self._walk_forward()
+        self.assertEqual(forward, chunks)
+        self.assertEqual(self._walk_backward(last_start), chunks)
+
+    def test_cursor_from_another_ordering_falls_back_to_offset(self):
+        _, cursor, _ = self._page(0, **{"order[0][column]": "0"})
+        pks, _, _ = self._page(PAGE, cursor=cursor, **{"order[0][column]": "1"})
+
+        self.assertEqual(pks, self._expected("progreso_actual", "pk")[PAGE : 2 * PAGE])
@@ -0,0 +1,90 @@
+import datetime
+from decimal import Decimal
+
+from django.db.models import Q
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from apps.common.search import (
+    MAX_TERMS,
+    NOTHING,
+    AmountTerm,
+    ChoiceTerm,
+    ContainsSearch,
+    DateTerm,
+    PhraseContainsSearch,
+    split_terms,
+)
+from apps.payments.choices import MetodoPago
+
+
+class SplitTermsTests(SimpleTestCase):
+    def test_keeps_up_to_max_terms(self):
+        words = [f"w{number}" for number in range(MAX_TERMS)]
+        self.assertEqual(split_terms(" ".join(words)), words)
+
+    def test_folds_extra_words_into_the_last_term(self):
+        words = [f"w{number}" for number in range(MAX_TERMS + 2)]
+        terms = split_terms(" ".join(words))
+        self.assertEqual(len(terms), MAX_TERMS)
+        self.assertEqual(terms[:-1], words[: MAX_TERMS - 1])
+        self.assertEqual(terms[-1], " ".join(words[MAX_TERMS - 1 :]))
+
+
+class SearchTermTests(SimpleTestCase):
+    def test_choice_matches_value_or_label(self):
+        term = ChoiceTerm(MetodoPago.CHOICES)
+        self.assertEqual(term.parse("efec"), [MetodoPago.EFECTIVO])
+        self.assertEqual(term.parse("TRANSFERENCIA"), [MetodoPago.TRANSFERENCIA])
+        self.assertIsNone(term.parse("bitcoin"))
+
+    def test_date_accepts_display_and_iso_formats(self):
+        day = datetime.date(2026, 10, 16)
+        self.assertEqual(DateTerm().parse("16/10/2026"), day)
+        self.assertEqual(DateTerm().parse("2026-10-16"), day)
+        self.assertIsNone(DateTerm().parse("16/10"))
+
+    def test_date_filters_the_whole_local_day(self):
+        start = timezone.make_aware(datetime.datetime(2026, 10, 16))
+        end = timezone.make_aware(datetime.datetime(2026, 10, 17))
+        self.assertEqual(
+            DateTerm().q("fecha_pago", datetime.date(2026, 10, 16)),
+            Q(fecha_pago__gte=start, fecha_pago__lt=end),
+        )
+
+    def test_amount_accepts_currency_format(self):
+        self.assertEqual(AmountTerm().parse("$25,000"), Decimal("25000"))
+        self.assertEqual(AmountTerm().parse("1500.50"), Decimal("1500.50"))
+        self.assertIsNone(AmountTerm().parse("ana"))
+        self.assertIsNone(AmountTerm().parse("NaN"))
+
+
+class BackendTests(SimpleTestCase):
+    exact_fields = {
+        "metodo_pago": ChoiceTerm(MetodoPago.CHOICES),
+        "monto_pago": AmountTerm(),
+    }
+
+    def test_each_word_matches_text_or_exact_fields(self):
+        q = ContainsSearch().filter("ana efectivo", ["nombre"], self.exact_fields)
+        self.assertEqual(
+            q,
+            (Q(nombre__icontains="ana"))
+            & (
+                Q(nombre__icontains="efectivo")
+                | Q(metodo_pago__in=[MetodoPago.EFECTIVO])
+            ),
+        )
+
+    def test_word_without_any_column_matches_nothing(self):
+        q = ContainsSearch().filter("ana", [], {"monto_pago": AmountTerm()})
+        self.assertEqual(q, NOTHING)
+
+    def test_phrase_uses_exact_fields(self):
+        q = PhraseContainsSearch().filter(" 25000 ", ["nombre"], self.exact_fields)
+        self.assertEqual(
+            q, Q(nombre__icontains="25000") | Q(monto_pago=Decimal("25000"))
+        )
+
+    def test_empty_search_filters_nothing(self):
+        self.assertEqual(ContainsSearch().filter("  ", ["nombre"]), Q())
@@ -0,0 +1,124 @@
+import os
+import time
+
+from django.test import TestCase
+from result import Err, Ok
+
+from apps.common.imports.validators import BaseAsyncImportValidator
+from apps.tareas.models import TareaEnProceso
+
+
+class PidValidator(BaseAsyncImportValidator):
+    """Anota en cada fila el proceso que la validó.
+
+    Vive a nivel de módulo para que los procesos del pool (spawn) puedan
+    importarla al deserializar su estado.
+    """
+
+    fields = {"nombre": "Nombre", "pid": "Pid"}
+    chunk_size = 2
+    max_workers = 2
+
+    def clean_nombre(self, nombre, **kwargs):
+        # Un bloque tarda lo suficiente como para que ningún proceso se
+        # lleve todos los bloques antes de que arranque el otro.
+        time.sleep(0.2)
+        return Ok(nombre)
+
+    def clean_pid(self, **kwargs):
+        return Ok(os.getpid())
+
+
+class NameValidator(BaseAsyncImportValidator):
+    """Rechaza los nombres que empiezan con "mal"."""
+
+    fields = {"nombre": "Nombre", "pid": "Pid"}
+    chunk_size = 2
+    max_workers = 1
+
+    def clean_nombre(self, nombre, **kwargs):
+        if nombre.startswith("mal"):
+            return Err(f"Nombre inválido: {nombre}")
+        return Ok(nombre)
+
+
+def _task(rows: list) -> TareaEnProceso:
+    contenido = "\n".join(["Nombre;Pid", *(f"{row};" for row in rows)])
+    return TareaEnProceso.objects.create(
+        nombre_proceso="Importación de prueba",
+        origen="test",
+        datos_entrada={"contenido": contenido},
+    )
+
+
+class ParallelValidationTests(TestCase):
+    def test_multi_chunk_file_uses_more_than_one_process(self):
+        rows = [f"fila {number}" for number in range(12)]
+        validator = PidValidator(_task(rows))
+        try:
+            result = validator.validate()
+            cleaned = list(validator.iter_cleaned_data())
+        finally:
+            validator.close()
+
+        self.assertEqual(result, Ok(12))
+        self.assertEqual([data["nombre"] for data in cleaned], rows)
+        pids = {data["pid"] for data in cleaned}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertGreater(len(pids), 1)
+
+    def test_single_process_validates_in_the_worker(self):
+        validator = PidValidator(_task(["a", "b", "c"]))
+        validator.max_workers = 1
+        try:
+            result = validator.validate()
+            cleaned = list(validator.iter_cleaned_data())
+        finally:
+            validator.close()
+
+        self.assertEqual(result, Ok(3))
+        self.assertEqual({data["pid"] for data in cleaned}, {os.getpid()})
+
+
+class ChunkMergeTests(TestCase):
+    def test_validate_chunk_keeps_chunk_order(self):
+        validator = NameValidator()
+        cleaned, errors = validator.validate_chunk(
+            [(2, ["a", ""]), (3, ["mal b", ""]), (4, ["c", ""]), (5, ["mal d", ""])]
+        )
+
+        self.assertEqual([data["nombre"] for data in cleaned], ["a", "c"])
+        self.assertEqual([error["row"] for error in errors], [3, 5])
+        self.assertEqual(errors[0]["message"], "Nombre inválido: mal b")
+
+    def _validate(self, rows: list, workers: int):
+        validator = NameValidator(_task(rows))
+        validator.max_workers = workers
+        try:
+            return validator, validator.validate()
+        finally:
+            validator.close()
+
+    def test_errors_keep_file_order_across_chunks(self):
+        rows = ["a", "mal b", "c", "d", "mal e", "f", "g", "mal h"]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                validator, result = self._validate(rows, workers)
+
+                self.assertTrue(result.is_err())
+                # Con encabezado, la primera fila de datos es la 2.
+                self.assertEqual([error["row"] for error in result.value], [3, 6, 9])
+                self.assertEqual(validator.rows_ok, 5)
+                self.assertEqual(validator.rows_error, 3)
+
+    def test_max_errors_stops_after_the_first_errors_in_file_order(self):
+        rows = ["mal a", "b", "mal c", "d", "mal e", "f", "mal g", "h"]
+        validator = NameValidator(_task(rows))
+        try:
+            result = validator.validate(max_errors=2)
+        finally:
+            validator.close()
+
+        self.assertTrue(validator.aborted)
+        self.assertEqual([error["row"] for error in result.value], [2, 4])
+        self.assertEqual(validator.rows_read, len(rows))
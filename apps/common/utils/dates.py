@@ -25,3 +25,18 @@ def format_full_date(date_obj) -> str:
     year = date_obj.year
 
     return f"{day_name} {day} de {month_name} del {year}"
+
+
+def format_duration(seconds) -> str:
+    """
+    Formatea una duración aproximada en español, ejemplo: 2 h 5 min
+    """
+    if seconds is None:
+        return ""
+    seconds = round(seconds)
+    if seconds < 60:
+        return "menos de un minuto"
+    hours, minutes = divmod(seconds // 60, 60)
+    if not hours:
+        return f"{minutes} min"
+    return f"{hours} h {minutes} min" if minutes else f"{hours} h"
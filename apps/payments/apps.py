@@ -6,3 +6,9 @@ class PaymentsConfig(AppConfig):
     name = "apps.payments"
     label = "payments"
     verbose_name = "Pagos"
+
+    def ready(self):
+        from apps.common import counts
+        from apps.payments.models import DetallePago, Pago
+
+        counts.track(DetallePago, Pago)
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.23 on 2026-10-16 10:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_trigram_search_indexes'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pago',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('cliente_nombre'), name='gin_trgm_ops'), name='pagos_cliente_nombre_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='detallepago',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('referencia_pago'), name='gin_trgm_ops'), name='detalle_pago_referencia_trgm'),
+        ),
+    ]
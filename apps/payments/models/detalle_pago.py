@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from model_utils.models import TimeStampedModel
@@ -48,6 +50,14 @@ class DetallePago(TimeStampedModel):
         verbose_name = "Detalle de Pago"
         verbose_name_plural = "Detalles de Pago"
         ordering = ["-fecha_pago"]
+        # Trigramas sobre UPPER(col): sirven a los __icontains del buscador
+        # de las listas (ver apps.common.search).
+        indexes = [
+            GinIndex(
+                OpClass(Upper("referencia_pago"), name="gin_trgm_ops"),
+                name="detalle_pago_referencia_trgm",
+            ),
+        ]
 
     def __str__(self):
         return f"DetallePago {self.pk} - Pago {self.pago.pk} - ${self.monto_pago}"
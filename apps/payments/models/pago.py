@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from model_utils.models import TimeStampedModel, SoftDeletableModel
@@ -71,6 +73,14 @@ class Pago(TimeStampedModel, SoftDeletableModel):
         verbose_name = "Pago"
         verbose_name_plural = "Pagos"
         ordering = ["-created"]
+        # Trigramas sobre UPPER(col): sirven a los __icontains del buscador
+        # de las listas (ver apps.common.search).
+        indexes = [
+            GinIndex(
+                OpClass(Upper("cliente_nombre"), name="gin_trgm_ops"),
+                name="pagos_cliente_nombre_trgm",
+            ),
+        ]
 
     def __str__(self):
         return f"Pago {self.pk} - Cita {self.cita.pk} - ${self.monto_total_cita}"
@@ -232,6 +232,8 @@ class AddPaymentModalView(ProtectedView, BSModalUpdateView):
         )
         if payment_method != MetodoPago.EFECTIVO:
             payment_detail.referencia_pago = cleaned_data.get("payment_reference", "")
+        # Con una fecha retroactiva el abono cae en un mes ya cerrado:
+        # dashboard.signals recalcula e invalida ese mes, no el actual.
         payment_detail.save()
 
     def __update_payment_status(self) -> bool:
@@ -70,6 +70,11 @@ class ServicesDetailListView(BaseListViewAjax):
         "servicio__categoria__nombre",
     ]
 
+    search_fields = [
+        "nombre_servicio",
+        "servicio__categoria__nombre",
+    ]
+
     ordering_fields = {
         "0": "nombre_servicio",
         "1": "servicio__categoria__nombre",
@@ -136,6 +141,11 @@ class PaymentDetailListView(BaseListViewAjax):
         "monto_pago",
     ]
 
+    search_fields = [
+        "metodo_pago",
+        "referencia_pago",
+    ]
+
     ordering_fields = {
         "0": "fecha_pago",
         "1": "metodo_pago",
@@ -9,6 +9,7 @@ from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.excel_export_mixin import ExcelExportMixin
 from apps.common.utils.currency import format_currency
+from apps.common.utils.urls import row_url
 from apps.common.views.base_views import ProtectedView
 from apps.payments.models import Pago
 from ...choices import EstadoPago
@@ -46,6 +47,10 @@ class DebtorsListView(BaseListViewAjax):
         "saldo_pendiente",
     ]
 
+    search_fields = [
+        "cliente_nombre",
+    ]
+
     ordering_fields = {
         "0": "fecha_cita",
         "1": "cliente_nombre",
@@ -92,12 +97,8 @@ class DebtorsListView(BaseListViewAjax):
                     "saldo_pendiente_formatted": format_currency(
                         item.get("saldo_pendiente")
                     ),
-                    "debt_detail_url": reverse_lazy(
-                        "debt_detail_modal", kwargs={"pk": payment_id}
-                    ),
-                    "add_payment_url": reverse_lazy(
-                        "add_payment_modal", kwargs={"pk": payment_id}
-                    ),
+                    "debt_detail_url": row_url("debt_detail_modal", payment_id),
+                    "add_payment_url": row_url("add_payment_modal", payment_id),
                 }
             )
         return values
@@ -119,6 +120,8 @@ class DebtorsExportView(ExcelExportMixin, DebtorsListView):
     force_export = True
     excel_filename = "deudores"
     excel_sheet_title = "Deudores"
+    export_origin = "deudores"
+    export_process_name = "Exportación de deudores"
 
     excel_columns = [
         ExcelColumn("Fecha cita", "fecha_cita_display", width=20, align="center"),
@@ -11,9 +11,10 @@ from apps.common.custom_time_fields import CustomDateField
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.excel_export_mixin import ExcelExportMixin
 from apps.common.form_classes import FORM_SELECT_CLASS
+from apps.common.search import AmountTerm, ChoiceTerm, DateTerm
 from apps.common.utils.currency import format_currency
 from apps.common.views.base_views import ProtectedView
-from apps.payments.models import DetallePago
+from apps.payments.models import DetallePago, Pago
 
 from ...choices import MetodoPago
 
@@ -109,6 +110,9 @@ class IncomesListView(BaseListViewAjax):
     include_options_column = False
     filter_form_class = IncomesFilterForm
     _filters = {"pago__is_removed": False}
+    keyset_pagination = True
+    # El soft delete de un Pago también cambia el total (filtro pago__is_removed).
+    count_models = (DetallePago, Pago)
 
     field_list = [
         "fecha_pago",
@@ -119,6 +123,18 @@ class IncomesListView(BaseListViewAjax):
         "monto_pago",
     ]
 
+    search_fields = [
+        "pago__cliente_nombre",
+        "referencia_pago",
+    ]
+
+    search_exact_fields = {
+        "fecha_pago": DateTerm(),
+        "pago__fecha_cita": DateTerm(),
+        "metodo_pago": ChoiceTerm(MetodoPago.CHOICES),
+        "monto_pago": AmountTerm(),
+    }
+
     ordering_fields = {
         "0": "fecha_pago",
         "1": "pago__cliente_nombre",
@@ -173,6 +189,8 @@ class IncomesExportView(ExcelExportMixin, IncomesListView):
     force_export = True
     excel_filename = "ingresos"
     excel_sheet_title = "Ingresos"
+    export_origin = "ingresos"
+    export_process_name = "Exportación de ingresos"
 
     excel_columns = [
         ExcelColumn("Fecha pago", "fecha_pago_display", width=20, align="center"),
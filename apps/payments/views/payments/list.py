@@ -9,6 +9,7 @@ from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.excel_export_mixin import ExcelExportMixin
 from apps.common.custom_time_fields import CustomMonthField, MONTH_NUMBER_TO_NAME
+from apps.common.search import AmountTerm, DateTerm
 from apps.common.utils.currency import format_currency
 from apps.common.views.base_views import ProtectedView
 from apps.payments.models import Pago
@@ -76,6 +77,17 @@ class PaymentsListView(BaseListViewAjax):
         "fecha_pago_completado",
     ]
 
+    search_fields = [
+        "cliente_nombre",
+    ]
+
+    search_exact_fields = {
+        "fecha_cita": DateTerm(),
+        "fecha_pago_completado": DateTerm(),
+        "descuento_total": AmountTerm(),
+        "monto_total_cita": AmountTerm(),
+    }
+
     ordering_fields = {
         "0": "fecha_cita",
         "1": "cliente_nombre",
@@ -133,6 +145,8 @@ class PaymentsExportView(ExcelExportMixin, PaymentsListView):
     force_export = True
     excel_filename = "pagos"
     excel_sheet_title = "Pagos"
+    export_origin = "pagos"
+    export_process_name = "Exportación de pagos"
 
     excel_columns = [
         ExcelColumn("Fecha cita", "fecha_cita_display", width=20, align="center"),
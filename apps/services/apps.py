@@ -6,3 +6,9 @@ class ServicesConfig(AppConfig):
     name = "apps.services"
     label = "services"
     verbose_name = "Servicios"
+
+    def ready(self):
+        from apps.common import counts
+        from apps.services.models import Categoria, Servicio
+
+        counts.track(Categoria, Servicio)
@@ -1,21 +1,47 @@
+from django.db import transaction
+
 from apps.common.imports.importers import BaseAsyncImporter
 from apps.services.models.categoria import Categoria
 from apps.services.models.servicio import Servicio
+from dashboard.services import cache as dashboard_cache
 
 from .validators import CategoryAsyncImportValidator, ServiceAsyncImportValidator
 
 
-class ServiceAsyncImporter(BaseAsyncImporter):
+class CatalogImporterMixin:
+    """Sube la versión del catálogo del dashboard tras cada lote.
+
+    Los gráficos resuelven los nombres de servicio y categoría al leer; las
+    señales de Servicio/Categoria ya la suben, pero bulk_create y
+    bulk_update no las disparan.
+    """
+
+    def _invalidate(self):
+        super()._invalidate()
+        transaction.on_commit(lambda: dashboard_cache.bump(dashboard_cache.CATALOGO))
+
+
+class ServiceAsyncImporter(CatalogImporterMixin, BaseAsyncImporter):
     """Importación masiva de servicios. El proceso vive en BaseAsyncImporter."""
 
     validator_class = ServiceAsyncImportValidator
     model = Servicio
     success_message = "{count} servicios importados correctamente."
+    natural_keys = (("nombre", "categoria"),)
+    upsert_message = (
+        "Servicios: {created} nuevos, {updated} actualizados y "
+        "{unchanged} sin cambios."
+    )
 
 
-class CategoryAsyncImporter(BaseAsyncImporter):
+class CategoryAsyncImporter(CatalogImporterMixin, BaseAsyncImporter):
     """Importación masiva de categorías. El proceso vive en BaseAsyncImporter."""
 
     validator_class = CategoryAsyncImportValidator
     model = Categoria
     success_message = "{count} categorías importadas correctamente."
+    natural_keys = (("nombre",),)
+    upsert_message = (
+        "Categorías: {created} nuevas, {updated} actualizadas y "
+        "{unchanged} sin cambios."
+    )
@@ -3,12 +3,20 @@ from decimal import Decimal, InvalidOperation
 
 from result import Err, Ok
 
+from apps.common.imports.lookups import Lookup
 from apps.common.imports.validators import BaseAsyncImportValidator
 from apps.common.utils.utils import CommonCleaner
 from apps.services.models.categoria import Categoria
 from apps.services.models.servicio import Servicio
 
 
+def _whole_number(value) -> int:
+    """Entero de un texto o de una celda numérica; 2.5 no se trunca a 2."""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    return int(value)
+
+
 class ServiceAsyncImportValidator(BaseAsyncImportValidator):
     fields = {
         "nombre": "Nombre",
@@ -18,6 +26,11 @@ class ServiceAsyncImportValidator(BaseAsyncImportValidator):
         "duracion_estimada": "Duración (minutos)",
         "estado": "Estado",
     }
+    lookups = {
+        "categorias": Lookup(Categoria, column="categoria", normalize=int),
+    }
+    # Desde un .xlsx llegan como número (o duración) y no se re-parsean.
+    typed_fields = {"categoria", "precio", "duracion_estimada"}
 
     # Duración por defecto cuando la columna viene vacía (igual que el modelo).
     DEFAULT_DURATION = datetime.timedelta(minutes=30)
@@ -34,11 +47,11 @@ class ServiceAsyncImportValidator(BaseAsyncImportValidator):
             return Ok(None)
 
         try:
-            categoria_id = int(categoria)
+            categoria_id = _whole_number(categoria)
         except (TypeError, ValueError):
             return Err(f"El 'ID Categoría' debe ser un número entero: {categoria}.")
 
-        instancia = Categoria.objects.filter(pk=categoria_id).first()
+        instancia = self.preloaded["categorias"].get(categoria_id)
         if not instancia:
             return Err(f"No existe una categoría con ID {categoria_id}.")
 
@@ -58,10 +71,13 @@ class ServiceAsyncImportValidator(BaseAsyncImportValidator):
         return CommonCleaner.clean_250_characters_field("descripción", descripcion)
 
     def clean_precio(self, precio, **kwargs):
-        if not precio:
+        if precio in ("", None):
             return Err("El campo 'precio' es obligatorio.")
         try:
-            valor = Decimal(precio.replace(" ", ""))
+            if isinstance(precio, str):
+                valor = Decimal(precio.replace(" ", ""))
+            else:
+                valor = Decimal(str(precio))
         except (InvalidOperation, AttributeError):
             return Err(f"El precio debe ser un número válido: {precio}.")
         if valor <= 0:
@@ -70,15 +86,21 @@ class ServiceAsyncImportValidator(BaseAsyncImportValidator):
 
     def clean_duracion_estimada(self, duracion_estimada, **kwargs):
         # Opcional: si viene vacía se usa la duración por defecto.
-        if not duracion_estimada:
+        if duracion_estimada in ("", None):
             return Ok(self.DEFAULT_DURATION)
-        try:
-            minutos = int(duracion_estimada)
-        except (TypeError, ValueError):
-            return Err(
-                f"La duración debe ser un número entero de minutos: "
-                f"{duracion_estimada}."
-            )
+        # Una celda con formato de hora/duración llega ya tipada por Excel.
+        if isinstance(duracion_estimada, datetime.timedelta):
+            minutos = int(duracion_estimada.total_seconds() // 60)
+        elif isinstance(duracion_estimada, datetime.time):
+            minutos = duracion_estimada.hour * 60 + duracion_estimada.minute
+        else:
+            try:
+                minutos = _whole_number(duracion_estimada)
+            except (TypeError, ValueError):
+                return Err(
+                    f"La duración debe ser un número entero de minutos: "
+                    f"{duracion_estimada}."
+                )
         if minutos <= 0:
             return Err("La duración debe ser mayor a cero.")
         return Ok(datetime.timedelta(minutes=minutos))
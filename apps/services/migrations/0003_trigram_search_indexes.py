@@ -0,0 +1,24 @@
+# Generated by Django 4.2.23 on 2026-10-16 10:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_trigram_search_indexes'),
+        ('services', '0002_categoria_historicalcategoria_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicio',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='servicios_nombre_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='servicio',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('descripcion'), name='gin_trgm_ops'), name='servicios_descripcion_trgm'),
+        ),
+    ]
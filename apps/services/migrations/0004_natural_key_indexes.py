@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-16 22:23
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0003_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="categoria",
+            index=models.Index(
+                django.db.models.functions.text.Upper("nombre"),
+                name="categoria_nombre_key",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="servicio",
+            index=models.Index(
+                django.db.models.functions.text.Upper("nombre"),
+                models.F("categoria"),
+                name="servicios_nombre_key",
+            ),
+        ),
+    ]
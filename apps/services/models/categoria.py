@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from model_utils.models import TimeStampedModel, SoftDeletableModel
 from simple_history.models import HistoricalRecords
 
@@ -61,6 +62,8 @@ class Categoria(TimeStampedModel, SoftDeletableModel):
         verbose_name = "Categoria"
         verbose_name_plural = "Categorias"
         ordering = ["nombre"]
+        # Clave natural del upsert de importaciones.
+        indexes = [models.Index(Upper("nombre"), name="categoria_nombre_key")]
 
     def __str__(self):
         return self.nombre
@@ -1,5 +1,7 @@
 import datetime
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from model_utils.models import TimeStampedModel, SoftDeletableModel
 from simple_history.models import HistoricalRecords
 from .categoria import Categoria
@@ -74,6 +76,22 @@ class Servicio(TimeStampedModel, SoftDeletableModel):
         verbose_name = "Servicio"
         verbose_name_plural = "Servicios"
         ordering = ["nombre"]
+        # Trigramas sobre UPPER(col): sirven a los __icontains del buscador
+        # de las listas (ver apps.common.search).
+        indexes = [
+            GinIndex(
+                OpClass(Upper("nombre"), name="gin_trgm_ops"),
+                name="servicios_nombre_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("descripcion"), name="gin_trgm_ops"),
+                name="servicios_descripcion_trgm",
+            ),
+            # Clave natural del upsert de importaciones (nombre, categoría).
+            models.Index(
+                Upper("nombre"), models.F("categoria"), name="servicios_nombre_key"
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -1,8 +1,16 @@
+from django.conf import settings
+
 from apps.services.imports import CategoryAsyncImporter, ServiceAsyncImporter
+from apps.tareas import queues
 from apps.tareas.decorators import background_task
 
 
-@background_task
+@background_task(
+    queue=queues.IMPORTACIONES,
+    limite_por_origen=settings.IMPORT_CONCURRENCY_PER_ORIGIN,
+    reject_on_worker_lost=True,
+    reanudable=True,
+)
 def import_services(tarea, user):
     """Importa servicios desde el CSV que la vista dejó en la tarea.
 
@@ -17,7 +25,12 @@ def import_services(tarea, user):
     ServiceAsyncImporter(user=user, task=tarea).run()
 
 
-@background_task
+@background_task(
+    queue=queues.IMPORTACIONES,
+    limite_por_origen=settings.IMPORT_CONCURRENCY_PER_ORIGIN,
+    reject_on_worker_lost=True,
+    reanudable=True,
+)
 def import_categories(tarea, user):
     """Importa categorías desde el CSV que la vista dejó en la tarea.
 
@@ -8,11 +8,13 @@ from rest_framework.status import HTTP_400_BAD_REQUEST
 from bootstrap_modal_forms.forms import BSModalForm
 from bootstrap_modal_forms.generic import BSModalDeleteView, BSModalFormView
 
+from apps.common import counts
 from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.excel_export_mixin import ExcelExportMixin
 from apps.common.form_classes import FORM_CONTROL_CLASS, FORM_SELECT_CLASS
 from apps.common.utils.utils import CommonCleaner, get_errors_to_response
+from apps.common.utils.urls import row_url
 from apps.common.views.base_views import ProtectedView
 from ...models.servicio import Servicio
 from ...models.categoria import Categoria
@@ -159,6 +161,11 @@ class CategoryListView(BaseListViewAjax):
         "estado",
     ]
 
+    search_fields = [
+        "nombre",
+        "descripcion",
+    ]
+
     ordering_fields = {
         "0": "pk",
         "1": "nombre",
@@ -172,18 +179,14 @@ class CategoryListView(BaseListViewAjax):
             item["options"] = [
                 {
                     "label": "Ver detalles",
-                    "link": reverse_lazy(
-                        "category_detail_modal", kwargs={"pk": item["pk"]}
-                    ),
+                    "link": row_url("category_detail_modal", item["pk"]),
                     "bsModal": True,
                     "icon": "edit_document",
                     "className": "bs-modal",
                 },
                 {
                     "label": "Eliminar",
-                    "link": reverse_lazy(
-                        "category_delete_modal", kwargs={"pk": item["pk"]}
-                    ),
+                    "link": row_url("category_delete_modal", item["pk"]),
                     "bsModal": True,
                     "icon": "delete",
                     "className": "bs-modal text-color-destructive",
@@ -311,6 +314,7 @@ class CategoryDetailModalView(BaseCategoryModalView):
         category.servicios.filter(is_removed=False).exclude(
             estado=Servicio.EstadoChoices.INACTIVO
         ).update(estado=Servicio.EstadoChoices.INACTIVO)
+        counts.invalidate(Servicio)
 
     def form_valid(self, form):
         cleaned_data = form.cleaned_data
@@ -7,6 +7,7 @@ from rest_framework.status import HTTP_400_BAD_REQUEST
 from bootstrap_modal_forms.forms import BSModalForm
 from bootstrap_modal_forms.generic import BSModalFormView, BSModalDeleteView
 from result import Result, Ok, Err
+from apps.common import counts
 from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.exports.columns import ExcelColumn
 from apps.common.exports.excel_export_mixin import ExcelExportMixin
@@ -14,6 +15,7 @@ from apps.common.custom_time_fields import DurationInMinutesField
 from apps.common.form_classes import FORM_CONTROL_CLASS, FORM_SELECT_CLASS
 from apps.common.utils.currency import format_currency
 from apps.common.utils.utils import CommonCleaner, get_errors_to_response
+from apps.common.utils.urls import row_url
 from apps.common.views.base_views import ProtectedView
 from ..models.servicio import Servicio
 from ..models.categoria import Categoria
@@ -224,6 +226,12 @@ class ServiceListView(BaseListViewAjax):
         "estado",
     ]
 
+    search_fields = [
+        "nombre",
+        "categoria__nombre",
+        "descripcion",
+    ]
+
     ordering_fields = {
         "0": "nombre",
         "1": "categoria__nombre",
@@ -238,18 +246,14 @@ class ServiceListView(BaseListViewAjax):
             item["options"] = [
                 {
                     "label": "Ver detalles",
-                    "link": reverse_lazy(
-                        "service_detail_modal", kwargs={"pk": item["pk"]}
-                    ),
+                    "link": row_url("service_detail_modal", item["pk"]),
                     "bsModal": True,
                     "icon": "edit_document",
                     "className": "bs-modal",
                 },
                 {
                     "label": "Eliminar",
-                    "link": reverse_lazy(
-                        "service_delete_modal", kwargs={"pk": item["pk"]}
-                    ),
+                    "link": row_url("service_delete_modal", item["pk"]),
                     "bsModal": True,
                     "icon": "delete",
                     "className": "bs-modal text-color-destructive",
@@ -285,15 +289,19 @@ class ServiceListView(BaseListViewAjax):
 
     @staticmethod
     def additional_data(queryset) -> dict:
-        _additional_data = Servicio.objects.aggregate(
-            active_services_total=Count(
-                "pk", filter=Q(estado=Servicio.EstadoChoices.ACTIVO)
-            ),
-            inactive_services_total=Count(
-                "pk", filter=Q(estado=Servicio.EstadoChoices.INACTIVO)
+        # Totales de toda la tabla: se cachean hasta la próxima escritura.
+        return counts.remember(
+            [Servicio],
+            "estado_totals",
+            lambda: Servicio.objects.aggregate(
+                active_services_total=Count(
+                    "pk", filter=Q(estado=Servicio.EstadoChoices.ACTIVO)
+                ),
+                inactive_services_total=Count(
+                    "pk", filter=Q(estado=Servicio.EstadoChoices.INACTIVO)
+                ),
             ),
         )
-        return _additional_data
 
 
 class ServiceExportView(ExcelExportMixin, ServiceListView):
@@ -301,6 +309,8 @@ class ServiceExportView(ExcelExportMixin, ServiceListView):
     include_options_column = False
     excel_filename = "servicios"
     excel_sheet_title = "Servicios"
+    export_origin = "servicios"
+    export_process_name = "Exportación de servicios"
 
     excel_columns = [
         ExcelColumn("Nombre", "nombre", width=30),
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from apps.tareas.models import TareaEnProceso
+from apps.tareas.models import TareaArchivada, TareaEnProceso
 
 
 @admin.register(TareaEnProceso)
@@ -17,5 +17,46 @@ class TareaEnProcesoAdmin(admin.ModelAdmin):
     )
     list_filter = ("estado", "origen")
     search_fields = ("nombre_proceso", "celery_task_id")
-    readonly_fields = ("created", "modified", "finalizado_en", "celery_task_id")
+    readonly_fields = (
+        "created",
+        "modified",
+        "finalizado_en",
+        "celery_task_id",
+        "checkpoint_filas",
+        "checkpoint_hash",
+        "worker",
+        "latido_en",
+        "tarea_celery",
+        "cancelacion_solicitada_en",
+        "iniciado_en",
+        "espera_segundos",
+        "duracion_segundos",
+        "filas_por_segundo",
+        "consultas_bd",
+        "memoria_pico_kb",
+    )
+    ordering = ("-created",)
+
+
+@admin.register(TareaArchivada)
+class TareaArchivadaAdmin(admin.ModelAdmin):
+    list_display = (
+        "nombre_proceso",
+        "origen",
+        "estado",
+        "progreso_actual",
+        "total_registros",
+        "created",
+        "finalizado_en",
+        "archivado_en",
+    )
+    list_filter = ("estado", "origen")
+    search_fields = ("nombre_proceso",)
     ordering = ("-created",)
+
+    # El archivo es de solo lectura: lo escribe apps.tareas.retention.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TareasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.tareas"
+
+    def ready(self):
+        from apps.common import counts
+        from apps.tareas.models import TareaEnProceso
+
+        # El monitor solo cuenta por estado: los avances y checkpoints no
+        # invalidan sus totales.
+        counts.track(TareaEnProceso, fields=["estado"])
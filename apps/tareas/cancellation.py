@@ -0,0 +1,48 @@
+"""Cancelación cooperativa de las TareaEnProceso.
+
+Celery no puede cortar de forma segura un proceso a mitad de un lote, así que
+cancelar es un pedido: TareaEnProceso.solicitar_cancelacion() deja una marca
+en Redis (y en cancelacion_solicitada_en, por si Redis no responde o pierde
+la marca) y el propio proceso la consulta entre lotes con
+comprobar_cancelacion(), que lanza TareaCancelada. Lo ya confirmado queda; la tarea termina CANCELADO con su
+avance parcial y el worker se libera en lo que tarda un lote.
+"""
+
+from apps.tareas.redis_client import get_client
+
+PREFIX = "tareas:cancelar"
+
+# La marca solo importa mientras la tarea corre; vence sola por si nadie la
+# llega a leer.
+FLAG_TTL = 24 * 3600
+
+
+class TareaCancelada(Exception):
+    """El usuario pidió cancelar la tarea: el proceso debe cortar ya."""
+
+
+def _key(tarea_id: int) -> str:
+    return f"{PREFIX}:{tarea_id}"
+
+
+def request(tarea_id: int) -> None:
+    try:
+        get_client().set(_key(tarea_id), 1, ex=FLAG_TTL)
+    except Exception:
+        # Queda cancelacion_solicitada_en en la BD.
+        pass
+
+
+def is_requested(tarea_id: int) -> bool | None:
+    """True si se pidió cancelar la tarea; None si Redis no responde."""
+    try:
+        return bool(get_client().exists(_key(tarea_id)))
+    except Exception:
+        return None
+
+
+def clear(tarea_id: int) -> None:
+    try:
+        get_client().delete(_key(tarea_id))
+    except Exception:
+        pass
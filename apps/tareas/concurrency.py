@@ -0,0 +1,105 @@
+"""Tope de tareas en ejecución por origen, con un semáforo en Redis.
+
+Las colas separan tipos de trabajo, pero dentro de una cola una avalancha de
+importaciones del mismo origen puede ocupar todos los procesos del worker.
+background_task(limite_por_origen=N) lo evita: antes de ejecutar, la tarea
+pide un cupo en el semáforo de su origen (un sorted set con las tareas que
+corren) y, si ya hay N, vuelve a la cola con un countdown en lugar de ocupar
+el proceso esperando.
+
+Un cupo no se renueva: es válido mientras su tarea siga latiendo (ver
+apps.tareas.heartbeat). Al pedir cupo se descartan los de tareas cuyo latido
+venció, así que un worker muerto no retiene el suyo.
+
+Si Redis no responde no hay tope: la tarea corre igual.
+"""
+
+from django.utils import timezone
+
+from apps.tareas import heartbeat
+from apps.tareas.models import TareaEnProceso
+from apps.tareas.redis_client import get_client
+
+PREFIX = "tareas:semaforo"
+
+# KEYS[1]: semáforo del origen. ARGV: prefijo de los latidos, id de la
+# tarea, tope y hora (score, solo informativo).
+_ACQUIRE = """
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    if member ~= ARGV[2]
+        and redis.call('EXISTS', ARGV[1] .. ':' .. member) == 0 then
+        redis.call('ZREM', KEYS[1], member)
+    end
+end
+if redis.call('ZSCORE', KEYS[1], ARGV[2]) then
+    return 1
+end
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+def _key(origen: str) -> str:
+    return f"{PREFIX}:{origen}"
+
+
+class OriginSlot:
+    """Cupo de ejecución en el semáforo del origen de una tarea.
+
+    Debe tomarse dentro del Heartbeat de la tarea: el cupo vive lo que vive
+    su latido.
+
+    Example:
+        with OriginSlot(tarea, limite=2) as cupo:
+            if cupo.acquired:
+                ...
+
+    Attributes:
+        tarea_id (int): Tarea que pide el cupo.
+        origen (str): Origen cuyo semáforo se usa.
+        limite (int | None): Tareas del origen que pueden correr a la vez.
+            None o 0 es sin tope.
+        acquired (bool): False si el origen ya tiene limite tareas
+            corriendo; quien llama no debe ejecutar el proceso.
+    """
+
+    def __init__(self, tarea: TareaEnProceso, limite: int | None):
+        self.tarea_id = tarea.pk
+        self.origen = tarea.origen
+        self.limite = limite
+        self.acquired = False
+
+    def __enter__(self):
+        self.acquired = self.__acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.acquired or not self.limite:
+            return
+        try:
+            get_client().zrem(_key(self.origen), self.tarea_id)
+        except Exception:
+            # Sin latido, el próximo que pida cupo lo descarta.
+            pass
+
+    def __acquire(self) -> bool:
+        if not self.limite:
+            return True
+        try:
+            script = get_client().register_script(_ACQUIRE)
+            return bool(
+                script(
+                    keys=[_key(self.origen)],
+                    args=[
+                        heartbeat.PREFIX,
+                        self.tarea_id,
+                        self.limite,
+                        timezone.now().timestamp(),
+                    ],
+                )
+            )
+        except Exception:
+            return True
@@ -1,9 +1,14 @@
 from functools import wraps
 
-from celery import shared_task
+from celery import current_task, shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from result import Err, Ok
 
+from apps.tareas.cancellation import TareaCancelada
+from apps.tareas.concurrency import OriginSlot
+from apps.tareas.heartbeat import Heartbeat, lease_seconds
+from apps.tareas.metrics import ExecutionMetrics
 from apps.tareas.models import TareaEnProceso
 
 
@@ -28,7 +33,7 @@ def _get_user(user_id):
     return Ok(user)
 
 
-def tracked_task(func, requires_user=True):
+def tracked_task(func, requires_user=True, limite_por_origen=None):
     """Agrega el seguimiento en TareaEnProceso a una función. Pieza interna.
 
     La función se escribe recibiendo la instancia TareaEnProceso, pero se
@@ -39,6 +44,29 @@ def tracked_task(func, requires_user=True):
     detalle en resultado_metadata (nunca EN_PROCESO eterno) y la excepción se
     relanza para que el worker registre el traceback.
 
+    Mientras la función corre, la tarea late (ver apps.tareas.heartbeat): si
+    el worker muere sin poder marcarla, el reaper la detecta. Si otra entrega
+    de la misma tarea sigue latiendo, esta se reintenta cuando el lease
+    vence, en lugar de correr en paralelo.
+
+    Con limite_por_origen, además, la tarea pide cupo en el semáforo de su
+    origen (ver apps.tareas.concurrency); si está lleno vuelve a la cola y
+    se reintenta a los TASK_CONCURRENCY_RETRY_DELAY segundos.
+
+    Una ejecución eager (task.apply(), como la validación de prueba que corre
+    dentro de la petición) no pide cupo, porque no ocupa un proceso del
+    worker, ni se reintenta: Celery repetiría la llamada en el acto, sin
+    respetar el countdown.
+
+    La ejecución se mide (espera en la cola, duración, ritmo, consultas y
+    pico de memoria) en las columnas de métricas de la tarea; ver
+    apps.tareas.metrics.
+
+    Una tarea que ya no está activa (p. ej. se canceló mientras esperaba en
+    la cola) no se ejecuta. Si la función lanza TareaCancelada (ver
+    apps.tareas.cancellation) la tarea queda CANCELADO con su avance parcial
+    y no se relanza: no es un error.
+
     Las tareas del proyecto no usan este decorador directamente: usan
     background_task, que además las registra en Celery.
 
@@ -48,6 +76,8 @@ def tracked_task(func, requires_user=True):
             cuyo usuario ya no existe queda FALLIDO y el proceso no se
             ejecuta. Si es False el proceso corre igual y recibe user=None,
             que es el caso de las tareas periódicas.
+        limite_por_origen (int | None): Tareas con el mismo origen que
+            pueden correr a la vez. None es sin tope.
 
     Returns:
         callable: La función envuelta, que se invoca con (tarea_id, ...).
@@ -56,21 +86,48 @@ def tracked_task(func, requires_user=True):
     @wraps(func)
     def wrapper(tarea_id, *args, **kwargs):
         tarea = TareaEnProceso.objects.get(pk=tarea_id)
+        if not tarea.activa:
+            return None
         result = _get_user(tarea.user_id)
         if result.is_err() and requires_user:
             tarea.fallar(result.value)
             return None
         kwargs["user"] = result.value if result.is_ok() else None
-        try:
-            return func(tarea, *args, **kwargs)
-        except Exception as exc:
-            tarea.fallar(exc)
-            raise
+        task_name = current_task.name if current_task else ""
+        queued = bool(current_task) and not current_task.request.is_eager
+        with Heartbeat(tarea, task_name) as latido:
+            if not latido.acquired:
+                if queued:
+                    raise current_task.retry(
+                        countdown=lease_seconds(), max_retries=None
+                    )
+                return None
+            limite = limite_por_origen if queued else None
+            with OriginSlot(tarea, limite) as cupo:
+                if not cupo.acquired:
+                    if queued:
+                        raise current_task.retry(
+                            countdown=settings.TASK_CONCURRENCY_RETRY_DELAY,
+                            max_retries=None,
+                        )
+                    return None
+                try:
+                    with ExecutionMetrics(tarea):
+                        tarea.comprobar_cancelacion()
+                        return func(tarea, *args, **kwargs)
+                except TareaCancelada:
+                    tarea.cancelar()
+                    return None
+                except Exception as exc:
+                    tarea.fallar(exc)
+                    raise
 
     return wrapper
 
 
-def background_task(func=None, *, requires_user=True, **opciones):
+def background_task(
+    func=None, *, requires_user=True, limite_por_origen=None, **opciones
+):
     """Decorador público para procesos en segundo plano con seguimiento.
 
     Equivale a @shared_task + @tracked_task en el orden correcto, para que
@@ -91,6 +148,9 @@ def background_task(func=None, *, requires_user=True, **opciones):
         @background_task(requires_user=False)
         def enviar_recordatorios(tarea, user): ...
 
+        @background_task(queue=queues.IMPORTACIONES, limite_por_origen=2)
+        def importar_servicios(tarea, user): ...
+
         importar_clientes.delay(tarea.id)
 
     Args:
@@ -99,7 +159,14 @@ def background_task(func=None, *, requires_user=True, **opciones):
             usuario existente; si no lo hay la tarea queda FALLIDO sin
             ejecutar el proceso. False es para los procesos periódicos, que no
             nacen de una persona: ahí user llega como None.
+        limite_por_origen (int | None): Tope de tareas del mismo origen
+            corriendo a la vez (ver apps.tareas.concurrency). None es sin
+            tope.
         **opciones: Opciones de shared_task (max_retries, rate_limit...).
+            queue y priority eligen cola y prioridad (ver apps.tareas.queues).
+            reanudable=True marca un proceso idempotente (p. ej. las
+            importaciones, que retoman desde su checkpoint): el reaper lo
+            vuelve a encolar en vez de solo marcarlo FALLIDO.
 
     Returns:
         callable: La tarea Celery registrada, o el decorador si se usó con
@@ -116,7 +183,11 @@ def background_task(func=None, *, requires_user=True, **opciones):
         )
 
     def decorador(f):
-        return shared_task(**opciones)(tracked_task(f, requires_user=requires_user))
+        return shared_task(**opciones)(
+            tracked_task(
+                f, requires_user=requires_user, limite_por_origen=limite_por_origen
+            )
+        )
 
     if func is not None:  # uso sin paréntesis: @background_task
         return decorador(func)
@@ -0,0 +1,87 @@
+"""Eventos de avance de las TareaEnProceso, publicados en Redis.
+
+iniciar/avanzar/completar/fallar publican el estado de la tarea en un stream
+de Redis (XADD, acotado a STREAM_MAXLEN entradas). El monitor /procesos/ lo
+escucha con long polling (TaskEventsView): cada petición bloquea en XREAD
+hasta que llega un evento o vence TASK_EVENTS_TIMEOUT, y la siguiente sigue
+desde el último id recibido. A diferencia de un canal pub/sub, lo publicado
+entre dos peticiones queda en el stream y no se pierde.
+
+Los eventos son un acelerador: si Redis no responde, la tarea sigue su curso
+y el monitor vuelve a depender del botón «Actualizar».
+"""
+
+from apps.tareas.redis_client import get_blocking_client, get_client
+
+STREAM_KEY = "tareas:eventos"
+
+# Entradas que conserva el stream; alcanza de sobra para un monitor que se
+# reconecta cada pocos segundos.
+STREAM_MAXLEN = 1000
+
+# Id de XREAD para "solo lo que llegue desde ahora".
+LATEST = "$"
+
+
+def payload(tarea) -> dict:
+    """Lo que el monitor necesita para repintar la fila de una tarea."""
+    return {
+        "pk": tarea.pk,
+        "estado": tarea.estado,
+        "estado_display": tarea.get_estado_display(),
+        "progreso_actual": tarea.progreso_actual,
+        "total_registros": tarea.total_registros,
+        "porcentaje": tarea.porcentaje,
+    }
+
+
+def publish(evento: dict) -> None:
+    try:
+        get_client().xadd(
+            STREAM_KEY,
+            {key: str(value) for key, value in evento.items()},
+            maxlen=STREAM_MAXLEN,
+            approximate=True,
+        )
+    except Exception:
+        # Sin Redis no hay a quién avisar; no se debe romper la tarea que
+        # reporta su avance.
+        pass
+
+
+def read(cursor: str, timeout: float):
+    """Espera eventos posteriores a cursor, como mucho timeout segundos.
+
+    Args:
+        cursor (str): Último id recibido, o LATEST para empezar desde ahora.
+        timeout (float): Segundos que bloquea si no hay nada nuevo.
+
+    Returns:
+        tuple[str, list[dict]] | None: (nuevo cursor, eventos en orden), o
+            None si Redis no está disponible.
+    """
+    try:
+        client = get_blocking_client()
+        if cursor == LATEST:
+            # "$" se resuelve en cada XREAD: se fija el último id existente
+            # para que la próxima petición no pierda lo publicado entre medio.
+            last = client.xrevrange(STREAM_KEY, count=1)
+            cursor = last[0][0] if last else "0-0"
+        response = client.xread({STREAM_KEY: cursor}, block=int(timeout * 1000))
+    except Exception:
+        return None
+
+    eventos: list = []
+    for _, entries in response or []:
+        for entry_id, fields in entries:
+            cursor = entry_id
+            eventos.append(
+                {
+                    **fields,
+                    "pk": int(fields["pk"]),
+                    "progreso_actual": int(fields["progreso_actual"]),
+                    "total_registros": int(fields["total_registros"]),
+                    "porcentaje": int(fields["porcentaje"]),
+                }
+            )
+    return cursor, eventos
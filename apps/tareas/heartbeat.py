@@ -0,0 +1,158 @@
+"""Latido de las tareas rastreadas mientras corren.
+
+Si el worker muere (p. ej. OOM) entre iniciar() y completar(), nadie cierra la
+TareaEnProceso y queda EN_PROCESO para siempre. Para detectarlo, tracked_task
+corre cada proceso dentro de un Heartbeat: un hilo que cada
+TASK_HEARTBEAT_INTERVAL segundos renueva en Redis una key con TTL de
+LEASE_BEATS latidos (worker + hora) y cada TASK_HEARTBEAT_FLUSH_INTERVAL la
+vuelca a TareaEnProceso.latido_en. El latido en Redis es barato; el de la BD
+sobrevive a un reinicio de Redis. apps.tareas.reaper declara muerta la tarea
+cuyo último latido es más viejo que TASK_HEARTBEAT_TIMEOUT.
+
+La key es además un lease: si Celery entrega dos veces la misma tarea (acks
+tardío, reencolado del reaper) y la primera sigue viva, la segunda no la
+ejecuta en paralelo. Como la key vence a los pocos latidos perdidos, una
+reentrega tras la muerte del worker toma el lease casi enseguida.
+"""
+
+import datetime
+import os
+import socket
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.tareas.models import TareaEnProceso
+from apps.tareas.redis_client import get_client
+
+PREFIX = "tareas:latido"
+
+# Latidos seguidos que pueden perderse antes de que el lease quede libre.
+LEASE_BEATS = 3
+
+
+def _key(tarea_id: int) -> str:
+    return f"{PREFIX}:{tarea_id}"
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def lease_seconds() -> int:
+    return settings.TASK_HEARTBEAT_INTERVAL * LEASE_BEATS
+
+
+def last_seen(tarea_id: int) -> datetime.datetime | None:
+    """Último latido en Redis de una tarea, o None si no hay (o no hay Redis)."""
+    try:
+        value = get_client().get(_key(tarea_id))
+    except Exception:
+        return None
+    if not value:
+        return None
+    _, timestamp = value.rsplit("|", 1)
+    return datetime.datetime.fromtimestamp(float(timestamp), tz=datetime.timezone.utc)
+
+
+class Heartbeat:
+    """Mantiene vivo el latido de una tarea mientras dura el bloque with.
+
+    Example:
+        with Heartbeat(tarea, "apps.clients.tasks.import_clients") as latido:
+            if latido.acquired:
+                ...
+
+    Attributes:
+        tarea_id (int): Tarea que late.
+        task_name (str): Nombre de la tarea Celery que la ejecuta.
+        worker (str): host:pid del proceso.
+        acquired (bool): False si otro worker ya tiene el lease vivo; en ese
+            caso no se late y quien llama no debe ejecutar el proceso.
+    """
+
+    def __init__(self, tarea: TareaEnProceso, task_name: str = ""):
+        self.tarea_id = tarea.pk
+        self.task_name = task_name
+        self.worker = worker_id()
+        self.acquired = False
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__last_flush = None
+
+    def __enter__(self):
+        self.acquired = self.__acquire()
+        if self.acquired:
+            self.__flush()
+            self.__thread = threading.Thread(
+                target=self.__run, name=f"latido-{self.tarea_id}", daemon=True
+            )
+            self.__thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.acquired:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        try:
+            client = get_client()
+            value = client.get(_key(self.tarea_id)) or ""
+            if value.startswith(f"{self.worker}|"):
+                client.delete(_key(self.tarea_id))
+        except Exception:
+            # La key expira sola con su TTL.
+            pass
+
+    def __value(self) -> str:
+        return f"{self.worker}|{timezone.now().timestamp()}"
+
+    def __acquire(self) -> bool:
+        try:
+            return bool(
+                get_client().set(
+                    _key(self.tarea_id),
+                    self.__value(),
+                    nx=True,
+                    ex=lease_seconds(),
+                )
+            )
+        except Exception:
+            # Sin Redis no hay lease: se ejecuta igual y late solo en la BD.
+            return True
+
+    def __beat(self):
+        try:
+            get_client().set(
+                _key(self.tarea_id),
+                self.__value(),
+                ex=lease_seconds(),
+            )
+        except Exception:
+            pass
+
+    def __flush(self):
+        # update() de queryset: no dispara señales ni invalida los conteos.
+        self.__last_flush = timezone.now()
+        TareaEnProceso.objects.filter(pk=self.tarea_id).update(
+            worker=self.worker,
+            latido_en=self.__last_flush,
+            tarea_celery=self.task_name,
+        )
+
+    def __run(self):
+        try:
+            while not self.__stop.wait(settings.TASK_HEARTBEAT_INTERVAL):
+                self.__beat()
+                elapsed = (timezone.now() - self.__last_flush).total_seconds()
+                if elapsed >= settings.TASK_HEARTBEAT_FLUSH_INTERVAL:
+                    try:
+                        self.__flush()
+                    except Exception:
+                        # Un corte de la BD no debe matar el latido en Redis.
+                        pass
+        finally:
+            # El hilo abrió su propia conexión a la BD.
+            connection.close()
@@ -0,0 +1,19 @@
+"""
+Comando para borrar los archivos de export en segundo plano que ya vencieron
+(EXPORT_RETENTION_HOURS). Celery beat ya lo corre con la retención del
+historial de tareas (apply_task_retention); el comando sirve para correrlo a
+mano.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.common.exports.async_export import purge_expired_exports
+
+
+class Command(BaseCommand):
+    help = "Elimina los archivos de export vencidos del storage"
+
+    def handle(self, *args, **options):
+        """Ejecutar el barrido."""
+        purged = purge_expired_exports()
+        self.stdout.write(self.style.SUCCESS(f"✓ {purged} archivo(s) eliminado(s)"))
@@ -0,0 +1,29 @@
+"""
+Comando para aplicar la retención del historial de tareas (ver
+apps.tareas.retention): borra los archivos de export vencidos, vacía los
+datos de entrada vencidos y pasa a tareas_archivadas las tareas terminadas hace más de TASK_ARCHIVE_AFTER_DAYS
+días. Celery beat ya lo corre cada TASK_RETENTION_INTERVAL segundos; el
+comando sirve para programarlo (cron) donde no hay beat o correrlo a mano.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.tareas.retention import apply_retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra los exports vencidos, vacía los datos de entrada vencidos y "
+        "archiva las tareas viejas"
+    )
+
+    def handle(self, *args, **options):
+        """Ejecutar la retención."""
+        summary = apply_retention()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {summary['exports']} export(s) eliminado(s), "
+                f"{summary['vaciadas']} tarea(s) vaciada(s), "
+                f"{summary['archivadas']} archivada(s)"
+            )
+        )
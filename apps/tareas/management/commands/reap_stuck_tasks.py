@@ -0,0 +1,24 @@
+"""
+Comando para marcar o reencolar las tareas colgadas (ver apps.tareas.reaper).
+Celery beat ya lo corre cada TASK_REAPER_INTERVAL segundos; el comando sirve
+para programarlo (cron) donde no hay beat o correrlo a mano.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.tareas.reaper import reap_stuck_tasks
+
+
+class Command(BaseCommand):
+    help = "Marca como fallidas (o reencola) las tareas sin latido"
+
+    def handle(self, *args, **options):
+        """Ejecutar el barrido."""
+        summary = reap_stuck_tasks()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {summary['fallidas']} tarea(s) fallida(s), "
+                f"{summary['reencoladas']} reencolada(s), "
+                f"{summary['canceladas']} cancelada(s)"
+            )
+        )
@@ -0,0 +1,177 @@
+"""Métricas de ejecución de las TareaEnProceso.
+
+Con created, modified y finalizado_en no se distingue si una importación
+lenta esperó en la cola o tardó en procesarse. tracked_task corre cada
+proceso dentro de un ExecutionMetrics, que deja en columnas propias de la
+tarea (no en resultado_metadata, para poder filtrarlas y ordenarlas sin
+abrir el JSON):
+
+- iniciado_en y espera_segundos: cuándo la tomó un worker y cuánto pasó
+  desde que se encoló (created). Una tarea reencolada cuenta toda la espera.
+- duracion_segundos y filas_por_segundo: cuánto corrió y a qué ritmo, sobre
+  progreso_actual al terminar.
+- consultas_bd: consultas del proceso en la conexión del worker (no cuenta
+  las del hilo de latido ni los COPY).
+- memoria_pico_kb: pico de memoria residente del proceso mientras corrió la
+  tarea. En Linux el pico se reinicia al empezar (/proc/self/clear_refs); en
+  otros sistemas es el pico histórico del proceso, una cota superior.
+
+summary_by_origin() las agrega en p50/p95 por origen y período para
+TaskMetricsView, sumando las tareas ya archivadas (TareaArchivada guarda las
+mismas columnas).
+"""
+
+import math
+import sys
+import time
+from itertools import groupby
+
+from django.db import connection
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from apps.tareas.models import TareaArchivada, TareaEnProceso
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Columnas que se resumen en p50/p95, en el orden en que las pinta la tabla.
+METRIC_FIELDS = (
+    "espera_segundos",
+    "duracion_segundos",
+    "filas_por_segundo",
+    "consultas_bd",
+    "memoria_pico_kb",
+)
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss viene en KB en Linux y en bytes en macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class ExecutionMetrics:
+    """Mide la ejecución de una tarea mientras dura el bloque with.
+
+    Al entrar marca iniciado_en; al salir, termine como termine, escribe el
+    resto de las métricas con un update() de queryset (sin señales, sin
+    pisar lo que el proceso haya guardado en la tarea).
+
+    Example:
+        with ExecutionMetrics(tarea):
+            importar(tarea)
+
+    Attributes:
+        tarea (TareaEnProceso): Tarea que se mide.
+        queries (int): Consultas contadas hasta ahora.
+    """
+
+    def __init__(self, tarea: TareaEnProceso):
+        self.tarea = tarea
+        self.queries = 0
+        self.__started = None
+        self.__clock = None
+        self.__wrapper = None
+
+    def __enter__(self):
+        self.__started = timezone.now()
+        self.tarea.iniciado_en = self.__started
+        TareaEnProceso.objects.filter(pk=self.tarea.pk).update(
+            iniciado_en=self.__started
+        )
+        _reset_peak_rss()
+        self.__wrapper = connection.execute_wrapper(self.__count_query)
+        self.__wrapper.__enter__()
+        self.__clock = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.monotonic() - self.__clock
+        self.__wrapper.__exit__(*exc_info)
+        rows = self.tarea.progreso_actual
+        metricas = {
+            "espera_segundos": (self.__started - self.tarea.created).total_seconds(),
+            "duracion_segundos": seconds,
+            "filas_por_segundo": rows / seconds if rows and seconds else None,
+            "consultas_bd": self.queries,
+            "memoria_pico_kb": _peak_rss_kb(),
+        }
+        for field, value in metricas.items():
+            setattr(self.tarea, field, value)
+        TareaEnProceso.objects.filter(pk=self.tarea.pk).update(**metricas)
+
+    def __count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values: list, p: float):
+    """Percentil p (0-100) por rango más cercano; values ya ordenados."""
+    if not values:
+        return None
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+
+def summary_by_origin(since, bucket: str = "day") -> list:
+    """p50/p95 de cada métrica por origen y período.
+
+    Args:
+        since (datetime): Solo tareas terminadas desde este momento.
+        bucket (str): Período de Trunc: "day", "week" o "month" (hora
+            local).
+
+    Returns:
+        list[dict]: Una entrada por (origen, período), ordenadas por origen y
+            del período más reciente al más viejo, con origen, periodo
+            (datetime), tareas, fallidas, canceladas y, por cada métrica de
+            METRIC_FIELDS, <métrica>_p50 y <métrica>_p95.
+    """
+    tzinfo = timezone.get_current_timezone()
+    live, archived = (
+        model.objects.filter(finalizado_en__gte=since, iniciado_en__isnull=False)
+        .annotate(periodo=Trunc("finalizado_en", bucket, tzinfo=tzinfo))
+        .order_by()
+        .values_list("origen", "periodo", "estado", *METRIC_FIELDS)
+        for model in (TareaEnProceso, TareaArchivada)
+    )
+    rows = live.union(archived, all=True).order_by("origen", "-periodo")
+    summary: list = []
+    for (origen, periodo), group in groupby(rows, key=lambda row: row[:2]):
+        group = list(group)
+        item = {
+            "origen": origen,
+            "periodo": periodo,
+            "tareas": len(group),
+            "fallidas": sum(
+                1 for row in group if row[2] == TareaEnProceso.Estado.FALLIDO
+            ),
+            "canceladas": sum(
+                1 for row in group if row[2] == TareaEnProceso.Estado.CANCELADO
+            ),
+        }
+        for index, field in enumerate(METRIC_FIELDS, start=3):
+            values = sorted(row[index] for row in group if row[index] is not None)
+            item[f"{field}_p50"] = percentile(values, 50)
+            item[f"{field}_p95"] = percentile(values, 95)
+        summary.append(item)
+    return summary
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0002_tareaenproceso_user_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tareaenproceso',
+            name='checkpoint_filas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tareaenproceso',
+            name='checkpoint_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-16 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tareas", "0003_tareaenproceso_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="worker",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="latido_en",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="tarea_celery",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+    ]
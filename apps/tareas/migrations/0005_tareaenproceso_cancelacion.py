@@ -0,0 +1,34 @@
+# Generated by Django 4.2.23 on 2026-10-16 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tareas", "0004_tareaenproceso_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="cancelacion_solicitada_en",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="tareaenproceso",
+            name="estado",
+            field=models.CharField(
+                choices=[
+                    ("pendiente", "Pendiente"),
+                    ("en_proceso", "En proceso"),
+                    ("completado", "Completado"),
+                    ("fallido", "Fallido"),
+                    ("cancelado", "Cancelado"),
+                ],
+                db_index=True,
+                default="pendiente",
+                max_length=20,
+            ),
+        ),
+    ]
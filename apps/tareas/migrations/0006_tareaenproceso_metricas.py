@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-16 22:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tareas", "0005_tareaenproceso_cancelacion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="consultas_bd",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="duracion_segundos",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="espera_segundos",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="filas_por_segundo",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="iniciado_en",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="tareaenproceso",
+            name="memoria_pico_kb",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="tareaenproceso",
+            index=models.Index(
+                fields=["finalizado_en", "origen"], name="tareas_fin_origen_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.23 on 2026-10-16 22:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tareas", "0006_tareaenproceso_metricas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TareaArchivada",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("nombre_proceso", models.CharField(max_length=100)),
+                ("origen", models.CharField(max_length=50)),
+                ("user_id", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "estado",
+                    models.CharField(
+                        choices=[
+                            ("pendiente", "Pendiente"),
+                            ("en_proceso", "En proceso"),
+                            ("completado", "Completado"),
+                            ("fallido", "Fallido"),
+                            ("cancelado", "Cancelado"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("progreso_actual", models.PositiveIntegerField(default=0)),
+                ("total_registros", models.PositiveIntegerField(default=0)),
+                ("resumen", models.JSONField(blank=True, default=dict)),
+                ("created", models.DateTimeField()),
+                ("iniciado_en", models.DateTimeField(blank=True, null=True)),
+                ("finalizado_en", models.DateTimeField(blank=True, null=True)),
+                ("archivado_en", models.DateTimeField(auto_now_add=True)),
+                ("espera_segundos", models.FloatField(blank=True, null=True)),
+                ("duracion_segundos", models.FloatField(blank=True, null=True)),
+                ("filas_por_segundo", models.FloatField(blank=True, null=True)),
+                ("consultas_bd", models.PositiveIntegerField(blank=True, null=True)),
+                ("memoria_pico_kb", models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Tarea archivada",
+                "verbose_name_plural": "Tareas archivadas",
+                "db_table": "tareas_archivadas",
+                "ordering": ["-created"],
+                "indexes": [
+                    models.Index(
+                        fields=["finalizado_en", "origen"],
+                        name="tareas_arch_fin_origen_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,7 +1,14 @@
-from django.db import models
+import time
+
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 from model_utils.models import TimeStampedModel
 
+from apps.common import counts
+from apps.tareas import cancellation, events
+from apps.tareas.cancellation import TareaCancelada
+
 
 class TareaEnProceso(TimeStampedModel):
     class Estado(models.TextChoices):
@@ -9,6 +16,7 @@ class TareaEnProceso(TimeStampedModel):
         EN_PROCESO = "en_proceso", "En proceso"
         COMPLETADO = "completado", "Completado"
         FALLIDO = "fallido", "Fallido"
+        CANCELADO = "cancelado", "Cancelado"
 
     celery_task_id = models.CharField(max_length=255, blank=True, default="")
     nombre_proceso = models.CharField(max_length=100)
@@ -30,9 +38,41 @@ class TareaEnProceso(TimeStampedModel):
 
     finalizado_en = models.DateTimeField(null=True, blank=True)
 
+    # Punto de reanudación de los procesos por lotes (importaciones): cuántas
+    # filas quedaron confirmadas y el hash del archivo al que se refieren.
+    checkpoint_filas = models.PositiveIntegerField(default=0)
+    checkpoint_hash = models.CharField(max_length=64, blank=True, default="")
+
+    # Latido del worker que la ejecuta (ver apps.tareas.heartbeat): el vivo
+    # está en Redis y aquí se vuelca cada tanto. tarea_celery es el nombre de
+    # la tarea Celery, para poder reencolarla.
+    worker = models.CharField(max_length=255, blank=True, default="")
+    latido_en = models.DateTimeField(null=True, blank=True)
+    tarea_celery = models.CharField(max_length=255, blank=True, default="")
+
+    # Cuándo pidió el usuario cancelarla (ver apps.tareas.cancellation). La
+    # marca viva está en Redis; esta es la que se consulta si Redis no está.
+    cancelacion_solicitada_en = models.DateTimeField(null=True, blank=True)
+
+    # Métricas de la última ejecución (ver apps.tareas.metrics): cuándo la
+    # tomó un worker, cuánto esperó en la cola desde created, cuánto corrió,
+    # a qué ritmo, cuántas consultas hizo y el pico de memoria del proceso.
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    espera_segundos = models.FloatField(null=True, blank=True)
+    duracion_segundos = models.FloatField(null=True, blank=True)
+    filas_por_segundo = models.FloatField(null=True, blank=True)
+    consultas_bd = models.PositiveIntegerField(null=True, blank=True)
+    memoria_pico_kb = models.PositiveIntegerField(null=True, blank=True)
+
     class Meta:
         db_table = "tareas_en_proceso"
         ordering = ["-created"]
+        indexes = [
+            # Agregados de métricas por período (TaskMetricsView).
+            models.Index(
+                fields=["finalizado_en", "origen"], name="tareas_fin_origen_idx"
+            ),
+        ]
         verbose_name = "Tarea en proceso"
         verbose_name_plural = "Tareas en proceso"
 
@@ -49,10 +89,20 @@ class TareaEnProceso(TimeStampedModel):
     def activa(self):
         return self.estado in (self.Estado.PENDIENTE, self.Estado.EN_PROCESO)
 
+    def publicar(self):
+        """Avisa al monitor el estado actual (ver apps.tareas.events).
+
+        Se publica al confirmarse la transacción en curso, si la hay: el
+        monitor no debe ver un avance que después se revierte.
+        """
+        evento = events.payload(self)
+        transaction.on_commit(lambda: events.publish(evento))
+
     def iniciar(self, total=0):
         self.estado = self.Estado.EN_PROCESO
         self.total_registros = total
         self.save(update_fields=["estado", "total_registros", "modified"])
+        self.publicar()
 
     def avanzar(self, procesados, **metadata):
         self.progreso_actual = procesados
@@ -61,6 +111,24 @@ class TareaEnProceso(TimeStampedModel):
             self.resultado_metadata = {**self.resultado_metadata, **metadata}
             campos.append("resultado_metadata")
         self.save(update_fields=campos)
+        self.publicar()
+
+    def registrar_checkpoint(self, filas, hash_contenido=None, **metadata):
+        """Anota cuántas filas del archivo quedaron confirmadas en la BD.
+
+        Debe llamarse dentro de la misma transacción que inserta esas filas:
+        así el checkpoint nunca adelanta ni atrasa a los datos, y una
+        reentrega de la tarea retoma justo donde quedó.
+        """
+        self.checkpoint_filas = filas
+        campos = ["checkpoint_filas", "modified"]
+        if hash_contenido is not None:
+            self.checkpoint_hash = hash_contenido
+            campos.append("checkpoint_hash")
+        if metadata:
+            self.resultado_metadata = {**self.resultado_metadata, **metadata}
+            campos.append("resultado_metadata")
+        self.save(update_fields=campos)
 
     def completar(self, **metadata):
         self.estado = self.Estado.COMPLETADO
@@ -76,6 +144,7 @@ class TareaEnProceso(TimeStampedModel):
                 "modified",
             ]
         )
+        self.publicar()
 
     def fallar(self, error, **metadata):
         self.estado = self.Estado.FALLIDO
@@ -94,3 +163,147 @@ class TareaEnProceso(TimeStampedModel):
                 "modified",
             ]
         )
+        self.publicar()
+
+    def solicitar_cancelacion(self):
+        """Pide al proceso que se detenga en el próximo lote.
+
+        Una tarea que ningún worker tomó todavía (PENDIENTE y sin iniciado_en)
+        se cancela en el acto, con un update condicional: si un worker la toma
+        en ese mismo momento, el update no la pisa. La marca de Redis no se
+        borra aquí: es la que ese worker consulta antes de procesar nada.
+
+        Returns:
+            bool: True si la tarea quedó cancelada en el acto; False si el
+                pedido queda para el proceso que la ejecuta.
+        """
+        self.cancelacion_solicitada_en = timezone.now()
+        self.save(update_fields=["cancelacion_solicitada_en", "modified"])
+        cancellation.request(self.pk)
+        ahora = timezone.now()
+        cancelada = TareaEnProceso.objects.filter(
+            pk=self.pk, estado=self.Estado.PENDIENTE, iniciado_en__isnull=True
+        ).update(
+            estado=self.Estado.CANCELADO,
+            resultado_metadata={
+                **self.resultado_metadata,
+                "mensaje": "Cancelado por el usuario antes de empezar.",
+                "detenida_en": 0,
+            },
+            finalizado_en=ahora,
+            modified=ahora,
+        )
+        self.refresh_from_db()
+        if cancelada:
+            # update() de queryset: sin señales que invaliden los totales.
+            counts.invalidate(TareaEnProceso)
+            self.publicar()
+        return bool(cancelada)
+
+    def comprobar_cancelacion(self):
+        """Lo llaman los procesos entre lotes.
+
+        Redis es la vía rápida, pero un "no" de Redis no alcanza: la marca
+        pudo perderse (un reinicio, un request() que falló) aunque el pedido
+        esté en cancelacion_solicitada_en. Por eso la BD se consulta también
+        cuando Redis responde que no, como mucho una vez cada
+        TASK_CANCEL_DB_CHECK_INTERVAL segundos (siempre en la primera
+        comprobación), y si tiene el pedido vuelve a dejar la marca en Redis.
+
+        Raises:
+            TareaCancelada: Si el usuario pidió cancelar la tarea.
+        """
+        solicitada = cancellation.is_requested(self.pk)
+        if not solicitada and self.__debe_revisar_bd(solicitada is None):
+            solicitada = TareaEnProceso.objects.filter(
+                pk=self.pk, cancelacion_solicitada_en__isnull=False
+            ).exists()
+            if solicitada:
+                cancellation.request(self.pk)
+        if solicitada:
+            raise TareaCancelada(f"Se canceló la tarea {self.pk}.")
+
+    def __debe_revisar_bd(self, sin_redis: bool) -> bool:
+        ahora = time.monotonic()
+        revisada_en = getattr(self, "_revision_cancelacion_en", None)
+        if (
+            not sin_redis
+            and revisada_en is not None
+            and ahora - revisada_en < settings.TASK_CANCEL_DB_CHECK_INTERVAL
+        ):
+            return False
+        self._revision_cancelacion_en = ahora
+        return True
+
+    def cancelar(self, mensaje=None, **metadata):
+        if mensaje is None:
+            if self.total_registros:
+                mensaje = (
+                    f"Cancelado por el usuario tras procesar {self.progreso_actual} "
+                    f"de {self.total_registros} registros."
+                )
+            else:
+                mensaje = "Cancelado por el usuario antes de empezar."
+        self.estado = self.Estado.CANCELADO
+        self.resultado_metadata = {
+            **self.resultado_metadata,
+            "mensaje": mensaje,
+            "detenida_en": self.progreso_actual,
+            **metadata,
+        }
+        self.finalizado_en = timezone.now()
+        self.save(
+            update_fields=[
+                "estado",
+                "progreso_actual",
+                "resultado_metadata",
+                "finalizado_en",
+                "modified",
+            ]
+        )
+        self.publicar()
+        cancellation.clear(self.pk)
+
+
+class TareaArchivada(models.Model):
+    """TareaEnProceso terminada que salió de la tabla viva (ver
+    apps.tareas.retention).
+
+    Guarda lo que sirve para consultar el historial y las métricas, sin
+    datos_entrada ni la lista de errores: resumen es el resultado_metadata
+    sin "errors". El id es el que tenía la tarea.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    nombre_proceso = models.CharField(max_length=100)
+    origen = models.CharField(max_length=50)
+    user_id = models.PositiveIntegerField(null=True, blank=True)
+    estado = models.CharField(max_length=20, choices=TareaEnProceso.Estado.choices)
+    progreso_actual = models.PositiveIntegerField(default=0)
+    total_registros = models.PositiveIntegerField(default=0)
+    resumen = models.JSONField(default=dict, blank=True)
+
+    created = models.DateTimeField()
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    finalizado_en = models.DateTimeField(null=True, blank=True)
+    archivado_en = models.DateTimeField(auto_now_add=True)
+
+    espera_segundos = models.FloatField(null=True, blank=True)
+    duracion_segundos = models.FloatField(null=True, blank=True)
+    filas_por_segundo = models.FloatField(null=True, blank=True)
+    consultas_bd = models.PositiveIntegerField(null=True, blank=True)
+    memoria_pico_kb = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = "tareas_archivadas"
+        ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["finalizado_en", "origen"], name="tareas_arch_fin_origen_idx"
+            ),
+        ]
+        verbose_name = "Tarea archivada"
+        verbose_name_plural = "Tareas archivadas"
+
+    def __str__(self):
+        return f"{self.nombre_proceso} · {self.get_estado_display()}"
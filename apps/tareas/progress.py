@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+
+from apps.tareas.models import TareaEnProceso
+
+
+class ThrottledProgress:
+    """Reporta el avance de una TareaEnProceso como mucho una vez por intervalo.
+
+    Cada avanzar() es un UPDATE; si se llama por lote, el seguimiento cuesta
+    tanto como los datos. Con esta clase el proceso informa su avance tan
+    seguido como quiera y solo se escribe si pasó TASK_PROGRESS_INTERVAL
+    segundos desde la última escritura. flush() deja el último valor.
+
+    Attributes:
+        task (TareaEnProceso): Tarea cuyo avance se reporta.
+        interval (float): Segundos mínimos entre dos escrituras.
+    """
+
+    def __init__(self, task: TareaEnProceso, interval: float | None = None):
+        self.task = task
+        self.interval = (
+            settings.TASK_PROGRESS_INTERVAL if interval is None else interval
+        )
+        self.__last_write: float | None = None
+        self.__pending: int | None = None
+
+    def update(self, procesados: int):
+        """Registra el avance; lo escribe si ya pasó el intervalo."""
+        now = time.monotonic()
+        if self.__last_write is not None and now - self.__last_write < self.interval:
+            self.__pending = procesados
+            return
+        self.task.avanzar(procesados)
+        self.__last_write = now
+        self.__pending = None
+
+    def flush(self):
+        """Escribe el último avance que quedó retenido por el intervalo."""
+        if self.__pending is not None:
+            self.task.avanzar(self.__pending)
+            self.__last_write = time.monotonic()
+            self.__pending = None
@@ -0,0 +1,22 @@
+"""Colas y prioridades de Celery.
+
+Cada tipo de trabajo tiene su cola, para que una importación gigante no
+demore un export chico ni el barrido periódico: los workers se levantan con
+-Q para consumir solo las suyas (ver docker-compose.yml). Las tareas eligen
+cola y prioridad con las opciones queue y priority de background_task /
+shared_task; lo que no elige cola va a POR_DEFECTO (CELERY_TASK_DEFAULT_QUEUE).
+
+Dentro de una misma cola manda la prioridad. En Redis 0 es la más alta: el
+transporte reparte cada cola en sub-listas por prioridad y siempre vacía
+primero las de número menor (CELERY_BROKER_TRANSPORT_OPTIONS).
+"""
+
+POR_DEFECTO = "default"
+IMPORTACIONES = "imports"
+EXPORTACIONES = "exports"
+REPORTES = "reports"
+PERIODICAS = "periodic"
+
+PRIORIDAD_ALTA = 0
+PRIORIDAD_NORMAL = 5  # = CELERY_TASK_DEFAULT_PRIORITY
+PRIORIDAD_BAJA = 9
@@ -0,0 +1,125 @@
+"""Barrido de tareas colgadas: EN_PROCESO sin latido o PENDIENTE que nunca empezó.
+
+Una tarea cuyo worker murió sin cerrarla miente en los contadores de
+/procesos/ y hace que el usuario vuelva a subir el archivo. reap_stuck_tasks()
+la reconcilia:
+
+- EN_PROCESO cuyo último latido (Redis, o latido_en si Redis no lo tiene) es
+  más viejo que TASK_HEARTBEAT_TIMEOUT: el worker murió.
+- PENDIENTE sin cambios hace más de TASK_PENDING_TIMEOUT: el mensaje se
+  perdió.
+
+Si la tarea Celery se declaró reanudable (background_task(reanudable=True)) y
+no agotó TASK_REAPER_MAX_REQUEUES, vuelve a PENDIENTE y se reencola; si no,
+queda FALLIDO con el motivo y el estado que informa Celery. La que tenía un
+pedido de cancelación sin atender queda CANCELADO: es lo que pidió el usuario.
+
+Lo corre Celery beat cada TASK_REAPER_INTERVAL segundos (tarea
+reap_stuck_tasks) o el comando del mismo nombre.
+"""
+
+import datetime
+
+from celery import current_app
+from celery.result import AsyncResult
+from django.conf import settings
+from django.utils import timezone
+
+from apps.common.imports.sources import delete_source
+from apps.tareas import heartbeat
+from apps.tareas.models import TareaEnProceso
+
+
+def _last_seen(tarea: TareaEnProceso) -> datetime.datetime:
+    seen = [tarea.modified, tarea.latido_en, heartbeat.last_seen(tarea.pk)]
+    return max(value for value in seen if value is not None)
+
+
+def _celery_state(tarea: TareaEnProceso) -> str:
+    if not tarea.celery_task_id:
+        return "sin id"
+    try:
+        return AsyncResult(tarea.celery_task_id).state
+    except Exception:
+        return "desconocido"
+
+
+def _get_resumable_task(tarea: TareaEnProceso):
+    """La tarea Celery con la que reencolar, o None si no es reanudable."""
+    if not tarea.tarea_celery:
+        return None
+    current_app.loader.import_default_modules()
+    task = current_app.tasks.get(tarea.tarea_celery)
+    if task is None or not getattr(task, "reanudable", False):
+        return None
+    return task
+
+
+def _requeue(tarea: TareaEnProceso, task, motivo: str) -> bool:
+    reencolada = tarea.resultado_metadata.get("reencolada", 0)
+    if reencolada >= settings.TASK_REAPER_MAX_REQUEUES:
+        return False
+    tarea.estado = TareaEnProceso.Estado.PENDIENTE
+    tarea.resultado_metadata = {
+        **tarea.resultado_metadata,
+        "reencolada": reencolada + 1,
+        "motivo_reencolado": motivo,
+    }
+    tarea.celery_task_id = task.apply_async(args=(tarea.pk,)).id
+    tarea.save(
+        update_fields=["estado", "resultado_metadata", "celery_task_id", "modified"]
+    )
+    tarea.publicar()
+    return True
+
+
+def _reap(tarea: TareaEnProceso, motivo: str) -> str:
+    if tarea.cancelacion_solicitada_en:
+        tarea.cancelar()
+        delete_source(tarea.datos_entrada)
+        return "canceladas"
+    motivo = f"{motivo} Estado en Celery: {_celery_state(tarea)}."
+    task = _get_resumable_task(tarea)
+    if task is not None and _requeue(tarea, task, motivo):
+        return "reencoladas"
+    tarea.fallar(motivo)
+    delete_source(tarea.datos_entrada)
+    return "fallidas"
+
+
+def reap_stuck_tasks(now: datetime.datetime | None = None) -> dict:
+    """Marca o reencola las tareas colgadas.
+
+    Args:
+        now (datetime, optional): Momento de referencia; por defecto ahora.
+
+    Returns:
+        dict: {"fallidas": int, "reencoladas": int, "canceladas": int}.
+    """
+    now = now or timezone.now()
+    summary = {"fallidas": 0, "reencoladas": 0, "canceladas": 0}
+
+    stale_before = now - datetime.timedelta(seconds=settings.TASK_HEARTBEAT_TIMEOUT)
+    running = TareaEnProceso.objects.filter(
+        estado=TareaEnProceso.Estado.EN_PROCESO, modified__lt=stale_before
+    )
+    for tarea in running:
+        last_seen = _last_seen(tarea)
+        if last_seen >= stale_before:
+            continue
+        worker = f" en {tarea.worker}" if tarea.worker else ""
+        motivo = (
+            f"El proceso dejó de responder{worker}: último latido el "
+            f"{timezone.localtime(last_seen):%d-%m-%Y %H:%M:%S}."
+        )
+        summary[_reap(tarea, motivo)] += 1
+
+    never_started = TareaEnProceso.objects.filter(
+        estado=TareaEnProceso.Estado.PENDIENTE,
+        modified__lt=now - datetime.timedelta(seconds=settings.TASK_PENDING_TIMEOUT),
+    )
+    for tarea in never_started:
+        motivo = "El proceso nunca empezó: se perdió en la cola."
+        summary[_reap(tarea, motivo)] += 1
+
+    return summary
@@ -0,0 +1,43 @@
+"""Clientes Redis compartidos por los eventos, latidos, cupos y cancelaciones.
+
+Hay dos, porque no toleran el mismo timeout: lo que llaman las tareas en el
+worker (publicar un evento, latir, tomar un cupo, consultar la cancelación)
+debe fallar rápido si Redis se cuelga, y solo el long poll del monitor
+(events.read) necesita un socket que espere lo que bloquea XREAD.
+"""
+
+import redis
+from django.conf import settings
+
+# Segundos que espera una operación del worker antes de darse por fallida.
+SOCKET_TIMEOUT = 2
+
+_client = None
+_blocking_client = None
+
+
+def get_client() -> redis.Redis:
+    """Cliente de timeout corto, para las operaciones del worker."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=SOCKET_TIMEOUT,
+        )
+    return _client
+
+
+def get_blocking_client() -> redis.Redis:
+    """Cliente para el long poll de eventos (XREAD con BLOCK)."""
+    global _blocking_client
+    if _blocking_client is None:
+        _blocking_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            # Más que el bloqueo de XREAD, para no cortar un long poll.
+            socket_timeout=settings.TASK_EVENTS_TIMEOUT + 5,
+        )
+    return _blocking_client
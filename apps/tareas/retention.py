@@ -0,0 +1,159 @@
+"""Retención del historial de tareas: la tabla viva guarda solo lo reciente.
+
+tareas_en_proceso conservaba para siempre cada tarea, con su datos_entrada y
+hasta 200 errores en resultado_metadata, y el monitor /procesos/ la recorre
+entera para las tarjetas de totales. apply_retention() la mantiene acotada,
+siempre sobre tareas terminadas (completadas, fallidas o canceladas):
+
+- purge_expired_exports(): borra los archivos de export que vencieron
+  (EXPORT_RETENTION_HOURS); la tarea sigue, sin el enlace de descarga.
+- strip_payloads(): a los TASK_PAYLOAD_RETENTION_DAYS días de terminar vacía
+  datos_entrada y borra del storage el archivo de origen, si quedó. La tarea
+  sigue en /procesos/ con su resultado.
+- archive_finished(): a los TASK_ARCHIVE_AFTER_DAYS días la copia a
+  TareaArchivada (sin datos_entrada ni la lista de errores) y la borra de la
+  tabla viva. Un export todavía descargable espera a que el primer paso le
+  quite el archivo.
+
+Los dos últimos avanzan por lotes de TASK_RETENTION_BATCH_SIZE tareas; cada lote de
+archivo se copia y se borra en la misma transacción. Lo corre Celery beat
+cada TASK_RETENTION_INTERVAL segundos (tarea apply_task_retention) o el
+comando purge_task_history.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.exports.async_export import purge_expired_exports
+from apps.common.imports.sources import delete_source
+from apps.tareas.models import TareaArchivada, TareaEnProceso
+
+FINISHED = (
+    TareaEnProceso.Estado.COMPLETADO,
+    TareaEnProceso.Estado.FALLIDO,
+    TareaEnProceso.Estado.CANCELADO,
+)
+
+
+def _finished_before(days: int, now: datetime.datetime):
+    return TareaEnProceso.objects.filter(
+        estado__in=FINISHED,
+        finalizado_en__lt=now - datetime.timedelta(days=days),
+    )
+
+
+def _batches(queryset):
+    """pks de queryset en lotes, por pk creciente (keyset, sin OFFSET)."""
+    last = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=last)
+            .order_by("pk")
+            .values_list("pk", flat=True)[: settings.TASK_RETENTION_BATCH_SIZE]
+        )
+        if not pks:
+            return
+        yield pks
+        last = pks[-1]
+
+
+def _archived(tarea: TareaEnProceso) -> TareaArchivada:
+    resumen = {
+        key: value for key, value in tarea.resultado_metadata.items() if key != "errors"
+    }
+    return TareaArchivada(
+        id=tarea.pk,
+        nombre_proceso=tarea.nombre_proceso,
+        origen=tarea.origen,
+        user_id=tarea.user_id,
+        estado=tarea.estado,
+        progreso_actual=tarea.progreso_actual,
+        total_registros=tarea.total_registros,
+        resumen=resumen,
+        created=tarea.created,
+        iniciado_en=tarea.iniciado_en,
+        finalizado_en=tarea.finalizado_en,
+        espera_segundos=tarea.espera_segundos,
+        duracion_segundos=tarea.duracion_segundos,
+        filas_por_segundo=tarea.filas_por_segundo,
+        consultas_bd=tarea.consultas_bd,
+        memoria_pico_kb=tarea.memoria_pico_kb,
+    )
+
+
+def strip_payloads(now: datetime.datetime | None = None) -> int:
+    """Vacía datos_entrada de las tareas terminadas hace más de
+    TASK_PAYLOAD_RETENTION_DAYS días.
+
+    Args:
+        now (datetime, optional): Momento de referencia; por defecto ahora.
+
+    Returns:
+        int: Cantidad de tareas vaciadas.
+    """
+    expired = _finished_before(
+        settings.TASK_PAYLOAD_RETENTION_DAYS, now or timezone.now()
+    ).exclude(datos_entrada={})
+    stripped = 0
+    for pks in _batches(expired):
+        batch = TareaEnProceso.objects.filter(pk__in=pks)
+        sources = batch.filter(datos_entrada__has_key="archivo")
+        for datos_entrada in sources.values_list("datos_entrada", flat=True):
+            delete_source(datos_entrada)
+        # update() de queryset: no toca modified, que sigue siendo el del fin.
+        stripped += batch.update(datos_entrada={})
+    return stripped
+
+
+def archive_finished(now: datetime.datetime | None = None) -> int:
+    """Pasa a TareaArchivada las tareas terminadas hace más de
+    TASK_ARCHIVE_AFTER_DAYS días.
+
+    Args:
+        now (datetime, optional): Momento de referencia; por defecto ahora.
+
+    Returns:
+        int: Cantidad de tareas archivadas.
+    """
+    expired = _finished_before(
+        settings.TASK_ARCHIVE_AFTER_DAYS, now or timezone.now()
+    ).exclude(resultado_metadata__has_key="archivo")
+    archived = 0
+    for pks in _batches(expired):
+        with transaction.atomic():
+            tareas = list(TareaEnProceso.objects.filter(pk__in=pks))
+            # ignore_conflicts: si se cruzan dos barridos (beat y el comando),
+            # el segundo no falla por las tareas que ya copió el primero.
+            TareaArchivada.objects.bulk_create(
+                [_archived(tarea) for tarea in tareas], ignore_conflicts=True
+            )
+            # Las señales de delete invalidan los conteos del monitor.
+            TareaEnProceso.objects.filter(pk__in=pks).delete()
+        for tarea in tareas:
+            delete_source(tarea.datos_entrada)
+        archived += len(tareas)
+    return archived
+
+
+def apply_retention(now: datetime.datetime | None = None) -> dict:
+    """Borra los exports vencidos, vacía los datos de entrada vencidos y
+    archiva las tareas viejas.
+
+    Los exports van primero: así un export que vence en esta pasada ya puede
+    archivarse en la misma.
+
+    Args:
+        now (datetime, optional): Momento de referencia; por defecto ahora.
+
+    Returns:
+        dict: {"exports": int, "vaciadas": int, "archivadas": int}.
+    """
+    now = now or timezone.now()
+    return {
+        "exports": purge_expired_exports(now),
+        "vaciadas": strip_payloads(now),
+        "archivadas": archive_finished(now),
+    }
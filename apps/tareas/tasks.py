@@ -0,0 +1,46 @@
+from celery import shared_task
+from django.conf import settings
+
+from apps.common.exports.async_export import AsyncExcelExporter
+from apps.tareas import queues, retention
+from apps.tareas.decorators import background_task
+from apps.tareas.reaper import reap_stuck_tasks as reap
+
+
+@background_task(
+    queue=queues.EXPORTACIONES,
+    limite_por_origen=settings.EXPORT_CONCURRENCY_PER_ORIGIN,
+)
+def export_excel(tarea, user):
+    """Genera el .xlsx de un export pedido desde una lista.
+
+    La encola ExcelExportMixin cuando el export va en segundo plano. Solo
+    conecta la tarea con su exportador: toda la lógica vive en
+    AsyncExcelExporter.
+
+    Args:
+        tarea (TareaEnProceso): Fila de seguimiento, la inyecta el decorador
+            a partir del id que viaja por Redis.
+        user: Usuario que pidió el export, lo inyecta el decorador.
+    """
+    AsyncExcelExporter(user=user, task=tarea).run()
+
+
+@shared_task(queue=queues.PERIODICAS, priority=queues.PRIORIDAD_ALTA)
+def reap_stuck_tasks():
+    """Barrido periódico de tareas colgadas (ver apps.tareas.reaper).
+
+    No es un background_task: no tiene fila de seguimiento propia. La
+    programa CELERY_BEAT_SCHEDULE.
+    """
+    return reap()
+
+
+@shared_task(queue=queues.PERIODICAS, priority=queues.PRIORIDAD_BAJA)
+def apply_task_retention():
+    """Retención periódica del historial de tareas (ver apps.tareas.retention).
+
+    Como reap_stuck_tasks, no tiene fila de seguimiento propia. La programa
+    CELERY_BEAT_SCHEDULE.
+    """
+    return retention.apply_retention()
@@ -1,5 +1,13 @@
 from django.urls import path
-from apps.tareas.views import TaskDetailModalView, TaskListView, TaskView
+from apps.tareas.views import (
+    TaskCancelModalView,
+    TaskDetailModalView,
+    TaskDownloadView,
+    TaskEventsView,
+    TaskListView,
+    TaskMetricsView,
+    TaskView,
+)
 
 urlpatterns = [
     path(
@@ -12,9 +20,29 @@ urlpatterns = [
         TaskListView.as_view(),
         name="task_list",
     ),
+    path(
+        "procesos/eventos/",
+        TaskEventsView.as_view(),
+        name="task_events",
+    ),
+    path(
+        "procesos/metricas/",
+        TaskMetricsView.as_view(),
+        name="task_metrics",
+    ),
     path(
         "procesos/<int:pk>/detalle/",
         TaskDetailModalView.as_view(),
         name="task_detail_modal",
     ),
+    path(
+        "procesos/<int:pk>/cancelar/",
+        TaskCancelModalView.as_view(),
+        name="task_cancel_modal",
+    ),
+    path(
+        "procesos/<int:pk>/descargar/",
+        TaskDownloadView.as_view(),
+        name="task_download",
+    ),
 ]
@@ -1,16 +1,27 @@
+import datetime
 from typing import Optional
 
 from bootstrap_modal_forms.forms import BSModalForm
 from bootstrap_modal_forms.generic import BSModalReadView
 from django import forms
-from django.db.models import Count, Q, TextChoices
+from django.core.files.storage import default_storage
+from django.db.models import Count, TextChoices
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
+from rest_framework.status import HTTP_400_BAD_REQUEST
 
+from apps.common import counts
 from apps.common.base_list_view_ajax import BaseListViewAjax
 from apps.common.form_classes import FORM_SELECT_CLASS
+from apps.common.imports.sources import delete_source
+from apps.common.utils.dates import format_duration
+from apps.common.utils.urls import row_url
 from apps.common.views.base_views import ProtectedView
+from apps.tareas import events, metrics
 from apps.tareas.models import TareaEnProceso
 
 """========================================================================="""
@@ -24,6 +35,7 @@ class TasksFilterForm(BSModalForm):
         EN_PROCESO = TareaEnProceso.Estado.EN_PROCESO, "En proceso"
         COMPLETADO = TareaEnProceso.Estado.COMPLETADO, "Completados"
         FALLIDO = TareaEnProceso.Estado.FALLIDO, "Fallidos"
+        CANCELADO = TareaEnProceso.Estado.CANCELADO, "Cancelados"
 
     status = forms.ChoiceField(
         choices=StatusChoices.choices,
@@ -47,6 +59,41 @@ class TasksFilterForm(BSModalForm):
         return data_to_filter
 
 
+class TaskMetricsFilterForm(forms.Form):
+    class DaysChoices(TextChoices):
+        WEEK = "7", "Últimos 7 días"
+        MONTH = "30", "Últimos 30 días"
+        QUARTER = "90", "Últimos 90 días"
+
+    class BucketChoices(TextChoices):
+        DAY = "day", "Por día"
+        WEEK = "week", "Por semana"
+        MONTH = "month", "Por mes"
+
+    dias = forms.ChoiceField(
+        choices=DaysChoices.choices,
+        label="Período",
+        initial=DaysChoices.MONTH,
+        required=False,
+        widget=forms.Select(attrs={"class": FORM_SELECT_CLASS}),
+    )
+    agrupar = forms.ChoiceField(
+        choices=BucketChoices.choices,
+        label="Agrupar",
+        initial=BucketChoices.WEEK,
+        required=False,
+        widget=forms.Select(attrs={"class": FORM_SELECT_CLASS}),
+    )
+
+    def get_filters(self) -> tuple:
+        """(días, agrupación) elegidos, o los iniciales si no son válidos."""
+        if not self.is_valid():
+            return int(self.DaysChoices.MONTH), self.BucketChoices.WEEK
+        dias = self.cleaned_data.get("dias") or self.DaysChoices.MONTH
+        agrupar = self.cleaned_data.get("agrupar") or self.BucketChoices.WEEK
+        return int(dias), agrupar
+
+
 # endregion
 """========================================================================="""
 
@@ -63,6 +110,8 @@ class TaskView(ProtectedView, TemplateView):
             {
                 "filter_form": TasksFilterForm(),
                 "url_task_list": reverse_lazy("task_list"),
+                "url_task_events": reverse_lazy("task_events"),
+                "url_task_metrics": reverse_lazy("task_metrics"),
             }
         )
         return context
@@ -72,6 +121,7 @@ class TaskListView(BaseListViewAjax):
     model = TareaEnProceso
     include_options_column = False
     filter_form_class = TasksFilterForm
+    keyset_pagination = True
 
     field_list = [
         "pk",
@@ -81,6 +131,12 @@ class TaskListView(BaseListViewAjax):
         "progreso_actual",
         "total_registros",
         "finalizado_en",
+        "resultado_metadata__archivo",
+        "resultado_metadata__dry_run",
+    ]
+
+    search_fields = [
+        "nombre_proceso",
     ]
 
     ordering_fields = {
@@ -99,10 +155,25 @@ class TaskListView(BaseListViewAjax):
         # created/finalizado_en se guardan en UTC (USE_TZ); se muestran en hora local
         return timezone.localtime(value).strftime("%d-%m-%Y %H:%M:%S")
 
-    def _get_task_detail_url(self, task_id: int, status: str) -> Optional[str]:
-        if status not in {self.model.Estado.FALLIDO}:
+    def _get_task_detail_url(
+        self, task_id: int, status: str, dry_run: bool = False
+    ) -> Optional[str]:
+        # Las validaciones de prueba terminadas también tienen diagnóstico.
+        if status not in {self.model.Estado.FALLIDO} and not dry_run:
+            return None
+        return row_url("task_detail_modal", task_id)
+
+    def _get_cancel_url(self, task_id: int, status: str) -> Optional[str]:
+        if status not in {self.model.Estado.PENDIENTE, self.model.Estado.EN_PROCESO}:
+            return None
+        return row_url("task_cancel_modal", task_id)
+
+    @staticmethod
+    def _get_download_url(task_id: int, archivo: Optional[str]) -> Optional[str]:
+        # Solo los exports terminados y no vencidos tienen "archivo".
+        if not archivo:
             return None
-        return reverse_lazy("task_detail_modal", kwargs={"pk": task_id})
+        return row_url("task_download", task_id)
 
     def get_values(self, queryset):
         values = super().get_values(queryset)
@@ -122,25 +193,117 @@ class TaskListView(BaseListViewAjax):
                     "task_detail_url": self._get_task_detail_url(
                         task_id=task_id,
                         status=_status,
+                        dry_run=bool(item.pop("resultado_metadata__dry_run", False)),
                     ),
+                    "download_url": self._get_download_url(
+                        task_id=task_id,
+                        archivo=item.pop("resultado_metadata__archivo", None),
+                    ),
+                    "cancel_url": self._get_cancel_url(task_id=task_id, status=_status),
                 }
             )
         return values
 
+    # Clave de cada tarjeta de totales del monitor.
+    totals_keys = {
+        TareaEnProceso.Estado.PENDIENTE: "pending_totals",
+        TareaEnProceso.Estado.EN_PROCESO: "process_totals",
+        TareaEnProceso.Estado.COMPLETADO: "complete_totals",
+        TareaEnProceso.Estado.FALLIDO: "failed_totals",
+        TareaEnProceso.Estado.CANCELADO: "cancelled_totals",
+    }
+
+    @classmethod
+    def _get_estado_totals(cls) -> dict:
+        # Un GROUP BY sobre el índice de estado, en una tabla viva que la
+        # retención mantiene chica (ver apps.tareas.retention).
+        totals = dict(
+            TareaEnProceso.objects.order_by()
+            .values_list("estado")
+            .annotate(total=Count("pk"))
+        )
+        return {key: totals.get(estado, 0) for estado, key in cls.totals_keys.items()}
+
+    @classmethod
+    def additional_data(cls, queryset) -> dict:
+        # Totales de toda la tabla: se cachean hasta la próxima escritura.
+        return counts.remember(
+            [TareaEnProceso], "estado_totals", cls._get_estado_totals
+        )
+
+
+class TaskMetricsView(ProtectedView, TemplateView):
+    """p50/p95 de las métricas de ejecución por origen y período.
+
+    Separa la espera en la cola de la ejecución: si una importación tarda,
+    muestra si faltan workers (espera alta) o si el proceso es lento
+    (duración alta, pocas filas por segundo).
+    """
+
+    template_name = "tareas/metrics.html"
+
     @staticmethod
-    def additional_data(queryset) -> dict:
-        return TareaEnProceso.objects.aggregate(
-            pending_totals=Count(
-                "pk", filter=Q(estado=TareaEnProceso.Estado.PENDIENTE)
-            ),
-            process_totals=Count(
-                "pk", filter=Q(estado=TareaEnProceso.Estado.EN_PROCESO)
-            ),
-            complete_totals=Count(
-                "pk", filter=Q(estado=TareaEnProceso.Estado.COMPLETADO)
-            ),
-            failed_totals=Count("pk", filter=Q(estado=TareaEnProceso.Estado.FALLIDO)),
+    def _format_seconds(value) -> str:
+        if value is None:
+            return "--"
+        if value < 60:
+            return f"{value:.1f} s"
+        return format_duration(value)
+
+    @staticmethod
+    def _format_number(value) -> str:
+        return "--" if value is None else f"{round(value):,}".replace(",", ".")
+
+    @staticmethod
+    def _format_memory(value) -> str:
+        return "--" if value is None else f"{value / 1024:.0f} MB"
+
+    def _format_period(self, value, bucket: str) -> str:
+        value = timezone.localtime(value)
+        if bucket == TaskMetricsFilterForm.BucketChoices.MONTH:
+            return value.strftime("%m-%Y")
+        if bucket == TaskMetricsFilterForm.BucketChoices.WEEK:
+            return f"Semana del {value:%d-%m-%Y}"
+        return value.strftime("%d-%m-%Y")
+
+    def _format_row(self, item: dict, bucket: str) -> dict:
+        formatters = {
+            "espera_segundos": self._format_seconds,
+            "duracion_segundos": self._format_seconds,
+            "filas_por_segundo": self._format_number,
+            "consultas_bd": self._format_number,
+            "memoria_pico_kb": self._format_memory,
+        }
+        row = {
+            "origen": item["origen"],
+            "periodo": self._format_period(item["periodo"], bucket),
+            "tareas": item["tareas"],
+            "fallidas": item["fallidas"],
+            "canceladas": item["canceladas"],
+        }
+        for field, formatter in formatters.items():
+            row[field] = (
+                f"{formatter(item[f'{field}_p50'])} / "
+                f"{formatter(item[f'{field}_p95'])}"
+            )
+        return row
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        filter_form = TaskMetricsFilterForm(self.request.GET or None)
+        dias, agrupar = filter_form.get_filters()
+        since = timezone.now() - datetime.timedelta(days=dias)
+        context.update(
+            {
+                "filter_form": filter_form,
+                "rows": [
+                    self._format_row(item, agrupar)
+                    for item in metrics.summary_by_origin(since, agrupar)
+                ],
+                "back_url": reverse_lazy("tasks"),
+            }
         )
+        return context
 
 
 class TaskDetailModalView(ProtectedView, BSModalReadView):
@@ -154,6 +317,14 @@ class TaskDetailModalView(ProtectedView, BSModalReadView):
             "total_errors": result.get("total_errors", 0),
             "rows_error": result.get("rows_error", 0),
             "rows_ok": result.get("rows_ok", 0),
+            "created": result.get("created"),
+            "updated": result.get("updated"),
+            "unchanged": result.get("unchanged"),
+            "dry_run": result.get("dry_run", False),
+            "rows_total": result.get("rows_total", 0),
+            "rows_per_second": result.get("rows_per_second", 0),
+            "projected_display": result.get("projected_display", ""),
+            "mensaje": result.get("mensaje", ""),
         }
 
     @staticmethod
@@ -181,5 +352,82 @@ class TaskDetailModalView(ProtectedView, BSModalReadView):
         return context
 
 
+class TaskCancelModalView(ProtectedView, BSModalReadView):
+    """Confirma y pide la cancelación de un proceso pendiente o en curso.
+
+    Una tarea pendiente queda CANCELADO en el acto; una en curso se detiene
+    en el próximo lote (ver apps.tareas.cancellation) y el monitor se entera
+    por el stream de eventos.
+    """
+
+    template_name = "tareas/_task_cancel_modal.html"
+    model = TareaEnProceso
+    context_object_name = "task"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        task: TareaEnProceso = self.object
+        context.update(
+            {
+                "modal_url": reverse_lazy("task_cancel_modal", kwargs={"pk": task.pk}),
+                "estado_display": task.get_estado_display(),
+                "created_display": TaskListView._format_datetime(task.created),
+            }
+        )
+        return context
+
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        if not self.object.activa:
+            message = "Solo se pueden cancelar los procesos pendientes o en proceso."
+            return JsonResponse({"message": message}, status=HTTP_400_BAD_REQUEST)
+        if self.object.solicitar_cancelacion():
+            # Ningún worker la tomó: nadie más va a borrar el archivo subido.
+            delete_source(self.object.datos_entrada)
+            message = f"El proceso «{self.object.nombre_proceso}» fue cancelado."
+        else:
+            message = (
+                f"Se pidió cancelar «{self.object.nombre_proceso}»: se detendrá "
+                "al terminar el lote en curso."
+            )
+        return JsonResponse({"message": message}, status=200)
+
+
+class TaskEventsView(ProtectedView, View):
+    """Long poll de eventos de avance para el monitor /procesos/.
+
+    Espera hasta TASK_EVENTS_TIMEOUT segundos eventos posteriores a "desde"
+    (el cursor que devolvió la petición anterior) y responde
+    {"cursor", "eventos"}. Con "disponible": false el monitor deja de
+    escuchar: Redis no responde.
+    """
+
+    def get(self, request, *args, **kwargs):
+        cursor = request.GET.get("desde") or events.LATEST
+        result = events.read(cursor, timeout=settings.TASK_EVENTS_TIMEOUT)
+        if result is None:
+            return JsonResponse({"cursor": cursor, "eventos": [], "disponible": False})
+        cursor, eventos = result
+        return JsonResponse({"cursor": cursor, "eventos": eventos, "disponible": True})
+
+
+class TaskDownloadView(ProtectedView, View):
+    """Descarga el archivo generado por un export en segundo plano."""
+
+    def get(self, request, *args, **kwargs):
+        task = get_object_or_404(
+            TareaEnProceso, pk=kwargs["pk"], estado=TareaEnProceso.Estado.COMPLETADO
+        )
+        metadata: dict = task.resultado_metadata or {}
+        path = metadata.get("archivo")
+        if not path or not default_storage.exists(path):
+            raise Http404("El archivo ya no está disponible.")
+        return FileResponse(
+            default_storage.open(path, "rb"),
+            as_attachment=True,
+            filename=metadata.get("nombre_archivo") or path.rsplit("/", 1)[-1],
+        )
+
+
 # endregion
 """========================================================================="""
@@ -0,0 +1,78 @@
+"""
+Comando para ver cuánto está rindiendo la caché de gráficos del dashboard:
+aciertos, fallos y tasa de acierto por gráfico y por meses cerrados
+memoizados de cada familia, más la versión actual de cada dominio (ver
+dashboard.services.cache).
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard.services import cache, metrics, rollups
+
+
+def _cached_metrics():
+    """Nombres de las métricas públicas que pasan por la caché."""
+    return sorted(
+        name
+        for name, value in vars(metrics).items()
+        if callable(value) and hasattr(value, "cache_domains")
+    )
+
+
+class Command(BaseCommand):
+    help = "Muestra aciertos/fallos de la caché de gráficos del dashboard"
+
+    def add_arguments(self, parser):
+        """Agregar argumentos del comando."""
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Poner los contadores en cero después de mostrarlos.",
+        )
+
+    def handle(self, *args, **options):
+        """Mostrar los contadores."""
+        names = _cached_metrics()
+        total_hits = total_misses = 0
+        for name, counts in cache.stats(names).items():
+            hits, misses = counts[cache.HIT], counts[cache.MISS]
+            total_hits += hits
+            total_misses += misses
+            self.stdout.write(
+                f"  {name:<28} {hits:>8} hit  {misses:>8} miss  "
+                f"{_ratio(hits, misses)}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Total: {total_hits} hit / {total_misses} miss "
+                f"({_ratio(total_hits, total_misses)})"
+            )
+        )
+
+        domains = sorted(
+            {
+                domain
+                for name in names
+                for domain in getattr(metrics, name).cache_domains
+            }
+        )
+        for domain, version in zip(domains, cache.versions(domains)):
+            self.stdout.write(f"  versión {domain}: {version}")
+
+        month_names = [f"meses_{family}" for family in sorted(rollups.FAMILIES)]
+        for name, counts in cache.stats(month_names).items():
+            hits, misses = counts[cache.HIT], counts[cache.MISS]
+            self.stdout.write(
+                f"  {name:<28} {hits:>8} hit  {misses:>8} miss  "
+                f"{_ratio(hits, misses)}"
+            )
+
+        if options["reset"]:
+            cache.reset_stats(names + month_names)
+            self.stdout.write("✓ Contadores reiniciados")
+
+
+def _ratio(hits, misses):
+    total = hits + misses
+    return f"{hits / total:.0%}" if total else "-"
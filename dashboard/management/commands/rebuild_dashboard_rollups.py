@@ -0,0 +1,41 @@
+"""
+Comando para reconstruir desde cero los rollups mensuales del dashboard
+(citas, facturado, cobrado y servicios por mes).
+
+Las escrituras normales los mantienen al día solas (dashboard.signals); este
+comando es para la carga inicial, tras una importación masiva que no dispare
+señales o si se sospecha que quedaron desalineados.
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard.services import rollups
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los rollups mensuales del dashboard desde las tablas de origen"
+
+    def add_arguments(self, parser):
+        """Agregar argumentos del comando."""
+        parser.add_argument(
+            "--family",
+            choices=sorted(rollups.FAMILIES),
+            help="Reconstruir solo una familia de rollups.",
+        )
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="No hacer nada si los rollups ya tienen datos (útil al desplegar).",
+        )
+
+    def handle(self, *args, **options):
+        """Reconstruir los rollups."""
+        if options["if_empty"] and not rollups.is_empty():
+            self.stdout.write("Rollups del dashboard ya poblados: nada que hacer.")
+            return
+
+        families = [options["family"]] if options["family"] else list(rollups.FAMILIES)
+        for family in families:
+            created = rollups.rebuild(family)
+            self.stdout.write(f"✓ {family}: {created} fila(s)")
+        self.stdout.write(self.style.SUCCESS("Rollups del dashboard reconstruidos."))
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.23 on 2026-10-16 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('services', '0002_categoria_historicalcategoria_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenCitasMes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField()),
+                ('estado', models.CharField(max_length=20)),
+                ('cliente_id', models.PositiveBigIntegerField()),
+                ('total', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen de citas por mes',
+                'verbose_name_plural': 'Resúmenes de citas por mes',
+                'db_table': 'resumen_citas_mes',
+                'indexes': [models.Index(fields=['mes', 'estado'], name='resumen_cit_mes_3fb945_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenCobradoMes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField()),
+                ('metodo_pago', models.CharField(max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Resumen de cobrado por mes',
+                'verbose_name_plural': 'Resúmenes de cobrado por mes',
+                'db_table': 'resumen_cobrado_mes',
+                'indexes': [models.Index(fields=['mes', 'metodo_pago'], name='resumen_cob_mes_d05ee3_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenFacturadoMes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(db_index=True)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Resumen de facturado por mes',
+                'verbose_name_plural': 'Resúmenes de facturado por mes',
+                'db_table': 'resumen_facturado_mes',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenServiciosMes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(db_index=True)),
+                ('nombre_servicio', models.CharField(max_length=200)),
+                ('cantidad', models.PositiveIntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=0, default=0, max_digits=14)),
+                ('servicio', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='services.servicio')),
+            ],
+            options={
+                'verbose_name': 'Resumen de servicios por mes',
+                'verbose_name_plural': 'Resúmenes de servicios por mes',
+                'db_table': 'resumen_servicios_mes',
+            },
+        ),
+    ]
@@ -1,3 +1,83 @@
 from django.db import models
 
-# Create your models here.
+# Rollups mensuales del dashboard. Son tablas DERIVADAS: se recalculan por mes
+# desde las tablas de origen (ver dashboard.services.rollups) y se pueden
+# reconstruir completas con `python manage.py rebuild_dashboard_rollups`.
+#
+# Las lecturas suman (Sum) por la dimensión que les interesa, así que una
+# fila duplicada duplicaría el total: los recálculos de un mismo mes se
+# serializan con un advisory lock (ver dashboard.services.rollups._lock).
+#
+# `mes` es siempre el primer día del mes en hora local (igual que TruncMonth
+# con USE_TZ), para que coincida 1:1 con las keys de un Period.
+
+
+class ResumenCitasMes(models.Model):
+    """Citas por (mes, estado, cliente). Alimenta "Clientes atendidos" (que
+    necesita clientes únicos, por eso el cliente es parte de la clave) y
+    "Estado de citas"."""
+
+    mes = models.DateField()
+    estado = models.CharField(max_length=20)
+    # Id suelto, no ForeignKey: la fila es un agregado y borrar un cliente ya
+    # borra sus citas (CASCADE), lo que dispara el recálculo del mes.
+    cliente_id = models.PositiveBigIntegerField()
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "resumen_citas_mes"
+        verbose_name = "Resumen de citas por mes"
+        verbose_name_plural = "Resúmenes de citas por mes"
+        indexes = [models.Index(fields=["mes", "estado"])]
+
+
+class ResumenFacturadoMes(models.Model):
+    """Facturado por mes: Pago.monto_total_cita agrupado por mes de fecha_cita."""
+
+    mes = models.DateField(db_index=True)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "resumen_facturado_mes"
+        verbose_name = "Resumen de facturado por mes"
+        verbose_name_plural = "Resúmenes de facturado por mes"
+
+
+class ResumenCobradoMes(models.Model):
+    """Cobrado por (mes, método de pago): DetallePago.monto_pago de pagos no
+    eliminados. Alimenta "Ingresos" (cobrado) y "Métodos de pago"."""
+
+    mes = models.DateField()
+    metodo_pago = models.CharField(max_length=20)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "resumen_cobrado_mes"
+        verbose_name = "Resumen de cobrado por mes"
+        verbose_name_plural = "Resúmenes de cobrado por mes"
+        indexes = [models.Index(fields=["mes", "metodo_pago"])]
+
+
+class ResumenServiciosMes(models.Model):
+    """Servicios agendados por (mes, servicio, nombre snapshot), de citas no
+    eliminadas. Alimenta "Servicios más solicitados" (por nombre_servicio) e
+    "Ingresos por categoría" (la categoría se resuelve al leer, vía servicio,
+    igual que la consulta original)."""
+
+    mes = models.DateField(db_index=True)
+    servicio = models.ForeignKey(
+        "services.Servicio",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        related_name="+",
+    )
+    nombre_servicio = models.CharField(max_length=200)
+    cantidad = models.PositiveIntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=0, default=0)
+
+    class Meta:
+        db_table = "resumen_servicios_mes"
+        verbose_name = "Resumen de servicios por mes"
+        verbose_name_plural = "Resúmenes de servicios por mes"
@@ -0,0 +1,263 @@
+"""Caché versionada de los payloads del dashboard.
+
+Cada gráfico se guarda bajo una key (gráfico, start_date, end_date, args) más
+la versión actual de cada dominio del que depende. Una escritura no borra
+nada: sube la versión de su dominio y las keys viejas dejan de leerse (y
+expiran solas con DASHBOARD_CACHE_TIMEOUT).
+
+Los dominios son las familias de rollups (dashboard.services.rollups) más
+CATALOGO (nombres de servicio/categoría, que "Ingresos por categoría" resuelve
+al leer). Las familias suben su versión al terminar refresh_months/rebuild, es
+decir DESPUÉS de recalcular el rollup: una lectura entre medio nunca guarda un
+payload viejo bajo la versión nueva.
+
+Por debajo, monthly_rows memoiza las filas de cada mes CERRADO por separado,
+con versión propia por (familia, mes): cuando un payload se invalida solo se
+consultan el mes en curso y los meses que una escritura retroactiva tocó.
+
+La caché es un acelerador: si Redis no responde, se calcula directo desde los
+rollups y la escritura sigue su curso.
+"""
+
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+from dashboard.services.periods import closed_keys
+
+PREFIX = "dashboard"
+
+CATALOGO = "catalogo"
+
+HIT = "hit"
+MISS = "miss"
+
+
+def _version_key(domain):
+    return f"{PREFIX}:version:{domain}"
+
+
+def _month_version_key(family, month):
+    return f"{PREFIX}:version:{family}:{month:%Y%m}"
+
+
+def _epoch(family):
+    """Dominio que invalida TODOS los meses de una familia (rebuild)."""
+    return f"{family}:epoch"
+
+
+def _stats_key(metric, outcome):
+    return f"{PREFIX}:stats:{metric}:{outcome}"
+
+
+def _incr(key, delta=1):
+    """INCR que crea la key si no existe (sin expiración)."""
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Se expulsó entre add e incr.
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def _current(version_keys):
+    """Valor actual de cada key de versión, en el orden recibido.
+
+    Una versión ausente (Redis recién levantado o key expulsada) arranca en el
+    reloj actual en ns, no en 0, para no volver a leer entradas guardadas bajo
+    una versión anterior a la pérdida.
+    """
+    found = cache.get_many(version_keys)
+    for key in version_keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in version_keys)
+
+
+def versions(domains):
+    """Versión actual de cada dominio, en el orden recibido."""
+    return _current([_version_key(domain) for domain in domains])
+
+
+def _bump_keys(version_keys):
+    try:
+        for key in set(version_keys):
+            _incr(key)
+    except Exception:
+        # Sin caché disponible no hay nada que invalidar; no se debe romper la
+        # escritura que disparó el bump.
+        pass
+
+
+def bump(*domains):
+    """Invalida los payloads que dependen de `domains` subiendo su versión."""
+    _bump_keys([_version_key(domain) for domain in domains])
+
+
+def bump_months(family, months):
+    """Invalida los meses memoizados de una familia (ver monthly_rows)."""
+    _bump_keys([_month_version_key(family, month) for month in months if month])
+
+
+def bump_all_months(family):
+    """Invalida todos los meses memoizados de una familia, p. ej. tras un rebuild."""
+    bump(_epoch(family))
+
+
+def _payload_key(metric, period, args, kwargs, domain_versions):
+    args_part = ":".join(
+        [str(arg) for arg in args]
+        + [f"{name}={value}" for name, value in sorted(kwargs.items())]
+    )
+    versions_part = ".".join(str(version) for version in domain_versions)
+    return (
+        f"{PREFIX}:{metric}:{period.start_date:%Y%m}:{period.end_date:%Y%m}"
+        f":{args_part}:v{versions_part}"
+    )
+
+
+def cached_metric(*domains):
+    """Decorador para funciones de metrics con firma (period, ...).
+
+    Args:
+        *domains (str): Dominios de los que depende el payload; un bump de
+            cualquiera de ellos lo invalida.
+    """
+
+    def decorator(func):
+        metric = func.__name__
+
+        @wraps(func)
+        def wrapper(period, *args, **kwargs):
+            try:
+                key = _payload_key(metric, period, args, kwargs, versions(domains))
+                payload = cache.get(key)
+            except Exception:
+                return func(period, *args, **kwargs)
+
+            if payload is not None:
+                _record(metric, HIT)
+                return payload
+
+            _record(metric, MISS)
+            payload = func(period, *args, **kwargs)
+            try:
+                cache.set(key, payload, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+            except Exception:
+                pass
+            return payload
+
+        wrapper.cache_domains = domains
+        return wrapper
+
+    return decorator
+
+
+"""========================================================================="""
+# region ........ Meses cerrados
+
+
+def _month_keys(family, months, domains):
+    """{mes: key de sus filas} con la versión vigente del mes y de `domains`."""
+    month_versions = _current([_month_version_key(family, month) for month in months])
+    shared = ".".join(str(version) for version in versions((_epoch(family), *domains)))
+    return {
+        month: f"{PREFIX}:rows:{family}:{month:%Y%m}:v{version}.{shared}"
+        for month, version in zip(months, month_versions)
+    }
+
+
+def monthly_rows(family, period, fetch, domains=()):
+    """Filas de una pasada de metrics para los meses del Period.
+
+    Los meses cerrados se sirven desde la caché mientras su versión no cambie;
+    el resto (mes en curso, futuros, invalidados o expulsados) se consulta en
+    UNA llamada a `fetch` y los cerrados entre ellos se guardan para la próxima.
+
+    Args:
+        family (str): Familia de rollup; sus bumps por mes invalidan.
+        period (Period): Período a cubrir.
+        fetch (Callable[[list[date]], Iterable[dict]]): Consulta el rollup para
+            esos meses; cada fila debe traer su "mes".
+        domains (tuple[str]): Dominios extra de los que dependen las filas,
+            p. ej. CATALOGO si incluyen nombres de categoría.
+
+    Returns:
+        list[dict]: Filas de todos los meses, en orden cronológico.
+    """
+    closed = closed_keys(period)
+    try:
+        keys = _month_keys(family, closed, domains) if closed else {}
+        found = cache.get_many(keys.values())
+    except Exception:
+        keys, found = {}, {}
+
+    by_month = {month: found[key] for month, key in keys.items() if key in found}
+    pending = [key for key in period.keys if key not in by_month]
+    _record(f"meses_{family}", HIT, len(by_month))
+    _record(f"meses_{family}", MISS, len(pending))
+
+    if pending:
+        fresh = defaultdict(list)
+        for row in fetch(pending):
+            fresh[row["mes"]].append(row)
+        for month in pending:
+            by_month[month] = fresh[month]
+        try:
+            cache.set_many(
+                {keys[month]: by_month[month] for month in pending if month in keys},
+                timeout=settings.DASHBOARD_CLOSED_MONTH_TIMEOUT,
+            )
+        except Exception:
+            pass
+
+    return [row for month in period.keys for row in by_month[month]]
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ Contadores
+
+
+def _record(metric, outcome, count=1):
+    if not count:
+        return
+    try:
+        _incr(_stats_key(metric, outcome), count)
+    except Exception:
+        pass
+
+
+def stats(metrics):
+    """Aciertos y fallos acumulados por gráfico (o por "meses_<familia>").
+
+    Returns:
+        dict: {metric: {"hit": int, "miss": int}}
+    """
+    keys = {
+        (metric, outcome): _stats_key(metric, outcome)
+        for metric in metrics
+        for outcome in (HIT, MISS)
+    }
+    found = cache.get_many(keys.values())
+    result = {metric: {HIT: 0, MISS: 0} for metric in metrics}
+    for (metric, outcome), key in keys.items():
+        result[metric][outcome] = found.get(key, 0)
+    return result
+
+
+def reset_stats(metrics):
+    cache.delete_many(
+        [_stats_key(metric, outcome) for metric in metrics for outcome in (HIT, MISS)]
+    )
+
+
+# endregion
+"""========================================================================="""
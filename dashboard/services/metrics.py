@@ -1,17 +1,37 @@
+from collections import defaultdict
 from decimal import Decimal
 
-from django.db.models import Count, Sum, DateField
-from django.db.models.functions import TruncMonth
+from django.db.models import Count, Sum
 
 from apps.appointments.models.agenda import Cita
-from apps.appointments.models.detalle_cita import DetalleCita
-from apps.payments.models.pago import Pago
-from apps.payments.models.detalle_pago import DetallePago
 from apps.payments.choices import MetodoPago
+from dashboard.models import (
+    ResumenCitasMes,
+    ResumenCobradoMes,
+    ResumenFacturadoMes,
+    ResumenServiciosMes,
+)
+from dashboard.services.cache import CATALOGO, cached_metric, monthly_rows
+from dashboard.services.rollups import CITAS, COBRADO, FACTURADO, SERVICIOS
 
 # Todas las funciones reciben un `period` (dashboard.services.periods.Period)
 # ya resuelto por el form a partir del filtro global, y devuelven el contrato
 # JSON uniforme: labels + datasets + meta.
+#
+# Leen de los rollups mensuales (dashboard.models), no de las tablas de
+# origen: el Period siempre abarca meses completos, así que filtrar por
+# `mes` en [start_date, end_date) equivale al filtro por fecha original. Los
+# rollups se mantienen desde dashboard.signals (ver services.rollups).
+#
+# Cada gráfico se arma en dos pasos: una "pasada" (_*_rows) que lee un rollup
+# una sola vez, y un armador (_*_payload) que deriva el contrato desde esas
+# filas. Así all_charts() comparte una pasada entre los gráficos que leen la
+# misma tabla y devuelve exactamente lo mismo que los endpoints individuales.
+#
+# Las métricas públicas pasan por la caché versionada (services.cache): cada
+# una declara de qué rollups depende y se recalcula solo cuando alguno cambió.
+# Aun entonces, las pasadas traen de la BD solo los meses abiertos o
+# invalidados: los meses cerrados salen memoizados de monthly_rows.
 
 
 def _num(value):
@@ -23,43 +43,101 @@ def _num(value):
     return value
 
 
-def _monthly_series(period, rows, value_field):
-    """Mapea filas agrupadas por mes sobre el rango completo, rellenando con 0
-    los meses sin datos para que el eje sea continuo."""
-    by_period = {row["period"]: row for row in rows}
-    series = []
-    for key in period.keys:
-        row = by_period.get(key)
-        series.append(_num(row[value_field]) if row else 0)
-    return series
+def _monthly_series(period, totals):
+    """Mapea {mes: valor} sobre el rango completo, rellenando con 0 los meses
+    sin datos para que el eje sea continuo."""
+    return [_num(totals.get(key)) for key in period.keys]
 
 
 def _meta(*series):
     return {"empty": not any(any(s) for s in series)}
 
 
-def attended_clients(period):
-    """Citas completadas y clientes únicos por mes."""
-    rows = (
-        Cita.objects.filter(
-            estado=Cita.EstadoChoices.COMPLETADA,
-            fecha_agenda__gte=period.start_date,
-            fecha_agenda__lt=period.end_date,
-        )
-        .annotate(period=TruncMonth("fecha_agenda"))
-        .values("period")
-        .annotate(
-            atendidas=Count("id"),
-            unicos=Count("cliente", distinct=True),
-        )
+def _in_months(rollup_model, months):
+    """Filas de un rollup mensual para esos meses."""
+    return rollup_model.objects.filter(mes__in=months)
+
+
+def _sum_by(rows, key, value_field):
+    """Suma `value_field` de las filas agrupando por `key`, en orden de aparición."""
+    totals = defaultdict(int)
+    for row in rows:
+        totals[row[key]] += row[value_field] or 0
+    return totals
+
+
+def _ranked(totals):
+    """Pares (clave, total) de mayor a menor total."""
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+"""========================================================================="""
+# region ........ Pasadas (una consulta por rollup)
+
+
+def _fetch_citas(months):
+    return (
+        _in_months(ResumenCitasMes, months)
+        .values("mes", "estado")
+        .annotate(total=Sum("total"), unicos=Count("cliente_id", distinct=True))
     )
-    by_period = {row["period"]: row for row in rows}
 
-    atendidas, unicos = [], []
-    for key in period.keys:
-        row = by_period.get(key)
-        atendidas.append(row["atendidas"] if row else 0)
-        unicos.append(row["unicos"] if row else 0)
+
+def _fetch_facturado(months):
+    return _in_months(ResumenFacturadoMes, months).values("mes").annotate(
+        total=Sum("total")
+    )
+
+
+def _fetch_cobrado(months):
+    return (
+        _in_months(ResumenCobradoMes, months)
+        .values("mes", "metodo_pago")
+        .annotate(total=Sum("total"))
+    )
+
+
+def _fetch_servicios(months):
+    return (
+        _in_months(ResumenServiciosMes, months)
+        .values("mes", "nombre_servicio", "servicio__categoria__nombre")
+        .annotate(cantidad=Sum("cantidad"), ingresos=Sum("ingresos"))
+    )
+
+
+def _citas_rows(period):
+    """Citas por (mes, estado) con sus clientes únicos."""
+    return monthly_rows(CITAS, period, _fetch_citas)
+
+
+def _facturado_rows(period):
+    return monthly_rows(FACTURADO, period, _fetch_facturado)
+
+
+def _cobrado_rows(period):
+    """Cobrado por (mes, método de pago)."""
+    return monthly_rows(COBRADO, period, _fetch_cobrado)
+
+
+def _servicios_rows(period):
+    """Cantidad e ingresos por (mes, servicio, categoría). Los nombres de
+    categoría se resuelven al leer, por eso dependen también de CATALOGO."""
+    return monthly_rows(SERVICIOS, period, _fetch_servicios, domains=(CATALOGO,))
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ Armadores del contrato JSON
+
+
+def _attended_clients_payload(period, citas_rows):
+    completed = [
+        row for row in citas_rows if row["estado"] == Cita.EstadoChoices.COMPLETADA
+    ]
+    atendidas = _monthly_series(period, _sum_by(completed, "mes", "total"))
+    unicos = _monthly_series(period, _sum_by(completed, "mes", "unicos"))
 
     return {
         "labels": period.labels,
@@ -71,31 +149,9 @@ def attended_clients(period):
     }
 
 
-def income_billed_vs_collected(period):
-    """Facturado (Pago.monto_total_cita por fecha_cita) vs. cobrado
-    (DetallePago.monto_pago por fecha_pago), por mes."""
-    billed_rows = (
-        Pago.objects.filter(
-            fecha_cita__date__gte=period.start_date,
-            fecha_cita__date__lt=period.end_date,
-        )
-        .annotate(period=TruncMonth("fecha_cita", output_field=DateField()))
-        .values("period")
-        .annotate(total=Sum("monto_total_cita"))
-    )
-    collected_rows = (
-        DetallePago.objects.filter(
-            pago__is_removed=False,
-            fecha_pago__date__gte=period.start_date,
-            fecha_pago__date__lt=period.end_date,
-        )
-        .annotate(period=TruncMonth("fecha_pago", output_field=DateField()))
-        .values("period")
-        .annotate(total=Sum("monto_pago"))
-    )
-
-    billed = _monthly_series(period, billed_rows, "total")
-    collected = _monthly_series(period, collected_rows, "total")
+def _income_payload(period, facturado_rows, cobrado_rows):
+    billed = _monthly_series(period, _sum_by(facturado_rows, "mes", "total"))
+    collected = _monthly_series(period, _sum_by(cobrado_rows, "mes", "total"))
 
     return {
         "labels": period.labels,
@@ -107,17 +163,8 @@ def income_billed_vs_collected(period):
     }
 
 
-def appointment_status(period):
-    """Citas agrupadas por estado (pendiente/completada/cancelada) en el período."""
-    rows = (
-        Cita.objects.filter(
-            fecha_agenda__gte=period.start_date,
-            fecha_agenda__lt=period.end_date,
-        )
-        .values("estado")
-        .annotate(total=Count("id"))
-    )
-    counts = {row["estado"]: row["total"] for row in rows}
+def _appointment_status_payload(citas_rows):
+    counts = _sum_by(citas_rows, "estado", "total")
 
     labels, data, keys = [], [], []
     for value, label in Cita.EstadoChoices.choices:
@@ -132,18 +179,8 @@ def appointment_status(period):
     }
 
 
-def payment_methods(period):
-    """Monto cobrado agrupado por método de pago en el período."""
-    rows = (
-        DetallePago.objects.filter(
-            pago__is_removed=False,
-            fecha_pago__date__gte=period.start_date,
-            fecha_pago__date__lt=period.end_date,
-        )
-        .values("metodo_pago")
-        .annotate(total=Sum("monto_pago"))
-    )
-    totals = {row["metodo_pago"]: row["total"] for row in rows}
+def _payment_methods_payload(cobrado_rows):
+    totals = _sum_by(cobrado_rows, "metodo_pago", "total")
 
     labels, data, keys = [], [], []
     for value, label in MetodoPago.CHOICES:
@@ -158,21 +195,11 @@ def payment_methods(period):
     }
 
 
-def top_services(period, limit=8):
-    """Servicios más solicitados (suma de cantidad) en el período, top `limit`."""
-    rows = (
-        DetalleCita.objects.filter(
-            cita__is_removed=False,
-            cita__fecha_agenda__gte=period.start_date,
-            cita__fecha_agenda__lt=period.end_date,
-        )
-        .values("nombre_servicio")
-        .annotate(total=Sum("cantidad_servicios"))
-        .order_by("-total")[:limit]
-    )
+def _top_services_payload(servicios_rows, limit):
+    ranked = _ranked(_sum_by(servicios_rows, "nombre_servicio", "cantidad"))[:limit]
 
-    labels = [row["nombre_servicio"] for row in rows]
-    data = [_num(row["total"]) for row in rows]
+    labels = [nombre for nombre, _ in ranked]
+    data = [_num(total) for _, total in ranked]
 
     return {
         "labels": labels,
@@ -181,23 +208,15 @@ def top_services(period, limit=8):
     }
 
 
-def income_by_category(period):
-    """Ingresos (suma de precio_acordado) agrupados por categoría en el período."""
-    rows = (
-        DetalleCita.objects.filter(
-            cita__is_removed=False,
-            cita__fecha_agenda__gte=period.start_date,
-            cita__fecha_agenda__lt=period.end_date,
-        )
-        .values("servicio__categoria__nombre")
-        .annotate(total=Sum("precio_acordado"))
-        .order_by("-total")
+def _income_by_category_payload(servicios_rows):
+    ranked = _ranked(
+        _sum_by(servicios_rows, "servicio__categoria__nombre", "ingresos")
     )
 
     labels, data, keys = [], [], []
-    for index, row in enumerate(rows):
-        labels.append(row["servicio__categoria__nombre"] or "Sin categoría")
-        data.append(_num(row["total"]))
+    for index, (categoria, total) in enumerate(ranked):
+        labels.append(categoria or "Sin categoría")
+        data.append(_num(total))
         keys.append("cat_{}".format(index))  # colores cíclicos en el frontend
 
     return {
@@ -207,3 +226,73 @@ def income_by_category(period):
         ],
         "meta": _meta(data),
     }
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ Métricas públicas
+
+
+@cached_metric(CITAS)
+def attended_clients(period):
+    """Citas completadas y clientes únicos por mes."""
+    return _attended_clients_payload(period, _citas_rows(period))
+
+
+@cached_metric(FACTURADO, COBRADO)
+def income_billed_vs_collected(period):
+    """Facturado (Pago.monto_total_cita por fecha_cita) vs. cobrado
+    (DetallePago.monto_pago por fecha_pago), por mes."""
+    return _income_payload(period, _facturado_rows(period), _cobrado_rows(period))
+
+
+@cached_metric(CITAS)
+def appointment_status(period):
+    """Citas agrupadas por estado (pendiente/completada/cancelada) en el período."""
+    return _appointment_status_payload(_citas_rows(period))
+
+
+@cached_metric(COBRADO)
+def payment_methods(period):
+    """Monto cobrado agrupado por método de pago en el período."""
+    return _payment_methods_payload(_cobrado_rows(period))
+
+
+@cached_metric(SERVICIOS)
+def top_services(period, limit=8):
+    """Servicios más solicitados (suma de cantidad) en el período, top `limit`."""
+    return _top_services_payload(_servicios_rows(period), limit)
+
+
+@cached_metric(SERVICIOS, CATALOGO)
+def income_by_category(period):
+    """Ingresos (suma de precio_acordado) agrupados por categoría en el período."""
+    return _income_by_category_payload(_servicios_rows(period))
+
+
+@cached_metric(CITAS, FACTURADO, COBRADO, SERVICIOS, CATALOGO)
+def all_charts(period, top_limit=8):
+    """Los 6 gráficos en una sola llamada, keyed por nombre de gráfico.
+
+    Hace a lo sumo 4 consultas en vez de 8: los dos gráficos de citas
+    comparten la pasada por ResumenCitasMes, "Ingresos" (cobrado) y "Métodos de
+    pago" la de ResumenCobradoMes, y los dos de servicios la de
+    ResumenServiciosMes.
+    """
+    citas_rows = _citas_rows(period)
+    cobrado_rows = _cobrado_rows(period)
+    servicios_rows = _servicios_rows(period)
+    return {
+        "attended_clients": _attended_clients_payload(period, citas_rows),
+        "income": _income_payload(period, _facturado_rows(period), cobrado_rows),
+        "appointment_status": _appointment_status_payload(citas_rows),
+        "payment_methods": _payment_methods_payload(cobrado_rows),
+        "top_services": _top_services_payload(servicios_rows, top_limit),
+        "income_by_category": _income_by_category_payload(servicios_rows),
+    }
+
+
+# endregion
+"""========================================================================="""
@@ -1,6 +1,8 @@
 from collections import namedtuple
 from datetime import date
 
+from django.utils import timezone
+
 # Periodo resuelto que consumen las funciones de metrics. Acota un intervalo
 # semiabierto [start_date, end_date) que comparten los 6 gráficos:
 #   - start_date: primer día del mes más antiguo del rango (límite inferior).
@@ -33,6 +35,28 @@ def _first_of_next_month(year, month):
     return date(year, month + 1, 1)
 
 
+def month_after(key):
+    """Primer día del mes siguiente a la key mensual `key` (date año-mes-1)."""
+    return _first_of_next_month(key.year, key.month)
+
+
+def current_month(today=None):
+    """Key del mes en curso (hora local), el único "abierto" a escrituras del día."""
+    today = today or timezone.localdate()
+    return today.replace(day=1)
+
+
+def closed_keys(period, today=None):
+    """Keys del Period cuyo mes ya terminó.
+
+    Un mes cerrado solo cambia por escrituras retroactivas (p. ej. un abono con
+    fecha pasada), que lo invalidan explícitamente; por eso metrics puede
+    memoizarlo a largo plazo. El mes en curso y los futuros quedan fuera.
+    """
+    open_key = current_month(today)
+    return [key for key in period.keys if key < open_key]
+
+
 def _build(pairs):
     """Construye un Period a partir de pares (año, mes) en orden cronológico."""
     pairs = pairs[-MAX_BUCKETS:]
@@ -48,8 +72,8 @@ def _build(pairs):
 
 
 def last_n_months(months, today=None):
-    """Pares (año, mes) de los últimos `months`, del más antiguo al actual."""
-    today = today or date.today()
+    """Pares (año, mes) de los últimos `months` en hora local, hasta el actual."""
+    today = today or timezone.localdate()
     pairs = []
     year, month = today.year, today.month
     for _ in range(months):
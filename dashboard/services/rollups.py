@@ -0,0 +1,222 @@
+"""Mantenimiento de los rollups mensuales del dashboard (dashboard.models).
+
+Cada "familia" es un rollup con su consulta de origen. El recálculo es por
+mes completo: se borran las filas del mes y se reinsertan desde el origen.
+Así una escritura solo cuesta el GROUP BY de un mes (no del rango de 36) y el
+resultado es idempotente: recalcular dos veces el mismo mes da lo mismo.
+
+Las escrituras de Cita/Pago/DetallePago/DetalleCita marcan sus meses con
+mark_dirty (ver dashboard.signals); el recálculo corre al confirmar la
+transacción. Las escrituras que NO disparan señales (bulk_create, update de
+queryset) deben llamar a mark_dirty a mano.
+
+Los recálculos de un mismo mes no se pisan: cada uno toma un advisory lock
+de su (familia, mes) hasta el fin de su transacción, y rebuild() uno de la
+familia entera (ver _lock).
+
+Cada recálculo sube en dashboard.services.cache la versión de su familia (lo
+que invalida los payloads que la leen) y la de cada mes recalculado (lo que
+invalida solo esos meses entre los memoizados).
+"""
+
+import zlib
+from datetime import datetime
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.appointments.models.agenda import Cita
+from apps.appointments.models.detalle_cita import DetalleCita
+from apps.payments.models.detalle_pago import DetallePago
+from apps.payments.models.pago import Pago
+from dashboard.models import (
+    ResumenCitasMes,
+    ResumenCobradoMes,
+    ResumenFacturadoMes,
+    ResumenServiciosMes,
+)
+from dashboard.services import cache
+from dashboard.services.periods import month_after
+
+CITAS = "citas"
+FACTURADO = "facturado"
+COBRADO = "cobrado"
+SERVICIOS = "servicios"
+
+BULK_BATCH_SIZE = 1000
+
+
+def month_of(value):
+    """Key mensual (primer día del mes) de una fecha o fecha-hora.
+
+    Las fecha-hora se pasan a hora local antes de truncar, igual que hace
+    TruncMonth con USE_TZ, para que el mes coincida con el de la consulta
+    original. None devuelve None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        value = value.date()
+    return value.replace(day=1)
+
+
+# --- Consultas de origen ----------------------------------------------------
+# Reciben un rango semiabierto [start, end) de meses, o None para todo el
+# histórico (rebuild). Devuelven dicts listos para Model(**fila).
+
+
+def _citas_rows(start=None, end=None):
+    queryset = Cita.objects.all()
+    if start:
+        queryset = queryset.filter(fecha_agenda__gte=start, fecha_agenda__lt=end)
+    return (
+        queryset.annotate(mes=TruncMonth("fecha_agenda"))
+        .values("mes", "estado", "cliente_id")
+        .annotate(total=Count("id"))
+    )
+
+
+def _facturado_rows(start=None, end=None):
+    queryset = Pago.objects.all()
+    if start:
+        queryset = queryset.filter(
+            fecha_cita__date__gte=start,
+            fecha_cita__date__lt=end,
+        )
+    return (
+        queryset.annotate(mes=TruncMonth("fecha_cita", output_field=DateField()))
+        .values("mes")
+        .annotate(total=Sum("monto_total_cita"))
+    )
+
+
+def _cobrado_rows(start=None, end=None):
+    queryset = DetallePago.objects.filter(pago__is_removed=False)
+    if start:
+        queryset = queryset.filter(
+            fecha_pago__date__gte=start,
+            fecha_pago__date__lt=end,
+        )
+    return (
+        queryset.annotate(mes=TruncMonth("fecha_pago", output_field=DateField()))
+        .values("mes", "metodo_pago")
+        .annotate(total=Sum("monto_pago"))
+    )
+
+
+def _servicios_rows(start=None, end=None):
+    queryset = DetalleCita.objects.filter(cita__is_removed=False)
+    if start:
+        queryset = queryset.filter(
+            cita__fecha_agenda__gte=start,
+            cita__fecha_agenda__lt=end,
+        )
+    return (
+        queryset.annotate(mes=TruncMonth("cita__fecha_agenda"))
+        .values("mes", "servicio_id", "nombre_servicio")
+        .annotate(
+            cantidad=Sum("cantidad_servicios"),
+            ingresos=Sum("precio_acordado"),
+        )
+    )
+
+
+FAMILIES = {
+    CITAS: (ResumenCitasMes, _citas_rows),
+    FACTURADO: (ResumenFacturadoMes, _facturado_rows),
+    COBRADO: (ResumenCobradoMes, _cobrado_rows),
+    SERVICIOS: (ResumenServiciosMes, _servicios_rows),
+}
+
+
+# --- Recálculo ----------------------------------------------------------------
+
+
+def _lock(family, month=None):
+    """Serializa los recálculos de una familia hasta el fin de la transacción.
+
+    Sin él, dos recálculos concurrentes del mismo mes borran cada uno las
+    filas que ven y las dos inserciones sobreviven: el mes queda duplicado.
+    Con month toma el lock de ese mes (y el de la familia compartido); sin
+    month, el de la familia en exclusiva, que espera a todos sus meses. Solo
+    PostgreSQL: SQLite ya serializa las escrituras.
+    """
+    if connection.vendor != "postgresql":
+        return
+    family_key = zlib.crc32(family.encode()) & 0x7FFFFFFF
+    with connection.cursor() as cursor:
+        if month is None:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [family_key])
+            return
+        cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [family_key])
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s, %s)",
+            [family_key, month.year * 12 + month.month],
+        )
+
+
+def refresh_months(family, months):
+    """Recalcula desde el origen los meses indicados de una familia.
+
+    Args:
+        family (str): Una de CITAS, FACTURADO, COBRADO o SERVICIOS.
+        months (Iterable[date]): Keys mensuales (primer día del mes). Los
+            None se ignoran.
+    """
+    model, source = FAMILIES[family]
+    months = sorted({month for month in months if month})
+    for month in months:
+        with transaction.atomic():
+            _lock(family, month)
+            model.objects.filter(mes=month).delete()
+            model.objects.bulk_create(
+                [model(**row) for row in source(month, month_after(month))],
+                batch_size=BULK_BATCH_SIZE,
+            )
+    cache.bump_months(family, months)
+    cache.bump(family)
+
+
+def mark_dirty(family, *months):
+    """Agenda el recálculo de `months` para cuando confirme la transacción.
+
+    Fuera de un atomic (autocommit) corre en el acto. Si la transacción se
+    revierte, el recálculo se descarta junto con ella.
+    """
+    months = {month for month in months if month}
+    if not months:
+        return
+    transaction.on_commit(lambda: refresh_months(family, months))
+
+
+def rebuild(family):
+    """Reconstruye una familia completa desde el origen.
+
+    Returns:
+        int: Filas insertadas.
+    """
+    model, source = FAMILIES[family]
+    with transaction.atomic():
+        _lock(family)
+        model.objects.all().delete()
+        created = model.objects.bulk_create(
+            [model(**row) for row in source()],
+            batch_size=BULK_BATCH_SIZE,
+        )
+    cache.bump_all_months(family)
+    cache.bump(family)
+    return len(created)
+
+
+def rebuild_all():
+    """Reconstruye todas las familias. Devuelve {familia: filas}."""
+    return {family: rebuild(family) for family in FAMILIES}
+
+
+def is_empty():
+    """True si ninguna familia tiene filas (p. ej. recién migrado)."""
+    return not any(model.objects.exists() for model, _ in FAMILIES.values())
@@ -0,0 +1,168 @@
+"""Mantiene al día los rollups del dashboard ante escrituras del dominio.
+
+Cada handler solo decide QUÉ meses tocó la escritura (el anterior y el nuevo,
+si la fecha cambió) y los marca con rollups.mark_dirty; el recálculo en sí
+vive en dashboard.services.rollups. Se conectan en DashboardConfig.ready().
+
+Las escrituras sin señales (bulk_create, update de queryset) no pasan por
+aquí: quien las hace llama a rollups.mark_dirty explícitamente.
+
+Servicio y Categoria no tienen rollup, pero "Ingresos por categoría" resuelve
+sus nombres al leer: sus escrituras solo invalidan la caché (dominio CATALOGO).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.appointments.models.agenda import Cita
+from apps.appointments.models.detalle_cita import DetalleCita
+from apps.payments.models.detalle_pago import DetallePago
+from apps.payments.models.pago import Pago
+from apps.services.models import Categoria, Servicio
+from dashboard.services import cache, rollups
+from dashboard.services.rollups import month_of
+
+
+def _previous(model, instance, *fields):
+    """Valores guardados en la BD antes de esta escritura, o None si es alta."""
+    if not instance.pk:
+        return None
+    # all_objects (si existe) para ver también las filas con soft delete.
+    manager = getattr(model, "all_objects", model._default_manager)
+    return manager.filter(pk=instance.pk).values(*fields).first()
+
+
+def _fecha_agenda(cita_id):
+    return (
+        Cita.all_objects.filter(pk=cita_id)
+        .values_list("fecha_agenda", flat=True)
+        .first()
+    )
+
+
+"""========================================================================="""
+# region ........ Cita
+
+
+@receiver(pre_save, sender=Cita)
+def cita_pre_save(sender, instance, **kwargs):
+    instance._rollup_previous = _previous(Cita, instance, "fecha_agenda")
+
+
+@receiver(post_save, sender=Cita)
+def cita_post_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_rollup_previous", None) or {}
+    months = (
+        month_of(instance.fecha_agenda),
+        month_of(previous.get("fecha_agenda")),
+    )
+    # Estado, fecha o soft delete de la cita cambian ambas familias: sus
+    # detalles se agrupan por la fecha de la cita y se excluyen si se elimina.
+    rollups.mark_dirty(rollups.CITAS, *months)
+    rollups.mark_dirty(rollups.SERVICIOS, *months)
+
+
+@receiver(post_delete, sender=Cita)
+def cita_post_delete(sender, instance, **kwargs):
+    month = month_of(instance.fecha_agenda)
+    rollups.mark_dirty(rollups.CITAS, month)
+    rollups.mark_dirty(rollups.SERVICIOS, month)
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ DetalleCita
+
+
+@receiver(post_save, sender=DetalleCita)
+def detalle_cita_post_save(sender, instance, **kwargs):
+    rollups.mark_dirty(rollups.SERVICIOS, month_of(_fecha_agenda(instance.cita_id)))
+
+
+@receiver(post_delete, sender=DetalleCita)
+def detalle_cita_post_delete(sender, instance, **kwargs):
+    # Si la cita se borró en cascada su propio handler ya marcó el mes.
+    rollups.mark_dirty(rollups.SERVICIOS, month_of(_fecha_agenda(instance.cita_id)))
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ Pago
+
+
+@receiver(pre_save, sender=Pago)
+def pago_pre_save(sender, instance, **kwargs):
+    instance._rollup_previous = _previous(Pago, instance, "fecha_cita", "is_removed")
+
+
+@receiver(post_save, sender=Pago)
+def pago_post_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_rollup_previous", None) or {}
+    rollups.mark_dirty(
+        rollups.FACTURADO,
+        month_of(instance.fecha_cita),
+        month_of(previous.get("fecha_cita")),
+    )
+    # El soft delete del pago saca (o devuelve) del cobrado todos sus abonos.
+    if previous and previous["is_removed"] != instance.is_removed:
+        fechas = DetallePago.objects.filter(pago_id=instance.pk).values_list(
+            "fecha_pago", flat=True
+        )
+        rollups.mark_dirty(rollups.COBRADO, *(month_of(fecha) for fecha in fechas))
+
+
+@receiver(post_delete, sender=Pago)
+def pago_post_delete(sender, instance, **kwargs):
+    # Sus DetallePago se borran en cascada y marcan su propio mes.
+    rollups.mark_dirty(rollups.FACTURADO, month_of(instance.fecha_cita))
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ DetallePago
+
+
+@receiver(pre_save, sender=DetallePago)
+def detalle_pago_pre_save(sender, instance, **kwargs):
+    instance._rollup_previous = _previous(DetallePago, instance, "fecha_pago")
+
+
+@receiver(post_save, sender=DetallePago)
+def detalle_pago_post_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_rollup_previous", None) or {}
+    rollups.mark_dirty(
+        rollups.COBRADO,
+        month_of(instance.fecha_pago),
+        month_of(previous.get("fecha_pago")),
+    )
+
+
+@receiver(post_delete, sender=DetallePago)
+def detalle_pago_post_delete(sender, instance, **kwargs):
+    rollups.mark_dirty(rollups.COBRADO, month_of(instance.fecha_pago))
+
+
+# endregion
+"""========================================================================="""
+
+"""========================================================================="""
+# region ........ Catálogo (Servicio, Categoria)
+
+
+@receiver(post_save, sender=Servicio)
+@receiver(post_delete, sender=Servicio)
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def catalogo_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache.bump(cache.CATALOGO))
+
+
+# endregion
+"""========================================================================="""
@@ -5,14 +5,19 @@ Por ahora solo contiene una tarea de humo para verificar que la
 infraestructura (Redis + worker) está operativa. Las tareas reales
 (importaciones, exportaciones, reportes) se agregarán según el plan en
 .vscode/propuestas/procesos_segundo_plano/index.html
+
+Las tareas del dashboard van a la cola de reportes (apps.tareas.queues): un
+reporte pesado no demora un export ni el barrido periódico.
 """
 
 import time
 
 from celery import shared_task
 
+from apps.tareas import queues
+
 
-@shared_task
+@shared_task(queue=queues.REPORTES)
 def tarea_de_prueba(segundos=5):
     """Simula un proceso largo. Verifica el ciclo completo:
     encolar en Redis -> ejecutar en el worker -> guardar resultado.
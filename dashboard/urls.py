@@ -9,13 +9,20 @@ from dashboard.views import (
     PaymentMethodsChartAjax,
     TopServicesChartAjax,
     IncomeByCategoryChartAjax,
+    AllChartsAjax,
 )
 
 urlpatterns = [
     # La raíz sigue redirigiendo al calendario; el dashboard vive en /dashboard/
     path("", RedirectView.as_view(pattern_name="calendar", permanent=False)),
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
-    # Endpoints AJAX (uno por gráfico)
+    # Endpoint AJAX agrupado: todos los gráficos en una sola llamada
+    path(
+        "dashboard/graficos/ajax/",
+        AllChartsAjax.as_view(),
+        name="dashboard_all_charts_ajax",
+    ),
+    # Endpoints AJAX (uno por gráfico; se mantienen por compatibilidad)
     path(
         "dashboard/clientes-atendidos/ajax/",
         AttendedClientsChartAjax.as_view(),
@@ -5,6 +5,7 @@ from dashboard.views.charts.appointment_status import AppointmentStatusChartAjax
 from dashboard.views.charts.payment_methods import PaymentMethodsChartAjax
 from dashboard.views.charts.top_services import TopServicesChartAjax
 from dashboard.views.charts.income_by_category import IncomeByCategoryChartAjax
+from dashboard.views.charts.all_charts import AllChartsAjax
 
 __all__ = [
     "DashboardView",
@@ -14,4 +15,5 @@ __all__ = [
     "PaymentMethodsChartAjax",
     "TopServicesChartAjax",
     "IncomeByCategoryChartAjax",
+    "AllChartsAjax",
 ]
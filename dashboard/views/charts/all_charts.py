@@ -0,0 +1,19 @@
+from django.http import JsonResponse
+from django.views.generic import View
+
+from apps.common.views.base_views import ProtectedAjaxView
+from dashboard.forms import DashboardFilterForm
+from dashboard.services import metrics
+
+
+class AllChartsAjax(ProtectedAjaxView, View):
+    """Endpoint único del dashboard: los 6 gráficos en un solo round trip.
+
+    Resuelve el Period una vez y devuelve {nombre_grafico: contrato JSON},
+    con el mismo contrato que cada endpoint individual (que se mantienen por
+    compatibilidad). Las keys coinciden con data-chart de cada <canvas>.
+    """
+
+    def get(self, request, *args, **kwargs):
+        period = DashboardFilterForm(request.GET).get_period()
+        return JsonResponse(metrics.all_charts(period))
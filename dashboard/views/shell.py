@@ -6,9 +6,11 @@ from apps.common.views.base_views import ProtectedView
 class DashboardView(ProtectedView, TemplateView):
     """Vista shell del dashboard: solo pinta la maqueta con los <canvas>.
 
-    No conoce los datos; cada gráfico obtiene los suyos por AJAX desde su
-    propio endpoint, cuya URL se inyecta como data-url en el canvas con
-    {% url %} (los nombres de ruta son la única fuente de verdad).
+    No conoce los datos: el JS los pide en una sola llamada al endpoint
+    agrupado (data-charts-url de la grilla) y reparte cada payload por el
+    data-chart del canvas. Cada canvas conserva además el data-url de su
+    endpoint propio como respaldo. Las URLs se inyectan con {% url %} (los
+    nombres de ruta son la única fuente de verdad).
     """
 
     template_name = "dashboard/index.html"
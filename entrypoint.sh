@@ -2,5 +2,7 @@
 set -o errexit
 
 python manage.py migrate --no-input
+# Carga inicial de los rollups del dashboard (no hace nada si ya existen)
+python manage.py rebuild_dashboard_rollups --if-empty
 
 exec "$@"
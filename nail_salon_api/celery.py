@@ -4,6 +4,12 @@ Configuración de Celery para nail_salon_api.
 El worker se levanta con:
     celery -A nail_salon_api worker --loglevel=info
 (en Windows agregar --pool=solo)
+
+Así consume solo la cola "default". Cada tipo de trabajo tiene su cola (ver
+apps.tareas.queues); para que una importación grande no demore al resto,
+las importaciones van en un worker aparte:
+    celery -A nail_salon_api worker -Q default,exports,reports,periodic
+    celery -A nail_salon_api worker -Q imports
 """
 
 import os
@@ -70,6 +70,7 @@ INSTALLED_APPS = [
     "bootstrap_modal_forms",
     "simple_history",
     # Local apps
+    "apps.common",
     "dashboard",
     "apps.clients",
     "apps.services",
@@ -185,6 +186,11 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 # WhiteNoise para servir archivos estáticos
 STORAGES = {
+    # Archivos generados por la app (p. ej. exports en segundo plano) en
+    # MEDIA_ROOT; web y worker deben compartir ese directorio.
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedStaticFilesStorage",
     },
@@ -224,9 +230,169 @@ CELERY_TIMEZONE = TIME_ZONE
 # proceso debe persistirse en PostgreSQL, no en el result backend.
 CELERY_RESULT_EXPIRES = 3600
 
-# Reencolar la tarea si el worker muere a mitad de ejecución
+# Reencolar la tarea si el worker muere a mitad de ejecución. Las
+# importaciones además usan reject_on_worker_lost y reanudan desde su
+# checkpoint (TareaEnProceso.checkpoint_filas), sin duplicar lotes.
 CELERY_TASK_ACKS_LATE = True
 
+# Colas por tipo de trabajo (ver apps.tareas.queues): cada worker consume las
+# suyas con -Q. Lo que no elige cola va a "default".
+CELERY_TASK_DEFAULT_QUEUE = "default"
+
+# Prioridades dentro de una cola: en Redis 0 es la más alta y el transporte
+# las emula con una sub-lista por valor. Sin prioridad explícita una tarea
+# toma la normal (5), no la más alta.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "queue_order_strategy": "priority",
+    "priority_steps": list(range(10)),
+    "sep": ":",
+}
+CELERY_TASK_DEFAULT_PRIORITY = 5
+
+# Con ACKS_LATE y tareas largas, que cada proceso reserve un solo mensaje:
+# así la prioridad se respeta y un worker ocupado no retiene trabajo ajeno.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 # En True las tareas corren de forma síncrona (sin worker ni Redis),
 # útil para tests y como interruptor de emergencia en desarrollo.
 CELERY_TASK_ALWAYS_EAGER = config("CELERY_TASK_ALWAYS_EAGER", default=False, cast=bool)
+
+# Caché compartida entre procesos web y workers (p. ej. los payloads del
+# dashboard, ver dashboard.services.cache). Por defecto usa el mismo Redis que
+# Celery; CACHE_URL="" cae a memoria local, que solo sirve con un proceso.
+CACHE_URL = config("CACHE_URL", default=REDIS_URL)
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+
+# Segundos que vive un payload del dashboard en caché. La invalidación real la
+# hacen las versiones por dominio; esto solo acota lo que ocupa en Redis.
+DASHBOARD_CACHE_TIMEOUT = config("DASHBOARD_CACHE_TIMEOUT", default=6 * 3600, cast=int)
+
+# Los meses ya cerrados casi no cambian (y cuando cambian se invalidan por
+# versión), así que sus filas viven mucho más que los payloads.
+DASHBOARD_CLOSED_MONTH_TIMEOUT = config(
+    "DASHBOARD_CLOSED_MONTH_TIMEOUT", default=30 * 24 * 3600, cast=int
+)
+
+# Segundos que vive en caché un conteo de las listas DataTables (ver
+# apps.common.counts). La invalidación la hacen las escrituras.
+LIST_COUNT_CACHE_TIMEOUT = config("LIST_COUNT_CACHE_TIMEOUT", default=3600, cast=int)
+
+# Exports a Excel (ver apps.common.exports): desde cuántas filas una lista se
+# exporta en segundo plano (Celery) en vez de dentro del request, y cuántas
+# horas se conserva el archivo generado para descargarlo desde /procesos/.
+EXPORT_ASYNC_THRESHOLD = config("EXPORT_ASYNC_THRESHOLD", default=5000, cast=int)
+EXPORT_RETENTION_HOURS = config("EXPORT_RETENTION_HOURS", default=72, cast=int)
+
+# Peso máximo de un CSV de importación. El archivo se guarda en el storage y el
+# worker lo lee en streaming, así que el tope no depende de la memoria.
+IMPORT_MAX_UPLOAD_SIZE = config(
+    "IMPORT_MAX_UPLOAD_SIZE", default=100 * 1024 * 1024, cast=int
+)
+
+# Validación de importaciones: filas por bloque y procesos que los validan en
+# paralelo (0 = uno por núcleo, 1 = en serie). El worker de importaciones corre
+# con --pool=solo para poder abrir ese pool; un worker prefork valida en serie,
+# porque sus procesos no pueden tener hijos.
+IMPORT_VALIDATION_CHUNK_SIZE = config(
+    "IMPORT_VALIDATION_CHUNK_SIZE", default=5000, cast=int
+)
+IMPORT_VALIDATION_WORKERS = config("IMPORT_VALIDATION_WORKERS", default=0, cast=int)
+
+# Persistencia de importaciones: el primer lote tiene IMPORT_BATCH_SIZE filas y
+# los siguientes se ajustan solos hasta IMPORT_MAX_BATCH_SIZE según lo que
+# tarda cada inserción.
+IMPORT_BATCH_SIZE = config("IMPORT_BATCH_SIZE", default=500, cast=int)
+IMPORT_MAX_BATCH_SIZE = config("IMPORT_MAX_BATCH_SIZE", default=5000, cast=int)
+
+# Segundos mínimos entre dos escrituras del avance de una TareaEnProceso.
+TASK_PROGRESS_INTERVAL = config("TASK_PROGRESS_INTERVAL", default=1.0, cast=float)
+
+# Segundos que el monitor /procesos/ espera eventos de avance en cada long
+# poll (apps.tareas.events). Debe quedar por debajo del timeout de gunicorn.
+TASK_EVENTS_TIMEOUT = config("TASK_EVENTS_TIMEOUT", default=20, cast=int)
+
+# Un "no" de Redis a la marca de cancelación se confirma en la BD como mucho
+# cada TASK_CANCEL_DB_CHECK_INTERVAL segundos (apps.tareas.cancellation).
+TASK_CANCEL_DB_CHECK_INTERVAL = config(
+    "TASK_CANCEL_DB_CHECK_INTERVAL", default=10, cast=int
+)
+
+# Latido de las tareas en curso (apps.tareas.heartbeat): se renueva en Redis
+# cada TASK_HEARTBEAT_INTERVAL segundos y se vuelca a la BD cada
+# TASK_HEARTBEAT_FLUSH_INTERVAL. El reaper declara muerta una tarea
+# EN_PROCESO sin latido hace TASK_HEARTBEAT_TIMEOUT segundos, y perdida una
+# PENDIENTE sin cambios hace TASK_PENDING_TIMEOUT; las reanudables se
+# reencolan hasta TASK_REAPER_MAX_REQUEUES veces.
+TASK_HEARTBEAT_INTERVAL = config("TASK_HEARTBEAT_INTERVAL", default=10, cast=int)
+TASK_HEARTBEAT_FLUSH_INTERVAL = config(
+    "TASK_HEARTBEAT_FLUSH_INTERVAL", default=60, cast=int
+)
+TASK_HEARTBEAT_TIMEOUT = config("TASK_HEARTBEAT_TIMEOUT", default=300, cast=int)
+TASK_PENDING_TIMEOUT = config("TASK_PENDING_TIMEOUT", default=6 * 3600, cast=int)
+TASK_REAPER_MAX_REQUEUES = config("TASK_REAPER_MAX_REQUEUES", default=1, cast=int)
+TASK_REAPER_INTERVAL = config("TASK_REAPER_INTERVAL", default=60, cast=int)
+
+# Tareas del mismo origen que pueden correr a la vez (semáforo en Redis, ver
+# apps.tareas.concurrency). La que no consigue cupo vuelve a la cola y se
+# reintenta a los TASK_CONCURRENCY_RETRY_DELAY segundos.
+IMPORT_CONCURRENCY_PER_ORIGIN = config(
+    "IMPORT_CONCURRENCY_PER_ORIGIN", default=2, cast=int
+)
+EXPORT_CONCURRENCY_PER_ORIGIN = config(
+    "EXPORT_CONCURRENCY_PER_ORIGIN", default=2, cast=int
+)
+TASK_CONCURRENCY_RETRY_DELAY = config(
+    "TASK_CONCURRENCY_RETRY_DELAY", default=15, cast=int
+)
+
+# Retención del historial de tareas (apps.tareas.retention): a los
+# TASK_PAYLOAD_RETENTION_DAYS días de terminar se vacía datos_entrada, y a los
+# TASK_ARCHIVE_AFTER_DAYS la tarea pasa a tareas_archivadas y sale de la tabla
+# viva. Corre cada TASK_RETENTION_INTERVAL segundos, por lotes de
+# TASK_RETENTION_BATCH_SIZE tareas.
+TASK_PAYLOAD_RETENTION_DAYS = config("TASK_PAYLOAD_RETENTION_DAYS", default=7, cast=int)
+TASK_ARCHIVE_AFTER_DAYS = config("TASK_ARCHIVE_AFTER_DAYS", default=30, cast=int)
+TASK_RETENTION_INTERVAL = config("TASK_RETENTION_INTERVAL", default=3600, cast=int)
+TASK_RETENTION_BATCH_SIZE = config("TASK_RETENTION_BATCH_SIZE", default=1000, cast=int)
+
+CELERY_BEAT_SCHEDULE = {
+    "reap-stuck-tasks": {
+        "task": "apps.tareas.tasks.reap_stuck_tasks",
+        "schedule": TASK_REAPER_INTERVAL,
+    },
+    "apply-task-retention": {
+        "task": "apps.tareas.tasks.apply_task_retention",
+        "schedule": TASK_RETENTION_INTERVAL,
+    },
+}
+
+# Importaciones desde este número de filas se cargan con COPY (solo PostgreSQL)
+# en vez de por lotes. 0 = desactivado.
+IMPORT_COPY_THRESHOLD = config("IMPORT_COPY_THRESHOLD", default=0, cast=int)
+
+# Validación de prueba ("Validar sin importar"): corta al juntar
+# IMPORT_DRY_RUN_MAX_ERRORS errores y, si el archivo no supera
+# IMPORT_DRY_RUN_SYNC_MAX_SIZE bytes, se resuelve en la misma petición.
+IMPORT_DRY_RUN_MAX_ERRORS = config("IMPORT_DRY_RUN_MAX_ERRORS", default=200, cast=int)
+IMPORT_DRY_RUN_SYNC_MAX_SIZE = config(
+    "IMPORT_DRY_RUN_SYNC_MAX_SIZE", default=2 * 1024 * 1024, cast=int
+)
+
+# Importaciones (y validaciones de prueba encoladas) de hasta este peso se
+# encolan con prioridad alta: un archivo chico no espera detrás de uno enorme.
+IMPORT_PRIORITY_MAX_SIZE = config(
+    "IMPORT_PRIORITY_MAX_SIZE", default=1024 * 1024, cast=int
+)
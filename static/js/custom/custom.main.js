@@ -158,12 +158,33 @@ const renderDataTable = ({
     ...settings,
   };
 
+  // Paginación por cursor (vistas con keyset_pagination): si la respuesta
+  // trae next_cursor/prev_cursor y se pide la página contigua, se reenvía el
+  // cursor. Cualquier otro salto va sin cursor y el servidor usa OFFSET.
+  const cursors = { start: null, next: null, prev: null };
+  const withCursor = (data) => {
+    const params = { ...data, ...requestData };
+    if (cursors.start !== null) {
+      if (cursors.next && data.start === cursors.start + data.length) {
+        params.cursor = cursors.next;
+      } else if (cursors.prev && data.start === cursors.start - data.length) {
+        params.cursor = cursors.prev;
+      }
+    }
+    cursors.start = data.start;
+    return params;
+  };
+
   // En modo servidor: ajax. En modo local: se omite (usa el DOM).
   if (!isLocal) {
+    $(tableID).on("xhr.dt", (e, dtSettings, json) => {
+      cursors.next = json?.next_cursor || null;
+      cursors.prev = json?.prev_cursor || null;
+    });
     config.ajax = {
       url,
       type: "GET",
-      data: (data) => ({ ...data, ...requestData }),
+      data: withCursor,
       error: (xhr, status, error) => {
         notifyAlert(xhr.responseJSON, xhr.status, 4000);
       },
@@ -206,8 +206,47 @@
       });
   }
 
+  // Carga TODOS los gráficos registrados con una sola llamada al endpoint
+  // agrupado (data-charts-url). Cada canvas toma su payload por data-chart.
+  function loadBatch(url, params) {
+    var canvases = registry
+      .map(function (entry) {
+        return document.getElementById(entry.canvasId);
+      })
+      .filter(Boolean);
+    canvases.forEach(function (canvas) {
+      setState(canvas, "loading");
+    });
+    fetchJSON(url, params)
+      .then(function (payloads) {
+        registry.forEach(function (entry) {
+          var canvas = document.getElementById(entry.canvasId);
+          if (!canvas) return;
+          var key = canvas.getAttribute("data-chart");
+          if (!key || !(key in payloads)) {
+            // Gráfico sin lugar en el endpoint agrupado: usa su endpoint propio
+            loadOne(entry, params);
+            return;
+          }
+          renderChart(entry.canvasId, entry.type, payloads[key], entry.optionsExtra);
+        });
+      })
+      .catch(function () {
+        canvases.forEach(function (canvas) {
+          setState(canvas, "error");
+        });
+      });
+  }
+
   // Recarga TODOS los gráficos registrados con los mismos params (filtro global).
+  // Si la página declara data-charts-url usa el endpoint agrupado (un solo
+  // round trip); si no, cae a un fetch por gráfico con su data-url.
   function reloadAll(params) {
+    var root = document.querySelector("[data-charts-url]");
+    if (root) {
+      loadBatch(root.getAttribute("data-charts-url"), params);
+      return;
+    }
     registry.forEach(function (entry) {
       loadOne(entry, params);
     });